@@ -0,0 +1,83 @@
+import numpy as np
+
+# At most this many per-position messages go into a report
+MAX_MESSAGES = 20
+
+
+def capacity_analysis(instance):
+    """
+    Bounds what any schedule can fill, from availability and skills alone, before solving.
+
+    With A the employees x shifts availability matrix and K the employees x roles skill
+    matrix, A.T @ K counts the employees who could fill each (shift, role) position, so a
+    position can get at most min(required, eligible). Each shift is further capped by the
+    per-shift maximum and by the number of distinct employees available for it (everyone
+    works one role per shift); positions over that cap stay short at least at the lowest
+    importance among the shift's roles. The consecutive-shift limit is ignored, so every
+    bound is valid but not necessarily reached.
+
+    Returns:
+        dict: {
+            "fillable": shifts x roles array of upper bounds on filled positions,
+            "shift_bounds": shift id -> lower bound on the shift's shortage cost (non-zero only),
+            "shortage_lower_bound": lower bound on the total shortage cost,
+            "bottlenecks": [{"role", "unfillable", "required"}, ...], most unfillable first,
+            "messages": ["Waiter on Friday Evening can be at most 2/4", ...],
+        }
+    """
+    num_roles = len(instance.roles)
+    availability = np.zeros((instance.num_employees, instance.num_shifts), dtype=np.int32)
+    for e, shifts in enumerate(instance.availability):
+        availability[e, list(shifts)] = 1
+    skills = np.zeros((instance.num_employees, num_roles), dtype=np.int32)
+    for e, roles in enumerate(instance.skills):
+        skills[e, list(roles)] = 1
+    required = np.zeros((instance.num_shifts, num_roles), dtype=np.int32)
+    for shift, shift_roles in enumerate(instance.shift_roles):
+        for role, count in shift_roles:
+            required[shift, role] = count
+    importance = np.asarray(instance.role_importance, dtype=np.int64)
+
+    eligible = availability.T @ skills
+    fillable = np.minimum(required, eligible)
+    # Distinct employees who could work each shift in any of its roles
+    qualified = (skills @ (required > 0).T.astype(np.int32)) > 0
+    staffed = (availability * qualified).sum(axis=0)
+    cap = np.minimum(staffed, instance.max_employees)
+    excess = np.maximum(fillable.sum(axis=1) - cap, 0)
+
+    role_cost = (required - fillable) @ importance
+    # The cheapest role that could still be filled on each shift absorbs the excess
+    # (a shift with excess always has a fillable role)
+    cheapest = np.zeros(instance.num_shifts, dtype=np.int64)
+    over = excess > 0
+    if over.any():
+        cheapest[over] = np.where(fillable[over] > 0, importance, np.iinfo(np.int64).max).min(axis=1)
+    shift_cost = role_cost + excess * cheapest
+
+    unfillable = (required - fillable).sum(axis=0)
+    bottlenecks = sorted(
+        ({"role": instance.roles[role], "unfillable": int(unfillable[role]), "required": int(required[:, role].sum())}
+         for role in range(num_roles) if unfillable[role] > 0),
+        key=lambda b: (-b["unfillable"], b["role"]),
+    )
+
+    messages = []
+    for shift, role in zip(*np.nonzero(fillable < required)):
+        if len(messages) == MAX_MESSAGES:
+            break
+        messages.append(f"{instance.roles[role]} on {instance.day_name(shift)} {instance.shift_name(shift)} "
+                        f"can be at most {fillable[shift, role]}/{required[shift, role]}")
+    for shift in np.nonzero(excess)[0]:
+        if len(messages) == MAX_MESSAGES:
+            break
+        messages.append(f"{instance.day_name(shift)} {instance.shift_name(shift)} can staff at most "
+                        f"{cap[shift]} of {required[shift].sum()} positions")
+
+    return {
+        "fillable": fillable,
+        "shift_bounds": {int(shift): int(shift_cost[shift]) for shift in np.nonzero(shift_cost)[0]},
+        "shortage_lower_bound": int(shift_cost.sum()),
+        "bottlenecks": bottlenecks,
+        "messages": messages,
+    }
@@ -0,0 +1,174 @@
+"""
+Command-line access to the scheduling solver, decoupled from the live database.
+
+    python -m app.algorithm.cli export instance.json       # snapshot the current instance
+    python -m app.algorithm.cli solve instance.json --preset fast --output schedule.json
+    python -m app.algorithm.cli solve instance.json --weeks 4 --carry-over   # a monthly roster
+
+Instance files use the parse_json_to_constraints() format. An optional top-level
+"previous_days" list (a published schedule's days) is used as the warm-start hint.
+"""
+import argparse
+import json
+import sys
+import time
+
+from app.algorithm.csp_algoritm import solve, solve_horizon
+from app.algorithm.instance import compile_instance
+from app.algorithm.horizon import schedule_carry
+from app.algorithm.solver_config import OBJECTIVE_MODES, CONSECUTIVE_ENCODINGS
+
+
+def export_instance(path, include_previous=True):
+    """
+    Writes the current database instance (and optionally the latest published schedule) to a JSON file.
+    """
+    from app.algorithm.csp_algoritm import parse_json_to_constraints
+    from models.weekly_schedule_model import WeeklyScheduleModel
+
+    data = parse_json_to_constraints()
+    if include_previous:
+        previous_schedule = WeeklyScheduleModel.get_latest_schedule()
+        if previous_schedule:
+            data["previous_days"] = previous_schedule.get("days")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    print(f"Exported {len(data['employee_skills'])} employees to {path}")
+
+
+def load_instance(path):
+    """
+    Reads an instance file. Returns (data, previous_days).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    previous_days = data.pop("previous_days", None)
+    return data, previous_days
+
+
+def print_report(report, elapsed):
+    print(f"Status: {report['status']}")
+    print(f"Total time: {elapsed:.3f}s (CP-SAT wall time {report['wall_time']:.3f}s)")
+    for phase, seconds in report.get("timings", {}).items():
+        print(f"  {phase:<14}{seconds:.3f}s")
+    if report.get("model"):
+        print(f"Model: {report['model']['variables']} variables, {report['model']['constraints']} constraints")
+    if report.get("search"):
+        search = report["search"]
+        print(f"Search: {search['branches']} branches, {search['conflicts']} conflicts, gap {search.get('gap', 'n/a')}")
+    if "objective" in report:
+        bound = report["best_bound"]
+        print(f"Objective: {report['objective']:.0f} (best bound {'n/a' if bound is None else f'{bound:.0f}'})")
+        for term, value in report["objective_breakdown"].items():
+            print(f"  {term:<14}{value}")
+    for stage in report.get("stages") or ():
+        print(f"  stage {stage['stage']:<10}{stage['status']:<10}{stage['objective']} in {stage['wall_time']:.3f}s")
+    if report.get("capacity"):
+        capacity = report["capacity"]
+        print(f"Capacity: shortage at least {capacity['shortage_lower_bound']}"
+              + (" (reached)" if capacity.get("shortage_proven") else ""))
+        for message in capacity["messages"]:
+            print(f"  {message}")
+    if report.get("draft"):
+        print(f"Greedy draft: {report['draft']['objective']:.0f} (improved by {report['draft'].get('improvement', 0):.0f})")
+    if report.get("warm_start"):
+        print(f"Warm start: {report['warm_start']}")
+    if report.get("aggregation"):
+        print(f"Aggregation: {report['aggregation']}")
+    if report.get("decomposition"):
+        print(f"Decomposition: {report['decomposition']}")
+
+
+def solve_instance_file(args):
+    data, previous_days = load_instance(args.instance)
+    options = {"preset": args.preset, "warm_start": not args.no_warm_start,
+               "aggregate_employees": args.aggregate, "decompose": args.decompose, "objective_mode": args.objective_mode,
+               "consecutive_encoding": args.encoding, "carry_over": args.carry_over, "use_cache": False}
+    for key in ("time_limit", "num_workers", "relative_gap_limit", "random_seed"):
+        if getattr(args, key) is not None:
+            options[key] = getattr(args, key)
+
+    if args.weeks > 1:
+        return solve_instance_horizon(args, data, options, previous_days)
+
+    started = time.perf_counter()
+    carry = None
+    if args.carry_over and previous_days:
+        carry = schedule_carry(compile_instance(data), previous_days)
+    result = solve(data, options, previous_days=previous_days if not args.no_warm_start else None,
+                   include_text=args.text, carry=carry)
+    elapsed = time.perf_counter() - started
+
+    if not result:
+        print("No feasible solution found")
+        return 1
+
+    formatted_json, textOutput, report = result
+    print_report(report, elapsed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"solution": json.loads(formatted_json), "report": report}, f, ensure_ascii=False, indent=2)
+        print(f"Schedule written to {args.output}")
+    if args.text:
+        print("\n\n".join(summary.replace("<br>", "\n") for summary in textOutput))
+    return 0
+
+
+def solve_instance_horizon(args, data, options, previous_days):
+    started = time.perf_counter()
+    result = solve_horizon(data, args.weeks, options, previous_days=previous_days,
+                           on_week=lambda week, _, report: print(
+                               f"Week {week}: {report['status']} objective {report['objective']:.0f} "
+                               f"in {report['wall_time']:.3f}s, carry-over {report['carry_over']}"))
+    elapsed = time.perf_counter() - started
+    if not result:
+        print("No feasible solution found")
+        return 1
+
+    solutions, report = result
+    print(f"{report['weeks']} weeks in {elapsed:.3f}s, total objective {report['objective']:.0f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"weeks": [json.loads(solution) for solution in solutions], "report": report},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Schedules written to {args.output}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.algorithm.cli", description="ScheduliQ solver tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="export the current instance from MongoDB to a JSON file")
+    export.add_argument("output")
+    export.add_argument("--no-previous", action="store_true", help="do not include the latest published schedule")
+
+    solve_cmd = commands.add_parser("solve", help="solve an instance JSON file")
+    solve_cmd.add_argument("instance")
+    solve_cmd.add_argument("--preset", default="best")
+    solve_cmd.add_argument("--time-limit", dest="time_limit", type=float)
+    solve_cmd.add_argument("--workers", dest="num_workers", type=int)
+    solve_cmd.add_argument("--gap", dest="relative_gap_limit", type=float)
+    solve_cmd.add_argument("--seed", dest="random_seed", type=int)
+    solve_cmd.add_argument("--aggregate", action="store_true", help="aggregate interchangeable employees")
+    solve_cmd.add_argument("--decompose", action="store_true", help="solve independent groups of employees in parallel")
+    solve_cmd.add_argument("--objective", dest="objective_mode", default="weighted", choices=OBJECTIVE_MODES)
+    solve_cmd.add_argument("--encoding", default="windows", choices=CONSECUTIVE_ENCODINGS,
+                           help="encoding of the consecutive-shift limit")
+    solve_cmd.add_argument("--weeks", type=int, default=1, help="plan this many consecutive weeks")
+    solve_cmd.add_argument("--carry-over", dest="carry_over", action="store_true",
+                           help="count the end of the previous schedule towards the consecutive-shift limit")
+    solve_cmd.add_argument("--no-warm-start", action="store_true")
+    solve_cmd.add_argument("--output", help="write the schedule and report to this JSON file")
+    solve_cmd.add_argument("--text", action="store_true", help="print the per-shift text summary")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        export_instance(args.output, include_previous=not args.no_previous)
+        return 0
+    return solve_instance_file(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
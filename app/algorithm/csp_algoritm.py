@@ -1,6 +1,44 @@
+import copy
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from ortools.sat.python import cp_model
 from app.algorithm.format import format_schedule_output, format_schedule_input  # ייבוא הפונקציות
+from app.algorithm.instance import compile_instance
+from app.algorithm.solver_config import build_solver_config, apply_solver_config
+from app.algorithm.warm_start import (add_schedule_hints, add_aggregated_hints, hint_assignments,
+                                     map_schedule_to_assignments)
+from app.algorithm.decomposition import find_components
+from app.algorithm.horizon import schedule_carry, table_carry, schedule_precedes
+from app.algorithm.capacity import capacity_analysis
+from app.algorithm.model_cache import model_cache, model_cache_stats, structure_key, pack_model, unpack_model
+from app.algorithm.greedy import greedy_assign
+from app.algorithm.symmetry import employee_classes, build_aggregated_model, disaggregate
+from app.algorithm.incremental import neighborhood_shifts, fix_outside_neighborhood, schedule_diff
+from app.algorithm.extraction import AssignmentReader, table_from_assigned, table_keys, filled_counts
+from app.algorithm.progress import ScheduleProgressCallback, SearchStopper
+from app.algorithm.instrumentation import PhaseTimer, SearchLogProbe, model_statistics, solver_statistics
 from models.manager_settings_model import get_manager_settings
+from models.weekly_schedule_model import WeeklyScheduleModel
+from utils.cache import schedule_cache, stable_hash
+
+# Objective weights: shortage dominates, then workload balance, then employee preference
+BALANCE_WEIGHT = 1000
+SHORTAGE_WEIGHT = 5000
+PREFERENCE_WEIGHT = 100
+OBJECTIVE_WEIGHTS = (BALANCE_WEIGHT, SHORTAGE_WEIGHT, PREFERENCE_WEIGHT)
+
+# Lexicographic mode: the order of the stages and each one's share of the time limit
+OBJECTIVE_STAGES = (("shortage", 0.5), ("balance", 0.2), ("preference", 0.3))
+
+# Aggregated solves: the aggregated model's share of the time limit; disaggregation and,
+# if it fails, the per-employee fallback share the rest
+AGGREGATED_SHARE = 0.75
+# A fallback solve, or the second pass of a decomposed solve, only starts with this many seconds left
+MIN_SOLVE_TIME = 0.1
 
 def parse_json_to_constraints():
     manager_settings = get_manager_settings()
@@ -15,130 +53,837 @@ def parse_json_to_constraints():
         "min_max_employees_per_shift": manager_settings["min_max_employees_per_shift"],
         "roles_per_shift": manager_settings["roles_per_shift"],
         "max_consecutive_shifts": manager_settings["max_consecutive_shifts"],
-        "role_importance": manager_settings["role_importance"]
+        "role_importance": manager_settings["role_importance"],
+        "activeVersion": manager_settings.get("activeVersion")
     }
-    print("data:", data)
+    print(f"[parse_json_to_constraints] {len(data['employee_skills'])} employees, "
+          f"{len(data['work_days'])} days x {data['shifts_per_day']} shifts, version {data['activeVersion']}")
     return data
 
-def solve_schedule():
-    model = cp_model.CpModel()
-    
+def solve_schedule(solver_options=None, on_progress=None, include_text=False, on_draft=None, should_stop=None):
+    """
+    Builds and solves the scheduling model for the current constraints in the database.
+    If `on_progress` is given and the 'stream_interval' option is positive, it is called
+    with each (throttled) improving solution while the search runs. `on_draft` receives
+    the greedy draft schedule before the search starts (see solve()). `should_stop()` is
+    polled during the search; once it returns True the best schedule found so far is returned.
+    The per-shift text summary is only rendered when `include_text` is set; otherwise it is None.
+    """
+    solver_config = build_solver_config(solver_options)
+    timer = PhaseTimer()
+
     # Reading data
-    constraints = parse_json_to_constraints()
-    employee_skills = constraints["employee_skills"]
-    employees = list(employee_skills.keys())
-    NUM_EMPLOYEES = len(employees)
-    shifts_per_day = constraints["shifts_per_day"]
-    work_days = constraints["work_days"]
-    NUM_SHIFTS = shifts_per_day * len(work_days)
-    min_employees = constraints["min_max_employees_per_shift"]["min"]
-    max_employees = constraints["min_max_employees_per_shift"]["max"]
-    roles_per_shift = constraints["roles_per_shift"]
-    max_consecutive_shifts = constraints["max_consecutive_shifts"]
-    employee_availability = constraints["employee_availability"]
-    shift_names = constraints["shift_names"]
-    role_importance = constraints["role_importance"]
-
-    # Converting availability data into a convenient structure
-    availability_dict = {}  # Mapping (employee, shift) -> priority
-    for employee_name, shifts_data in employee_availability.items():
-        for shift_id, priority in shifts_data:
-            availability_dict[(employee_name, shift_id)] = priority
-
-    # New variables: For each (employee, shift, role) marked as required
+    with timer.phase("db_fetch"):
+        constraints = parse_json_to_constraints()
+
+    # Carry-over: the end of the published week counts towards this week's consecutive-shift limit,
+    # provided it is the week just before (not this week's own schedule, when regenerating it)
+    previous_schedule = None
+    instance = None
+    carry = None
+    if solver_config["carry_over"]:
+        with timer.phase("db_fetch"):
+            previous_schedule = WeeklyScheduleModel.get_latest_schedule()
+        week_start = WeeklyScheduleModel.next_week_start(datetime.now(timezone.utc)).date()
+        if previous_schedule and schedule_precedes(previous_schedule.get("week_range"), week_start):
+            with timer.phase("compile"):
+                instance = compile_instance(constraints)
+            carry = schedule_carry(instance, previous_schedule.get("days"))
+
+    # Identical solver inputs and settings give back the cached schedule immediately
+    cache_key = stable_hash({"data": constraints, "solver": solver_config, "carry": carry})
+    if solver_config["use_cache"]:
+        cached = schedule_cache.get(cache_key)
+        if cached:
+            # A copy, so callers never share nested dicts with the entry (as with Redis)
+            report = dict(copy.deepcopy(cached["report"]), cache={"hit": True, "key": cache_key},
+                          timings=timer.timings)
+            textOutput = None
+            if include_text:
+                textOutput = cached["text"]
+                if textOutput is None:
+                    with timer.phase("render_text"):
+                        textOutput = display_schedule(cached["table"], compile_instance(constraints))
+            return cached["solution"], textOutput, report
+
+    # Warm start: hint the search with last week's published schedule
+    previous_days = None
+    if solver_config["warm_start"]:
+        if previous_schedule is None:
+            with timer.phase("db_fetch"):
+                previous_schedule = WeeklyScheduleModel.get_latest_schedule()
+        if previous_schedule:
+            previous_days = previous_schedule.get("days")
+
+    result = _solve(constraints, solver_config, on_progress, previous_days, include_text,
+                    on_draft=on_draft, should_stop=should_stop, instance=instance, carry=carry)
+    if not result:
+        return None
+    formatted_json, textOutput, report, table = result
+    report["timings"] = dict(timer.timings, **report["timings"])
+    report["cache"] = {"hit": False, "key": cache_key}
+    # A cancelled search is not the schedule these settings would produce
+    if solver_config["use_cache"] and not report["cancelled"]:
+        # The table lets a later request that wants the text summary render it without solving again.
+        # The entry is a copy: the in-memory backend would otherwise keep the caller's report, which
+        # is changed afterwards (e.g. the "emit" timing)
+        schedule_cache.set(cache_key, copy.deepcopy(
+            {"solution": formatted_json, "text": textOutput, "table": table, "report": report}))
+    return formatted_json, textOutput, report
+
+def solve(data, solver_options=None, on_progress=None, previous_days=None, include_text=True, on_draft=None,
+          should_stop=None, carry=None):
+    """
+    Solves a scheduling instance without touching the database.
+
+    Args:
+        data (dict): The instance, in the parse_json_to_constraints() format.
+        solver_options (dict): Options for build_solver_config().
+        on_progress (callable): Receives streamed intermediate solutions.
+        previous_days (list): A published schedule's `days`, used as a warm-start hint.
+        include_text (bool): Whether to render the per-shift text summary (None otherwise).
+        on_draft (callable): With the 'instant_draft' option, receives the greedy draft
+            {"solution", "objective", "objective_breakdown"} before the search starts.
+        should_stop (callable): Polled during the search; returning True stops it early.
+        carry (tuple): Employee id -> shifts worked in a row at the end of the previous week
+            (see app/algorithm/horizon.py), counted against max_consecutive_shifts.
+
+    Returns:
+        tuple: (formatted_json, textOutput, report), or None if no feasible schedule was found.
+    """
+    result = _solve(data, solver_options, on_progress, previous_days, include_text,
+                    on_draft=on_draft, should_stop=should_stop, carry=carry)
+    return result[:3] if result else None
+
+def solve_horizon(data, weeks, solver_options=None, previous_days=None, carry=None, on_week=None,
+                  should_stop=None):
+    """
+    Plans several consecutive weeks with the same constraints (a rolling horizon).
+
+    The instance is compiled once. Each week is solved with the end of the week before
+    counting towards its consecutive-shift limit (when the work days wrap around, see
+    horizon.weeks_are_contiguous()), and with the week before as its warm-start hint, so
+    every week after the first starts from a good schedule instead of a cold search.
+
+    Args:
+        weeks (int): Number of weeks to plan.
+        previous_days (list): The published schedule before the first week: its end carries
+            over when the 'carry_over' option is set, and it is the first week's hint.
+        carry (tuple): Carry-over into the first week; overrides `previous_days`.
+        on_week (callable): Receives (week number, formatted_json, report) as each week is solved.
+
+    Returns:
+        tuple: (list of formatted_json per week, report), or None if some week has no
+        feasible schedule.
+    """
+    solver_config = build_solver_config(solver_options)
+    if weeks < 1:
+        raise ValueError("weeks must be at least 1")
+    timer = PhaseTimer()
+    with timer.phase("compile"):
+        instance = compile_instance(data)
+    if carry is None and solver_config["carry_over"] and previous_days:
+        carry = schedule_carry(instance, previous_days)
+
+    solutions = []
+    reports = []
+    for week in range(1, weeks + 1):
+        result = _solve(data, solver_config, None, previous_days if solver_config["warm_start"] else None, False,
+                        should_stop=should_stop, instance=instance, carry=carry)
+        if not result:
+            return None
+        formatted_json, _, report, table = result
+        for phase, seconds in report["timings"].items():
+            timer.add(phase, seconds)
+        solutions.append(formatted_json)
+        reports.append(report)
+        if on_week:
+            on_week(week, formatted_json, report)
+        if report["cancelled"]:
+            break
+        previous_days = json.loads(formatted_json)
+        carry = table_carry(instance, table)
+
+    return solutions, {
+        "weeks": len(solutions),
+        "objective": sum(report["objective"] for report in reports),
+        "timings": timer.timings,
+        "week_reports": [
+            {"week": week, "status": report["status"], "objective": report["objective"],
+             "wall_time": report["wall_time"], "carry_over": report["carry_over"]}
+            for week, report in enumerate(reports, 1)
+        ],
+    }
+
+def solve_schedule_incremental(changed_employees, solver_options=None, on_progress=None, include_text=False,
+                               on_draft=None, should_stop=None):
+    """
+    Re-optimizes the latest published schedule around employees whose constraints changed,
+    instead of solving the whole week again. Falls back to a full solve when there is no
+    published schedule or the rest of it no longer fits the current constraints.
+
+    Args:
+        changed_employees (list): Full names of the employees whose constraints changed.
+
+    Returns:
+        tuple: (formatted_json, textOutput, report) with report["diff"] listing the changed
+        shifts, or None if no feasible schedule was found.
+    """
+    timer = PhaseTimer()
+    with timer.phase("db_fetch"):
+        constraints = parse_json_to_constraints()
+        previous_schedule = WeeklyScheduleModel.get_latest_schedule()
+
+    previous_days = previous_schedule.get("days") if previous_schedule else None
+    result = None
+    if previous_days:
+        result = solve_incremental(constraints, previous_days, changed_employees, solver_options,
+                                   on_progress, include_text, should_stop)
+    if not result and not (should_stop and should_stop()):
+        result = solve(constraints, solver_options, on_progress, previous_days, include_text, on_draft, should_stop)
+        if result:
+            result[2]["incremental"] = {"changed_employees": list(changed_employees), "fallback": True}
+    if not result:
+        return None
+
+    formatted_json, textOutput, report = result
+    report["timings"] = dict(timer.timings, **report["timings"])
+    report["diff"] = schedule_diff(previous_days, json.loads(formatted_json))
+    return result
+
+def solve_incremental(data, previous_days, changed_employees, solver_options=None, on_progress=None,
+                      include_text=True, should_stop=None):
+    """
+    Solves only the neighborhood of the changed employees (see neighborhood_shifts());
+    every other assignment keeps its value from `previous_days`.
+
+    Returns:
+        tuple: (formatted_json, textOutput, report), or None if the fixed part of the
+        previous schedule leaves no feasible completion.
+    """
+    # Aggregated classes do not map onto named previous assignments; the previous schedule is the draft
+    solver_config = dict(build_solver_config(solver_options), aggregate_employees=False, warm_start=True,
+                         instant_draft=False)
+
+    def restrict(model, instance, assignments):
+        affected, free = neighborhood_shifts(instance, previous_days, changed_employees)
+        neighborhood = fix_outside_neighborhood(model, instance, assignments, previous_days, free)
+        neighborhood.update(changed_employees=list(changed_employees), affected_shifts=sorted(affected), fallback=False)
+        return neighborhood
+
+    result = _solve(data, solver_config, on_progress, previous_days, include_text, restrict, should_stop=should_stop)
+    return result[:3] if result else None
+
+def _solve(data, solver_options, on_progress, previous_days, include_text, restrict=None, on_draft=None,
+           should_stop=None, instance=None, carry=None):
+    """
+    solve(), also returning the assignment table the schedule was formatted from.
+    `restrict(model, instance, assignments)` may add constraints to the per-employee
+    model; what it returns is reported as report["incremental"]. An already compiled
+    `instance` of `data` is used as is.
+    """
+    solver_config = build_solver_config(solver_options)
+    timer = PhaseTimer()
+
+    if instance is None:
+        with timer.phase("compile"):
+            instance = compile_instance(data)
+    # Only a carry that constrains someone changes the model
+    carry = carry if carry and any(carry) else None
+    warm_start = None
+    incremental = None
+
+    # Capacity analysis: what no schedule can fill, known before the search starts
+    with timer.phase("capacity"):
+        capacity = capacity_analysis(instance)
+    capacity_report = {key: capacity[key] for key in ("shortage_lower_bound", "bottlenecks", "messages")}
+
+    # Instant draft: a greedy schedule the manager can look at while CP-SAT searches
+    draft = None
+    if solver_config["instant_draft"]:
+        with timer.phase("draft"):
+            draft_assigned = greedy_assign(instance, carry)
+            draft_table = table_from_assigned(instance, draft_assigned)
+            draft = {"objective_breakdown": objective_breakdown(draft_table, instance), "hinted": False}
+            draft["objective"] = draft["objective_breakdown"]["weighted"]
+        if on_draft:
+            on_draft({
+                "solution": format_schedule_output(draft_table, instance),
+                "objective": draft["objective"],
+                "objective_breakdown": draft["objective_breakdown"],
+                "capacity": capacity_report,
+            })
+
+    # Symmetry reduction: interchangeable employees become one class with integer counts
+    # (the aggregated model has no per-employee history, so a carry-over rules it out)
+    aggregation = None
+    if solver_config["aggregate_employees"] and carry is None:
+        classes = employee_classes(instance)
+        aggregation = {
+            "employees": instance.num_employees,
+            "classes": len(classes),
+            "applied": len(classes) < instance.num_employees,
+            "fallback": False,
+        }
+
+    # Decomposition: groups of employees that never compete for a position are independent
+    # except for the balance term; they can be solved as separate, smaller models
+    decomposition = None
+    if restrict is None and not (aggregation and aggregation["applied"]):
+        with timer.phase("decompose"):
+            components = find_components(instance)
+        decomposition = {"components": len(components), "largest": len(components[0]) if components else 0,
+                         "applied": False, "fallback": False}
+
+    # The search outcome, filled in by whichever path solves the instance
+    table = None
+    progress = None
+    outcome = {}
+    model_cache_report = None
+    # The time limit covers every solve below: a fallback only gets what the failed attempt left
+    deadline = time.perf_counter() + solver_config["time_limit"]
+    fallback = None
+
+    if aggregation and aggregation["applied"]:
+        with timer.phase("build"):
+            model, counts, class_shifts = build_aggregated_model(instance, classes, OBJECTIVE_WEIGHTS)
+            if previous_days is not None:
+                warm_start = add_aggregated_hints(model, instance, classes, counts, previous_days)
+        # Named schedules only exist after disaggregation, so progress reports carry objective and bound only
+        aggregated_config = dict(solver_config, time_limit=solver_config["time_limit"] * AGGREGATED_SHARE)
+        solver, status, progress, search = run_solver(model, aggregated_config, None, on_progress, timer, should_stop)
+        outcome = solver_outcome(solver, status, model, search)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            with timer.phase("disaggregate"):
+                assigned = disaggregate(solver, instance, classes, counts, class_shifts,
+                                        time_limit=time_left(deadline), num_workers=solver_config["num_workers"])
+            if assigned is None:
+                # Some class cannot be split within the consecutive-shift limit (or the time left);
+                # solve per employee instead
+                aggregation["applied"] = False
+                fallback = aggregation
+            else:
+                with timer.phase("extract"):
+                    table = table_from_assigned(instance, assigned)
+
+    elif decomposition and solver_config["decompose"] and decomposition["components"] > 1:
+        hinted = None
+        if previous_days is not None:
+            hinted, total = map_schedule_to_assignments(instance, previous_days)
+            warm_start = {"previous_assignments": total, "matched": len(hinted),
+                          "coverage": round(len(hinted) / total, 3) if total else 0.0}
+        elif draft and solver_config["draft_hint"]:
+            hinted = draft_assigned
+            draft["hinted"] = True
+        result = solve_components(instance, components, solver_config, hinted, timer, should_stop, carry, deadline)
+        if result:
+            assigned, outcome, decomposition_report = result
+            decomposition.update(decomposition_report, applied=True)
+            with timer.phase("extract"):
+                table = table_from_assigned(instance, assigned)
+        else:
+            # Some component has no solution within the time given; solve the full model instead
+            fallback = decomposition
+
+    if fallback is not None:
+        fallback["fallback"] = time_left(deadline) >= MIN_SOLVE_TIME
+    solved = (aggregation and aggregation["applied"]) or (decomposition and decomposition["applied"])
+    if table is None and not solved and (fallback is None or fallback["fallback"]):
+        costs = {}
+        with timer.phase("build"):
+            model, assignments, shifts, model_cache_report = load_or_build_model(instance, solver_config, costs, carry)
+            if previous_days is not None:
+                warm_start = add_schedule_hints(model, instance, assignments, shifts, previous_days)
+            elif draft and solver_config["draft_hint"]:
+                hint_assignments(model, instance, assignments, shifts, draft_assigned)
+                draft["hinted"] = True
+            if restrict:
+                incremental = restrict(model, instance, assignments)
+        # A fallback solve only gets the rest of the time limit
+        full_config = dict(solver_config, time_limit=max(time_left(deadline), 0.01)) if fallback else solver_config
+        reader = AssignmentReader(instance, assignments)
+        format_solution = lambda callback: format_schedule_output(reader.read(callback), instance)
+        if solver_config["objective_mode"] == "lexicographic":
+            solver, status, progress, search, stages = run_lexicographic(
+                model, costs, full_config, format_solution, on_progress, timer, should_stop,
+                floors={"shortage": capacity["shortage_lower_bound"]})
+            outcome = solver_outcome(solver, status, model, search)
+            # The last stage's objective is the preference cost alone; the report compares weighted sums
+            outcome.update(objective=None, best_bound=None, stages=stages)
+            if status == cp_model.OPTIMAL and not all(stage["status"] == "OPTIMAL" for stage in stages):
+                outcome["status"] = "FEASIBLE"
+        else:
+            solver, status, progress, search = run_solver(model, full_config, format_solution,
+                                                          on_progress, timer, should_stop)
+            outcome = solver_outcome(solver, status, model, search)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            with timer.phase("extract"):
+                table = reader.read(solver)
+
+    # Which settings were used and how the search ended, returned alongside the schedule
+    report = {
+        "solver_settings": solver_config,
+        "status": outcome.get("status"),
+        "wall_time": outcome.get("wall_time"),
+        "warm_start": warm_start,
+        "streamed_solutions": progress.emitted if progress else 0,
+        "aggregation": aggregation,
+        "decomposition": decomposition,
+        "incremental": incremental,
+        "carry_over": {"employees": sum(1 for run in carry if run)} if carry else None,
+        "capacity": capacity_report,
+        "model_cache": model_cache_report,
+        "draft": draft,
+        "cancelled": outcome.get("search", {}).get("cancelled", False),
+        "timings": timer.timings,
+        "model": outcome.get("model"),
+        "search": outcome.get("search"),
+        "stages": outcome.get("stages"),
+    }
+
+    if table is not None:
+        report["objective"] = outcome["objective"]
+    elif draft:
+        # Cancelled or out of time before CP-SAT found a schedule (or before an aggregated
+        # solution could be disaggregated): the greedy draft is the best schedule so far
+        table = draft_table
+        report["objective"] = draft["objective"]
+        report["from_draft"] = True
+    else:
+        return None
+
+    report["best_bound"] = outcome.get("best_bound")
+    with timer.phase("extract"):
+        report["objective_breakdown"] = objective_breakdown(table, instance)
+        formatted_json = format_schedule_output(table, instance)
+    if report["objective"] is None:
+        report["objective"] = report["objective_breakdown"]["weighted"]
+    # Every remaining shortage is forced by availability and skills, whatever the search does
+    capacity_report["shortage_proven"] = report["objective_breakdown"]["shortage"] == capacity["shortage_lower_bound"]
+    if draft:
+        # How much the full solve improved on the greedy draft
+        draft["improvement"] = draft["objective"] - report["objective"]
+    textOutput = None
+    if include_text:
+        with timer.phase("render_text"):
+            textOutput = display_schedule(table, instance)
+    return formatted_json, textOutput, report, table
+
+def load_or_build_model(instance, solver_config, costs=None, carry=None):
+    """
+    build_model() for the full instance, reusing the model of an earlier run with the same
+    structure when solver_config['model_cache'] is set. On a hit only the objective is
+    rebuilt (set_objective()), which is all a changed priority or role importance affects;
+    hints are added by the caller either way.
+
+    Returns:
+        tuple: (model, assignments, shifts, report) with report None if the cache is off, else
+        {"hit", "key", "seconds" (to load or build), "saved", plus the process-wide
+        model_cache_stats}.
+    """
+    encoding = solver_config["consecutive_encoding"]
+    if not solver_config["model_cache"]:
+        return build_model(instance, costs=costs, consecutive_encoding=encoding, carry=carry) + (None,)
+
+    started = time.perf_counter()
+    key = structure_key(instance, encoding, carry)
+    entry = model_cache.get(key)
+    if entry is not None:
+        model, assignments, shifts, shortages, balance = unpack_model(entry)
+        set_objective(model, instance, assignments, shortages, balance, costs)
+        seconds = time.perf_counter() - started
+        saved = max(entry["build_time"] - seconds, 0.0)
+    else:
+        structure = {}
+        model, assignments, shifts = build_model(instance, costs=costs, consecutive_encoding=encoding, carry=carry,
+                                                 structure=structure)
+        seconds = time.perf_counter() - started
+        saved = 0.0
+        model_cache.set(key, pack_model(model, assignments, shifts, structure, seconds))
+    model_cache_stats.record(entry is not None, saved)
+    report = {"hit": entry is not None, "key": key, "seconds": round(seconds, 3), "saved": round(saved, 3)}
+    report.update(model_cache_stats.snapshot())
+    return model, assignments, shifts, report
+
+def time_left(deadline):
+    """
+    Seconds until `deadline` (a time.perf_counter() value), never negative.
+    """
+    return max(deadline - time.perf_counter(), 0.0)
+
+def solver_outcome(solver, status, model, search):
+    """
+    Status, objective and statistics of one finished CP-SAT solve, for the report.
+    """
+    ok = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "status": solver.StatusName(status),
+        "wall_time": solver.WallTime(),
+        "objective": solver.ObjectiveValue() if ok else None,
+        "best_bound": solver.BestObjectiveBound(),
+        "model": model_statistics(model),
+        "search": search,
+    }
+
+def solve_components(instance, components, solver_config, hinted=None, timer=None, should_stop=None, carry=None,
+                     deadline=None):
+    """
+    Solves independent components (see find_components()) concurrently and reconciles
+    the balance term they share.
+
+    1. Every component is solved on its own, with its own balance term.
+    2. The resulting loads give a global band [lowest, highest]. Every component is solved
+       again with all its employees' loads held inside the band and only shortage and
+       preference in the objective, starting from its first solution (which lies in the band).
+       The balance of the combined schedule never exceeds the band.
+
+    Components run in a thread pool (CP-SAT releases the GIL while it searches); the
+    configured workers are shared out so that each solve keeps at least four.
+
+    Both passes together stay within the time limit: the first pass gets half of it, the
+    second whatever is left. Within a pass, the components queue up in rounds of the pool's
+    size; each solve gets an equal share of the pass's remaining time with the rounds still
+    to come. The second pass is skipped if no time is left for it.
+
+    Args:
+        hinted (set): Assignment keys to hint (previous schedule or greedy draft).
+        carry (tuple): See build_model().
+        deadline (float): time.perf_counter() value both passes end by (default: the
+            configured time limit from now).
+
+    Returns:
+        tuple: (assigned keys, outcome, decomposition report), or None if some component
+        has no feasible solution. The outcome has no best bound: the band makes the
+        combined schedule a heuristic, not a proven optimum.
+    """
+    timer = timer or PhaseTimer()
+    # Employees with no eligible position need no model: they work no shifts
+    eligible = set().union(*instance.eligible.values())
+    solvable = [c for c in components if any(e in eligible for e in c)]
+    concurrency = max(1, min(len(solvable), solver_config["num_workers"] // 4))
+    component_config = dict(solver_config, num_workers=max(1, solver_config["num_workers"] // concurrency))
+    started = time.perf_counter()
+    if deadline is None:
+        deadline = started + solver_config["time_limit"]
+    # Per pass: its deadline and how many of its components have not started yet
+    pass_state = {}
+    pass_lock = threading.Lock()
+
+    def solve_component(employees, load_band=None, start=None):
+        with pass_lock:
+            # The components not started yet, this one included, need this many more rounds;
+            # they share the pass's remaining time
+            rounds = -(-pass_state["waiting"] // concurrency)
+            pass_state["waiting"] -= 1
+        model, assignments, shifts = build_model(instance, employees, load_band,
+                                                 consecutive_encoding=solver_config["consecutive_encoding"],
+                                                 carry=carry)
+        if start is not None or hinted is not None:
+            hint_assignments(model, instance, assignments, shifts, start if start is not None else hinted)
+        time_limit = max(time_left(pass_state["deadline"]) / rounds, 0.01)
+        solver, status, _, search = run_solver(model, dict(component_config, time_limit=time_limit),
+                                               should_stop=should_stop)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None, model, search
+        return set(table_keys(AssignmentReader(instance, assignments).read(solver))), model, search
+
+    with timer.phase("solve"), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pass_state.update(deadline=time.perf_counter() + time_left(deadline) / 2, waiting=len(solvable))
+        first = list(pool.map(solve_component, solvable))
+        if any(assigned is None for assigned, _, _ in first):
+            return None
+
+        loads = [0] * instance.num_employees
+        for assigned, _, _ in first:
+            for e, _, _ in assigned:
+                loads[e] += 1
+        band = (min(loads), max(loads))
+
+        second = []
+        if time_left(deadline) >= MIN_SOLVE_TIME:
+            pass_state.update(deadline=deadline, waiting=len(solvable))
+            second = list(pool.map(lambda job: solve_component(job[0], band, job[1][0]), zip(solvable, first)))
+    wall_time = time.perf_counter() - started
+
+    assigned = set()
+    for (initial, _, _), (reconciled, _, _) in itertools.zip_longest(first, second, fillvalue=(None, None, None)):
+        # A skipped, cancelled or timed-out second pass keeps the first solution, which fits the band
+        assigned |= reconciled if reconciled is not None else initial
+
+    searches = [search for _, _, search in first + second]
+    models = [model_statistics(model) for _, model, _ in first]
+    outcome = {
+        "status": "FEASIBLE",
+        "wall_time": wall_time,
+        "objective": None,
+        "best_bound": None,
+        "model": {
+            "variables": sum(m["variables"] for m in models),
+            "constraints": sum(m["constraints"] for m in models),
+        },
+        "search": {
+            "branches": sum(search["branches"] for search in searches),
+            "conflicts": sum(search["conflicts"] for search in searches),
+            "cancelled": any(search["cancelled"] for search in searches),
+        },
+    }
+    return assigned, outcome, {
+        "solved_components": len(solvable),
+        "concurrency": concurrency,
+        "load_band": list(band),
+        "reconciled": bool(second),
+    }
+
+def objective_breakdown(table, instance):
+    """
+    Recomputes the three objective terms from an assignment table (unweighted), plus the weighted total.
+    """
+    shortage_cost = 0
+    preference_cost = 0
+    shifts_per_employee = [0] * instance.num_employees
+    for shift in range(instance.num_shifts):
+        for e, _ in table[shift]:
+            shifts_per_employee[e] += 1
+            preference_cost += 10 - instance.priority.get((e, shift), 0)
+        filled = filled_counts(table, shift)
+        for role, required_count in instance.shift_roles[shift]:
+            shortage_cost += (required_count - filled.get(role, 0)) * instance.role_importance[role]
+    balance_cost = max(shifts_per_employee) - min(shifts_per_employee) if shifts_per_employee else 0
+    return {
+        "shortage": shortage_cost,
+        "balance": balance_cost,
+        "preference": preference_cost,
+        "weighted": (BALANCE_WEIGHT * balance_cost +
+                     SHORTAGE_WEIGHT * shortage_cost +
+                     PREFERENCE_WEIGHT * preference_cost),
+    }
+
+def run_solver(model, solver_config, format_solution=None, on_progress=None, timer=None, should_stop=None):
+    """
+    Solves a built model with the resolved solver settings, streaming progress if requested.
+    If `timer` is given, the solve is recorded as 'solve' and split into 'presolve' and 'search'.
+    If `should_stop()` becomes true during the search, it ends early with the best solution so far.
+
+    Returns:
+        tuple: (solver, status, progress callback or None, search statistics)
+    """
+    solver = cp_model.CpSolver()
+    apply_solver_config(solver, solver_config)
+    # The search log is only parsed for the presolve/search split, never printed
+    probe = SearchLogProbe()
+    probe.attach(solver)
+    progress = None
+    if on_progress and solver_config["stream_interval"] > 0:
+        progress = ScheduleProgressCallback(format_solution, on_progress, solver_config["stream_interval"])
+    timer = timer or PhaseTimer()
+    stopper = SearchStopper(solver, should_stop or (lambda: False))
+    with timer.phase("solve"), stopper:
+        status = solver.Solve(model, progress)
+    search = solver_statistics(solver, status in (cp_model.OPTIMAL, cp_model.FEASIBLE), probe)
+    search["cancelled"] = stopper.stopped
+    if "presolve_time" in search:
+        timer.add("presolve", search["presolve_time"])
+        timer.add("search", search["search_time"])
+    return solver, status, progress, search
+
+def run_lexicographic(model, costs, solver_config, format_solution=None, on_progress=None, timer=None,
+                      should_stop=None, floors=None):
+    """
+    Minimizes the cost terms of build_model() one at a time, in OBJECTIVE_STAGES order.
+    After each stage its cost is bounded by the value found, and the solution is the hint
+    for the next stage. Each stage gets its share of the time limit plus whatever the
+    earlier stages left unused. A stage that finds nothing (time out or cancel) ends the
+    run with the previous stage's solution.
+
+    Args:
+        costs (dict): The cost expressions filled in by build_model(costs=...).
+        floors (dict): Known lower bounds of some costs (e.g. the shortage bound of
+            capacity_analysis()). A stage whose incumbent reaches its floor is proven
+            optimal at once instead of searching on for a better bound.
+
+    Returns:
+        tuple: (solver, status, progress callback or None, search statistics, stages) as for
+        run_solver(), for the last stage that found a solution; `stages` lists every stage's
+        {"stage", "status", "objective", "best_bound", "time_limit", "wall_time"}.
+    """
+    timer = timer or PhaseTimer()
+    remaining_time = solver_config["time_limit"]
+    remaining_share = sum(share for _, share in OBJECTIVE_STAGES)
+    stages = []
+    result = None
+    streamed = 0
+    for name, share in OBJECTIVE_STAGES:
+        time_limit = remaining_time * share / remaining_share
+        remaining_share -= share
+        if floors and floors.get(name):
+            model.Add(costs[name] >= floors[name])
+        model.Minimize(costs[name])
+        stage_timer = PhaseTimer()
+        solver, status, progress, search = run_solver(model, dict(solver_config, time_limit=time_limit),
+                                                      format_solution, on_progress, stage_timer, should_stop)
+        for phase, seconds in stage_timer.timings.items():
+            timer.add(phase, seconds)
+        remaining_time = max(remaining_time - stage_timer.timings["solve"], 0.01)
+        streamed += progress.emitted if progress else 0
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        stages.append({
+            "stage": name,
+            "status": solver.StatusName(status),
+            "objective": solver.ObjectiveValue() if found else None,
+            "best_bound": solver.BestObjectiveBound() if found else None,
+            "time_limit": time_limit,
+            "wall_time": stage_timer.timings["solve"],
+        })
+        if not found:
+            break
+        result = (solver, status, progress, search)
+        if search["cancelled"]:
+            break
+
+        # Keep this stage's optimum (or best value so far) and start the next stage from it
+        model.Add(costs[name] <= round(solver.ObjectiveValue()))
+        hint = model.Proto().solution_hint
+        hint.Clear()
+        solution = solver.ResponseProto().solution
+        hint.vars.extend(range(len(solution)))
+        hint.values.extend(solution)
+
+    if result is None:
+        return solver, status, progress, search, stages
+    solver, status, progress, search = result
+    if progress:
+        progress.emitted = streamed
+    return solver, status, progress, search, stages
+
+def workable_runs(shifts, workable, e, num_shifts):
+    """
+    Splits an employee's week into maximal runs of consecutive shifts the employee can work.
+
+    Returns:
+        list: (first shift id, shift variables in order) per run.
+    """
+    runs = []
+    run = None
+    for shift in range(num_shifts):
+        if (e, shift) in workable:
+            if run is None:
+                run = (shift, [])
+                runs.append(run)
+            run[1].append(shifts[(e, shift)])
+        else:
+            run = None
+    return runs
+
+def build_model(instance, employees=None, load_band=None, costs=None, consecutive_encoding="windows", carry=None,
+                structure=None):
+    """
+    Builds the CP-SAT model with one Boolean per (employee, shift, role).
+
+    Args:
+        employees (iterable): Restricts the model to these employee ids (one component found by
+            app/algorithm/decomposition.py); positions none of them can fill are left out.
+        load_band (tuple): (low, high) bounds on every employee's number of shifts. The balance
+            is then fixed by the band, so its term is left out of the objective.
+        costs (dict): If given, receives the unweighted "shortage", "balance" and "preference"
+            cost expressions (see run_lexicographic()).
+        consecutive_encoding (str): How max_consecutive_shifts is enforced, one of
+            solver_config.CONSECUTIVE_ENCODINGS: "windows" adds one linear constraint per sliding window,
+            "automaton" one automaton per run of workable shifts.
+        carry (tuple): Employee id -> shifts worked in a row at the end of the previous week
+            (see app/algorithm/horizon.py); they count towards max_consecutive_shifts.
+        structure (dict): If given, receives the "shortages" variables and the "balance"
+            (max shifts, min shifts) variables, what set_objective() needs besides assignments.
+
+    Returns:
+        tuple: (model, assignments, shifts) where assignments maps (e, shift, role) and
+        shifts maps (e, shift) to the model variables.
+    """
+    model = cp_model.CpModel()
+    NUM_EMPLOYEES = instance.num_employees
+    NUM_SHIFTS = instance.num_shifts
+    max_employees = instance.max_employees
+    max_consecutive_shifts = instance.max_consecutive_shifts
+    members = None if employees is None else set(employees)
+    employee_ids = range(NUM_EMPLOYEES) if members is None else sorted(members)
+    consecutive_transitions = ([(state, 0, 0) for state in range(max_consecutive_shifts + 1)] +
+                               [(state, 1, state + 1) for state in range(max_consecutive_shifts)])
+
+    # New variables: For each (employee, shift, role) where the employee holds the role and is available
     assignments = {}
-    for e in range(NUM_EMPLOYEES):
-        employee = employees[e]
-        for shift in range(NUM_SHIFTS):
-            shift_name = shift_names[shift % shifts_per_day]
-            # רק עבור התפקידים שמוגדרים למשמרת זו ועבורם העובד מוסמך
-            for role in roles_per_shift[shift_name]:
-                if role in employee_skills[employee]:
+    for shift in range(NUM_SHIFTS):
+        for role, _ in instance.shift_roles[shift]:
+            for e in instance.eligible[(shift, role)]:
+                if members is None or e in members:
                     assignments[(e, shift, role)] = model.NewBoolVar(f'assign_{e}_{shift}_{role}')
 
     # Constraint 1: For each employee and shift, no more than one role
+    workable = set()  # (e, shift) pairs with at least one role variable
     shifts = {}  # Create a helper variable to indicate if the employee is assigned to this shift (to maintain the existing format)
-    for e in range(NUM_EMPLOYEES):
-        employee = employees[e]
+    for e in employee_ids:
         for shift in range(NUM_SHIFTS):
-            shift_name = shift_names[shift % shifts_per_day]
             # Collect all variables for roles in which the employee can be assigned during this shift
-            role_vars = [assignments[(e, shift, role)] for role in roles_per_shift[shift_name] if (e, shift, role) in assignments]
+            role_vars = [assignments[(e, shift, role)] for role, _ in instance.shift_roles[shift] if (e, shift, role) in assignments]
             if role_vars:
                 # The employee can be assigned to the shift if at least one role is selected (and we limit it to 1)
                 shifts[(e, shift)] = model.NewBoolVar(f'shift_{e}_{shift}')
+                workable.add((e, shift))
                 model.Add(sum(role_vars) == shifts[(e, shift)])
                 model.Add(sum(role_vars) <= 1)  
             else:
                 shifts[(e, shift)] = model.NewConstant(0)
 
-    # Restrict employee availability – if the employee is not available for a shift, do not allow assignment
-    for e in range(NUM_EMPLOYEES):
-        employee = employees[e]
-        for shift in range(NUM_SHIFTS):
-            if not any(shift_data[0] == shift for shift_data in employee_availability[employee]):
-                shift_name = shift_names[shift % shifts_per_day]
-                for role in roles_per_shift[shift_name]:
-                    if (e, shift, role) in assignments:
-                        model.Add(assignments[(e, shift, role)] == 0)
-
-    # Calculating preference cost – for each role assignment
-    total_preference_cost = []
-    for e in range(NUM_EMPLOYEES):
-        employee = employees[e]
-        for shift in range(NUM_SHIFTS):
-            if any(shift_data[0] == shift for shift_data in employee_availability[employee]):
-                priority = availability_dict.get((employee, shift), 0)
-                shift_name = shift_names[shift % shifts_per_day]
-                for role in roles_per_shift[shift_name]:
-                    if (e, shift, role) in assignments:
-                        total_preference_cost.append((10 - priority) * assignments[(e, shift, role)])
+    # Availability is enforced by construction: no assignment variable exists for an unavailable shift
 
     # constraint 2: Role requirements, The sum of employees assigned to a role plus the shortage equals the requirement
-    # Shortage variables for roles in each shift (as before)
     role_shortages = {}
-    total_shortage_cost = []
-    for shift in range(NUM_SHIFTS):
-        shift_name = shift_names[shift % shifts_per_day]
-        for role, required_count in roles_per_shift[shift_name].items():
-            role_shortages[(shift, role)] = model.NewIntVar(0, required_count, f'shortage_{shift}_{role}')
-
     for shift in range(NUM_SHIFTS):
-        shift_name = shift_names[shift % shifts_per_day]
-        for role, required_count in roles_per_shift[shift_name].items():
-            eligible_employees = []
-            for e in range(NUM_EMPLOYEES):
-                if (e, shift, role) in assignments:
-                    eligible_employees.append(assignments[(e, shift, role)])
+        for role, required_count in instance.shift_roles[shift]:
+            eligible_employees = [assignments[(e, shift, role)] for e in instance.eligible[(shift, role)]
+                                  if (e, shift, role) in assignments]
+            if members is not None and not eligible_employees:
+                continue  # filled by another component, or by nobody
 
+            role_shortages[(shift, role)] = model.NewIntVar(0, required_count, f'shortage_{shift}_{role}')
             model.Add(sum(eligible_employees) + role_shortages[(shift, role)] == required_count)
             model.Add(sum(eligible_employees) <= required_count)
-            shortage_cost = role_shortages[(shift, role)] * role_importance[role]
-            total_shortage_cost.append(shortage_cost)
 
     # Constraint 3: Limit the maximum number of employees per shift (using the variable shifts)
     for shift in range(NUM_SHIFTS):
-        shift_employees = [shifts[(e, shift)] for e in range(NUM_EMPLOYEES) if any(shift_data[0] == shift for shift_data in employee_availability[employees[e]])]
+        shift_employees = [shifts[(e, shift)] for e in instance.shift_employees[shift] if (e, shift) in shifts]
         if shift_employees:
             model.Add(sum(shift_employees) <= max_employees)
 
-    # Constraint 4: Limit the number of consecutive shifts for an employee
-    for e in range(NUM_EMPLOYEES):
-        for day in range(len(work_days)):
-            for shift in range(shifts_per_day):
-                start_shift = day * shifts_per_day + shift
-                if start_shift + max_consecutive_shifts < NUM_SHIFTS:
-                    model.Add(
-                        sum(shifts[(e, s)] 
-                            for s in range(start_shift, min(start_shift + max_consecutive_shifts + 1, NUM_SHIFTS)))
-                        <= max_consecutive_shifts
-                    )
+    # Constraint 4: Limit the number of consecutive shifts for an employee.
+    # A window containing a shift the employee cannot work is satisfied anyway, so only runs of
+    # workable shifts longer than the limit need constraints
+    for e in employee_ids:
+        for first_shift, run in workable_runs(shifts, workable, e, NUM_SHIFTS):
+            # Shifts worked in a row at the end of the previous week, if this run continues them
+            worked = carry[e] if carry and first_shift == 0 else 0
+            if len(run) + worked <= max_consecutive_shifts:
+                continue
+            if consecutive_encoding == "automaton":
+                # One automaton per run; its state is the number of consecutive shifts worked so far
+                model.AddAutomaton(run, worked, range(max_consecutive_shifts + 1), consecutive_transitions)
+            else:
+                # Windows starting before the week count the carried shifts as worked
+                for start in range(-worked, len(run) - max_consecutive_shifts):
+                    window = run[max(start, 0):start + max_consecutive_shifts + 1]
+                    model.Add(sum(window) <= max_consecutive_shifts - max(-start, 0))
 
     # Constraint 5: Balancing workload among employees
     shifts_per_employee = []
-    for e in range(NUM_EMPLOYEES):
+    for e in employee_ids:
         employee_shifts = sum(shifts[(e, shift)] for shift in range(NUM_SHIFTS))
         shifts_per_employee.append(employee_shifts)
+
+    if load_band is not None:
+        low, high = load_band
+        for employee_shifts in shifts_per_employee:
+            model.Add(employee_shifts >= low)
+            model.Add(employee_shifts <= high)
+        set_objective(model, instance, assignments, role_shortages)
+        return model, assignments, shifts
     
     min_shifts_per_employee = model.NewIntVar(0, NUM_SHIFTS, 'min_shifts')
     max_shifts_per_employee = model.NewIntVar(0, NUM_SHIFTS, 'max_shifts')
@@ -146,75 +891,70 @@ def solve_schedule():
     model.AddMaxEquality(max_shifts_per_employee, shifts_per_employee)
 
     # Objective: Combining balance, shortage, and preference costs
-    BALANCE_WEIGHT = 1000
-    SHORTAGE_WEIGHT = 5000
-    PREFERENCE_WEIGHT = 100
-    balance_cost = max_shifts_per_employee - min_shifts_per_employee
-    shortage_cost = sum(total_shortage_cost)
-    preference_cost = sum(total_preference_cost)
-    
-    total_cost = (BALANCE_WEIGHT * balance_cost +
-                  SHORTAGE_WEIGHT * shortage_cost +
-                  PREFERENCE_WEIGHT * preference_cost)
-    
-    model.Minimize(total_cost)
+    balance = (max_shifts_per_employee, min_shifts_per_employee)
+    set_objective(model, instance, assignments, role_shortages, balance, costs)
+    if structure is not None:
+        structure.update(shortages=role_shortages, balance=balance)
 
-    # Solving the model
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 60.0
-    status = solver.Solve(model)
+    return model, assignments, shifts
+
+def set_objective(model, instance, assignments, shortages, balance=None, costs=None):
+    """
+    Sets the weighted objective of build_model(): balance, shortage and preference costs.
+    Only role_importance and the priorities enter here, so a model cached by structure
+    (app/algorithm/model_cache.py) is re-weighted for new ones by calling this again.
 
-    # Update display_schedule to also receive the new variables (assignments)
-    textOutput = display_schedule(solver, shifts, assignments, availability_dict, role_shortages, constraints)
-    # print("textOutput:", textOutput)
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        constraints["assignments"] = assignments
+    Args:
+        shortages (dict): (shift, role) -> shortage variable.
+        balance (tuple): (max shifts, min shifts) variables; None leaves the balance term out.
+        costs (dict): If given, receives the unweighted "shortage", "balance" and "preference"
+            cost expressions (see run_lexicographic()).
+    """
+    shortage_cost = cp_model.LinearExpr.WeightedSum(
+        list(shortages.values()), [instance.role_importance[role] for _, role in shortages])
+    preference_cost = cp_model.LinearExpr.WeightedSum(
+        list(assignments.values()), [10 - instance.priority.get((e, shift), 0) for e, shift, _ in assignments])
+    total_cost = SHORTAGE_WEIGHT * shortage_cost + PREFERENCE_WEIGHT * preference_cost
+    if balance is not None:
+        max_shifts, min_shifts = balance
+        balance_cost = max_shifts - min_shifts
+        total_cost += BALANCE_WEIGHT * balance_cost
+        if costs is not None:
+            costs.update(shortage=shortage_cost, balance=balance_cost, preference=preference_cost)
 
-        formatted_json = format_schedule_output(
-            solver, shifts, employees, work_days, shift_names, shifts_per_day, roles_per_shift, constraints
-        )
-        return formatted_json, textOutput
+    model.ClearObjective()
+    model.Minimize(total_cost)
 
-    return None  
 
-def display_schedule(solver, shifts, assignments, availability_dict, role_shortages, constraints):
+def display_schedule(table, instance):
     """
     Displays a detailed summary of each shift, including assignments by role.
     """
     shift_summaries = []
-    employees = list(constraints["employee_skills"].keys())
-    shift_names = constraints["shift_names"]
-    shifts_per_day = constraints["shifts_per_day"]
-    work_days = constraints["work_days"]
-    roles_per_shift = constraints["roles_per_shift"]
-    NUM_SHIFTS = shifts_per_day * len(work_days)
 
-    for shift in range(NUM_SHIFTS):
+    for shift in range(instance.num_shifts):
         lines = []
-        day = work_days[shift // shifts_per_day]
-        shift_name = shift_names[shift % shifts_per_day]
+        day = instance.day_name(shift)
+        shift_name = instance.shift_name(shift)
         
         lines.append(f"{day.upper()} - {shift_name.upper()}")
         lines.append("=" * 30)
         
         # 1. Role requirements
-        shift_roles = roles_per_shift[shift_name]
+        shift_roles = instance.shift_roles[shift]
         lines.append("Required Roles:")
-        for role, count in shift_roles.items():
-            lines.append(f"  • {role.capitalize()}: {count} needed")
+        for role, count in shift_roles:
+            lines.append(f"  • {instance.roles[role].capitalize()}: {count} needed")
         
-        # 2. Employee assignments by role – using the assignments variables to determine which roles are filled
+        # 2. Employee assignments by role – read from the assignment table
         lines.append("\nAssigned Employees by Role:")
-        assigned_by_role = {role: [] for role in shift_roles.keys()}
-        for e, employee in enumerate(employees):
-            shift_name = shift_names[shift % shifts_per_day]
-            for role in roles_per_shift[shift_name]:
-                if (e, shift, role) in assignments and solver.Value(assignments[(e, shift, role)]) == 1:
-                    priority = availability_dict.get((employee, shift), 0)
-                    assigned_by_role[role].append((employee, priority))
+        assigned_by_role = {role: [] for role, _ in shift_roles}
+        for e, role in table[shift]:
+            priority = instance.priority.get((e, shift), 0)
+            assigned_by_role[role].append((instance.employees[e], priority))
         
-        for role in shift_roles.keys():
-            lines.append(f"  {role.capitalize()}:")
+        for role, _ in shift_roles:
+            lines.append(f"  {instance.roles[role].capitalize()}:")
             if assigned_by_role[role]:
                 for emp, priority in sorted(assigned_by_role[role], key=lambda x: x[0]):
                     lines.append(f"    ✓ {emp} (Priority: {priority}/10)")
@@ -225,8 +965,7 @@ def display_schedule(solver, shifts, assignments, availability_dict, role_shorta
         lines.append("\nStaffing Status:")
         has_shortages = False
         shift_status = []
-        for role in shift_roles.keys():
-            required_count = shift_roles[role]
+        for role, required_count in shift_roles:
             # Number of employees assigned to this role
             assigned_count = len(assigned_by_role.get(role, []))
             shortage = required_count - assigned_count
@@ -235,7 +974,7 @@ def display_schedule(solver, shifts, assignments, availability_dict, role_shorta
                 has_shortages = True
             else:
                 status_str = "✓ FULL"
-            shift_status.append(f"  {role.capitalize()}: {status_str} ({assigned_count}/{required_count} filled)")
+            shift_status.append(f"  {instance.roles[role].capitalize()}: {status_str} ({assigned_count}/{required_count} filled)")
         shift_status.sort(key=lambda x: "SHORTAGE" not in x)
         lines.extend(shift_status)
         
@@ -0,0 +1,43 @@
+def find_components(instance):
+    """
+    Splits the employees into groups that never compete for anything but the balance term.
+
+    Two employees are linked when they can fill the same (shift, role) position, or when
+    they are both available on a shift whose per-shift maximum can actually bind (the
+    shift's total requirement exceeds max_employees). Consecutive-shift windows only
+    involve one employee, so they never link anyone.
+
+    Returns:
+        list: Sorted tuples of employee ids, largest component first.
+    """
+    parent = list(range(instance.num_employees))
+
+    def find(e):
+        while parent[e] != e:
+            parent[e] = parent[parent[e]]
+            e = parent[e]
+        return e
+
+    def link(group):
+        group = iter(group)
+        first = next(group, None)
+        if first is None:
+            return
+        root = find(first)
+        for e in group:
+            other = find(e)
+            if other != root:
+                parent[other] = root
+
+    for employees in instance.eligible.values():
+        link(employees)
+    for shift in range(instance.num_shifts):
+        required = sum(count for _, count in instance.shift_roles[shift])
+        if required > instance.max_employees:
+            link(instance.shift_employees[shift])
+
+    groups = {}
+    for e in range(instance.num_employees):
+        groups.setdefault(find(e), []).append(e)
+    return sorted((tuple(members) for members in groups.values()), key=lambda c: (-len(c), c[0]))
+
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class AssignmentReader:
+    """
+    Reads a whole solution into an assignment table in one pass.
+
+    The variable indices of all assignment Booleans are collected once per model; each
+    read then takes the raw solution vector of the response and selects the assigned
+    ones with a single NumPy lookup, instead of one Value() call per (employee, shift, role).
+    """
+
+    def __init__(self, instance, assignments):
+        self.instance = instance
+        self.keys = list(assignments)
+        self.indices = np.fromiter((var.Index() for var in assignments.values()), dtype=np.int64,
+                                   count=len(self.keys))
+
+    def read(self, source):
+        """
+        Args:
+            source: A solved CpSolver, or a solution callback during the search.
+
+        Returns:
+            tuple: The assignment table (see table_from_assigned()).
+        """
+        response = source.ResponseProto() if hasattr(source, "ResponseProto") else source.Response()
+        solution = np.asarray(response.solution, dtype=np.int64)
+        picked = np.flatnonzero(solution[self.indices]) if len(self.keys) else ()
+        return table_from_assigned(self.instance, (self.keys[i] for i in picked))
+
+
+def table_from_assigned(instance, assigned):
+    """
+    Builds the assignment table from (employee id, shift id, role id) tuples.
+
+    Returns:
+        tuple: One tuple per shift of (employee id, role id) pairs, sorted by employee id.
+    """
+    table = [[] for _ in range(instance.num_shifts)]
+    for e, shift, role in assigned:
+        table[shift].append((e, role))
+    return tuple(tuple(sorted(on_shift)) for on_shift in table)
+
+
+def table_keys(table):
+    """
+    The (employee id, shift id, role id) tuples of an assignment table.
+    """
+    for shift, on_shift in enumerate(table):
+        for e, role in on_shift:
+            yield e, shift, role
+
+
+def filled_counts(table, shift):
+    """
+    Number of employees assigned to each role of a shift.
+    """
+    counts = {}
+    for _, role in table[shift]:
+        counts[role] = counts.get(role, 0) + 1
+    return counts
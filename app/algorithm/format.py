@@ -1,56 +1,43 @@
 import json
-from models.database import get_collection
 from collections import defaultdict
 from models.manager_settings_model import get_manager_settings
+from models.constraints_model import get_final_constraints
+from app.algorithm.extraction import filled_counts
 
 
-def format_schedule_output(solver, shifts, employees, work_days, shift_names, shifts_per_day, roles_per_shift, constraints):
-    import json
+def format_schedule_output(table, instance):
+    """
+    Converts an assignment table (see app/algorithm/extraction.py) into the schedule JSON.
+    """
     schedule = []
     
-    # ניגש למשתני ההקצאה שהוספנו למילון constraints
-    assignments = constraints.get("assignments", None)
-    
-    for day_index, day_name in enumerate(work_days):
+    for day_index, day_name in enumerate(instance.work_days):
         day_shifts = []
         
-        for shift_num in range(shifts_per_day):
-            shift_index = day_index * shifts_per_day + shift_num
+        for shift_num in range(instance.shifts_per_day):
+            shift_index = day_index * instance.shifts_per_day + shift_num
+
+            # העובדים שובצו למשמרת זו, ממוינים לפי מספר עובד
             assigned_employees = []
-            
-            # עבור כל עובד, נבדוק אם הוא מוקצה למשמרת זו ובאיזה תפקיד
-            for emp_index, emp_name in enumerate(employees):
-                assigned_role = None
-                # עבור כל תפקיד שהוגדר למשמרת זו (בהתבסס על שמו של המשמרת)
-                required_roles = roles_per_shift.get(shift_names[shift_num], {})
-                for role in required_roles.keys():
-                    # נבדוק אם קיים משתנה הקצאה עבור (עובד, משמרת, תפקיד) ואם הערך שלו הוא 1
-                    if assignments and (emp_index, shift_index, role) in assignments:
-                        if solver.Value(assignments[(emp_index, shift_index, role)]) == 1:
-                            assigned_role = role
-                            break
-                if assigned_role is not None:
-                    assigned_employees.append({
-                        "id": f"e{emp_index}_s{shift_index}",
-                        "name": emp_name,
-                        "role": assigned_role,
-                        "hours": "8",
-                    })
+            for emp_index, role in table[shift_index]:
+                assigned_employees.append({
+                    "id": f"e{emp_index}_s{shift_index}",
+                    "name": instance.employees[emp_index],
+                    "role": instance.roles[role],
+                    "hours": "8",
+                })
                     
             # Calculate shortages by role
+            filled = filled_counts(table, shift_index)
             shortages_info = {}
-            required_roles = roles_per_shift.get(shift_names[shift_num], {})
-            for role, required_count in required_roles.items():
-                assigned_count = sum(
-                    1 for emp in assigned_employees if emp["role"] == role
-                )
-                shortage = required_count - assigned_count
+            for role, required_count in instance.shift_roles[shift_index]:
+                shortage = required_count - filled.get(role, 0)
                 if shortage > 0:
-                    shortages_info[role] = shortage
+                    shortages_info[instance.roles[role]] = shortage
             
             day_shifts.append({
                 "id": f"s{shift_index}",
-                "time": shift_names[shift_num],
+                "time": instance.shift_names[shift_num],
                 "employees": assigned_employees,
                 "shortages": shortages_info,
             })
@@ -69,10 +56,8 @@ def format_schedule_input():
     Fetches constraints from the database and converts them into a format understood by the algorithm.
     """
     manager_settings= get_manager_settings()
-    active_version = manager_settings["activeVersion"]
-    constraintsDB = get_collection("constraints")
     shifts_per_day=manager_settings["shifts_per_day"]
-    constraints = constraintsDB.find({"is_final": True,"version": active_version}) 
+    constraints = get_final_constraints(manager_settings, fields="solver")
 
     employee_skills = {}
     employee_availability = defaultdict(list)
@@ -0,0 +1,100 @@
+import random
+
+ROLE_NAMES = ["Waiter", "Cook", "Bartender", "Host", "Cashier", "Dishwasher", "Cleaner", "Shift Manager"]
+DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+SHIFT_NAMES = ["Morning", "Evening", "Night", "Late Night"]
+PRIORITY_DISTRIBUTIONS = ("uniform", "skewed", "flat")
+
+
+def _priority(rnd, distribution):
+    if distribution == "uniform":
+        return rnd.randint(1, 10)
+    if distribution == "skewed":
+        # Most availability is "can work", a few shifts are strongly preferred
+        return min(10, max(1, round(rnd.triangular(1, 10, 3))))
+    return 5
+
+
+def generate_instance(num_employees, num_roles=4, shifts_per_day=3, work_days=6,
+                      availability_density=0.5, priority_distribution="uniform",
+                      staffing_ratio=0.6, max_consecutive_shifts=2, seed=0):
+    """
+    Generates a synthetic instance in the parse_json_to_constraints() format.
+
+    Args:
+        num_employees (int): Number of employees.
+        num_roles (int): Number of distinct roles.
+        shifts_per_day (int): Shifts per work day.
+        work_days (int): Number of work days (1-7).
+        availability_density (float): Probability that an employee submits a given shift.
+        priority_distribution (str): One of PRIORITY_DISTRIBUTIONS.
+        staffing_ratio (float): Required positions across the week relative to the number of
+            employees; around 0.6-1.0 gives realistic, sometimes short-staffed instances.
+        max_consecutive_shifts (int): Consecutive-shift limit.
+        seed (int): Random seed; the same arguments always produce the same instance.
+
+    Returns:
+        dict: The generated instance.
+
+    Raises:
+        ValueError: If an argument is out of range.
+    """
+    if not 1 <= work_days <= len(DAY_NAMES):
+        raise ValueError(f"work_days must be between 1 and {len(DAY_NAMES)}")
+    if not 1 <= shifts_per_day <= len(SHIFT_NAMES):
+        raise ValueError(f"shifts_per_day must be between 1 and {len(SHIFT_NAMES)}")
+    if priority_distribution not in PRIORITY_DISTRIBUTIONS:
+        raise ValueError(f"priority_distribution must be one of {', '.join(PRIORITY_DISTRIBUTIONS)}")
+    if num_roles < 1:
+        raise ValueError("num_roles must be at least 1")
+
+    rnd = random.Random(seed)
+    roles = [ROLE_NAMES[r] if r < len(ROLE_NAMES) else f"Role {r + 1}" for r in range(num_roles)]
+    shift_names = SHIFT_NAMES[:shifts_per_day]
+    days = DAY_NAMES[:work_days]
+    num_shifts = shifts_per_day * work_days
+
+    # Some roles are much more common than others (many waiters, few managers)
+    role_weights = [1.0 / (r + 1) for r in range(num_roles)]
+    role_importance = {role: rnd.randint(1, 5) for role in roles}
+
+    employee_skills = {}
+    employee_availability = {}
+    for i in range(num_employees):
+        name = f"Employee {i + 1:04d}"
+        skill_count = 1 if rnd.random() < 0.7 else min(num_roles, 2)
+        skills = []
+        while len(skills) < skill_count:
+            role = rnd.choices(roles, weights=role_weights)[0]
+            if role not in skills:
+                skills.append(role)
+        employee_skills[name] = skills
+        employee_availability[name] = [
+            [shift, _priority(rnd, priority_distribution)]
+            for shift in range(num_shifts)
+            if rnd.random() < availability_density
+        ]
+
+    # Spread the weekly staffing demand over shifts and roles
+    positions_per_shift = max(1, round(num_employees * staffing_ratio / num_shifts))
+    roles_per_shift = {}
+    for shift_name in shift_names:
+        demand = {}
+        for _ in range(positions_per_shift):
+            role = rnd.choices(roles, weights=role_weights)[0]
+            demand[role] = demand.get(role, 0) + 1
+        roles_per_shift[shift_name] = demand
+
+    return {
+        "employee_skills": employee_skills,
+        "employee_availability": employee_availability,
+        "shifts_per_day": shifts_per_day,
+        "shift_length": 8,
+        "shift_names": shift_names,
+        "work_days": days,
+        "min_max_employees_per_shift": {"min": 1, "max": positions_per_shift + 2},
+        "roles_per_shift": roles_per_shift,
+        "max_consecutive_shifts": max_consecutive_shifts,
+        "role_importance": role_importance,
+        "activeVersion": f"SYNTH{seed:04d}",
+    }
@@ -0,0 +1,56 @@
+def greedy_assign(instance, carry=None):
+    """
+    Builds a feasible schedule in one constructive pass, without a solver.
+
+    Positions are filled role by role in decreasing role_importance; within a role, the
+    shifts with the fewest eligible employees go first. Each position goes to the available
+    employee with the highest priority for the shift, ties broken by fewest shifts so far.
+    An employee is only placed if the shift stays under the per-shift maximum, the employee
+    works one role per shift, and no window of max_consecutive_shifts + 1 shifts gets full.
+
+    Args:
+        carry (tuple): Employee id -> shifts worked in a row at the end of the previous week;
+            they are treated as worked shifts just before shift 0.
+
+    Returns:
+        set: (employee id, shift id, role id) tuples.
+    """
+    window = instance.max_consecutive_shifts
+    # employee id -> shift ids; carried shifts get negative ids
+    working = [set(range(-carry[e], 0)) if carry else set() for e in range(instance.num_employees)]
+    on_shift = [0] * instance.num_shifts
+    load = [0] * instance.num_employees
+
+    def fits(e, shift):
+        if shift in working[e]:
+            return False
+        # Every window of window + 1 consecutive shifts that contains `shift`
+        for start in range(shift - window, min(shift, instance.num_shifts - window - 1) + 1):
+            if sum(1 for s in range(start, start + window + 1) if s in working[e]) >= window:
+                return False
+        return True
+
+    positions = [
+        (shift, role, required_count)
+        for shift in range(instance.num_shifts)
+        for role, required_count in instance.shift_roles[shift]
+    ]
+    positions.sort(key=lambda p: (-instance.role_importance[p[1]], len(instance.eligible[(p[0], p[1])]), p[0]))
+
+    assigned = set()
+    for shift, role, required_count in positions:
+        candidates = sorted(
+            instance.eligible[(shift, role)],
+            key=lambda e: (-instance.priority.get((e, shift), 0), load[e], e),
+        )
+        filled = 0
+        for e in candidates:
+            if filled == required_count or on_shift[shift] >= instance.max_employees:
+                break
+            if fits(e, shift):
+                assigned.add((e, shift, role))
+                working[e].add(shift)
+                on_shift[shift] += 1
+                load[e] += 1
+                filled += 1
+    return assigned
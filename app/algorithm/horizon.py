@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from app.algorithm.warm_start import schedule_entries
+
+# Calendar order of the day names used in manager_settings.work_days
+WEEK_DAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+
+
+def weeks_are_contiguous(instance):
+    """
+    Whether the shifts run without a gap across the week and into the next one, i.e. the
+    work days are every day of the week in calendar order (a 7-day week, starting on any day).
+    """
+    try:
+        days = [WEEK_DAYS.index(day) for day in instance.work_days]
+    except ValueError:
+        return False
+    return all((following - day) % len(WEEK_DAYS) == 1 for day, following in zip(days, days[1:] + days[:1]))
+
+
+def schedule_precedes(week_range, week_start):
+    """
+    Whether a published schedule's `week_range` ("d/m/Y - d/m/Y", see WeeklyScheduleModel)
+    ends on the day before `week_start`, so its last shifts run into the week being solved.
+    """
+    try:
+        end = datetime.strptime(week_range.split("-")[1].strip(), "%d/%m/%Y").date()
+    except (AttributeError, IndexError, ValueError):
+        return False
+    return end == week_start - timedelta(days=1)
+
+
+def trailing_runs(instance, working):
+    """
+    Number of shifts each employee works in a row at the end of a week, capped at
+    max_consecutive_shifts. These carry over into the consecutive-shift limit of the
+    next week (see build_model(carry=...)).
+
+    Args:
+        working (set): (employee id, shift id) pairs worked in that week.
+
+    Returns:
+        tuple: Employee id -> trailing run length; all zeros if the weeks are not contiguous.
+    """
+    carry = [0] * instance.num_employees
+    if not weeks_are_contiguous(instance):
+        return tuple(carry)
+    for e in range(instance.num_employees):
+        shift = instance.num_shifts - 1
+        while shift >= 0 and (e, shift) in working and carry[e] < instance.max_consecutive_shifts:
+            carry[e] += 1
+            shift -= 1
+    return tuple(carry)
+
+
+def table_carry(instance, table):
+    """
+    trailing_runs() of an assignment table of `instance`.
+    """
+    return trailing_runs(instance, {(e, shift) for shift, on_shift in enumerate(table) for e, _ in on_shift})
+
+
+def schedule_carry(instance, days):
+    """
+    trailing_runs() of a published schedule (the `days` stored by WeeklyScheduleModel),
+    matched onto the current instance by employee, day and shift name. Unlike a warm-start
+    hint, every shift worked counts, whether or not it is still available this week.
+    """
+    employee_ids = {name: e for e, name in enumerate(instance.employees)}
+    working = set()
+    for shift_id, employee in schedule_entries(instance, days):
+        e = employee_ids.get(employee.get("name"))
+        if shift_id is not None and e is not None:
+            working.add((e, shift_id))
+    return trailing_runs(instance, working)
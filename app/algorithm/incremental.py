@@ -0,0 +1,109 @@
+from app.algorithm.warm_start import schedule_entries, map_schedule_to_assignments
+
+
+def neighborhood_shifts(instance, days, changed_employees):
+    """
+    Shifts to re-optimize after the constraints of some employees changed.
+
+    Affected shifts are those a changed employee worked in the previous schedule (they may
+    have to be vacated) and those where a changed employee could now fill a shortage the
+    previous schedule left. Every window of max_consecutive_shifts + 1 shifts that contains
+    an affected shift is opened as well, so moving a changed employee never leaves a fixed
+    neighbour stuck against the consecutive-shift limit.
+
+    Args:
+        days (list): The previous schedule's `days`.
+        changed_employees (iterable): Full names of the employees whose constraints changed.
+
+    Returns:
+        tuple: (affected shift ids, shift ids left free for the solver)
+    """
+    changed = set(changed_employees)
+    employee_ids = {name: e for e, name in enumerate(instance.employees)}
+    role_ids = {role: r for r, role in enumerate(instance.roles)}
+    changed_ids = [employee_ids[name] for name in changed if name in employee_ids]
+
+    affected = set()
+    for shift_id, employee in schedule_entries(instance, days):
+        if shift_id is not None and employee.get("name") in changed:
+            affected.add(shift_id)
+    for shift_id, shortages in schedule_shortages(instance, days):
+        short_roles = {role_ids[role] for role in shortages if role in role_ids}
+        if any(e in instance.eligible.get((shift_id, role), ()) for role in short_roles for e in changed_ids):
+            affected.add(shift_id)
+
+    window = instance.max_consecutive_shifts
+    free = set()
+    for shift in affected:
+        free.update(range(max(0, shift - window), min(instance.num_shifts, shift + window + 1)))
+    return affected, free
+
+
+def schedule_shortages(instance, days):
+    """
+    Yields (shift id, shortages by role name) for the shifts of a published schedule that
+    exist in the current instance.
+    """
+    day_ids = {day: d for d, day in enumerate(instance.work_days)}
+    shift_nums = {name: s for s, name in enumerate(instance.shift_names[:instance.shifts_per_day])}
+    for day in days or []:
+        day_index = day_ids.get(day.get("name"))
+        for shift in day.get("shifts", []):
+            shift_num = shift_nums.get(shift.get("time"))
+            if day_index is not None and shift_num is not None and shift.get("shortages"):
+                yield day_index * instance.shifts_per_day + shift_num, shift["shortages"]
+
+
+def fix_outside_neighborhood(model, instance, assignments, days, free):
+    """
+    Pins every assignment outside the `free` shifts to its value in the previous schedule.
+
+    Returns:
+        dict: Neighborhood size for the task result.
+    """
+    matched, _ = map_schedule_to_assignments(instance, days)
+    fixed = 0
+    for key, var in assignments.items():
+        if key[1] not in free:
+            model.Add(var == (1 if key in matched else 0))
+            fixed += 1
+    return {
+        "free_shifts": sorted(free),
+        "fixed_assignments": fixed,
+        "free_assignments": len(assignments) - fixed,
+    }
+
+
+def schedule_diff(previous_days, schedule):
+    """
+    Per-shift differences between two schedules in the format_schedule_output() format.
+    Shifts are matched by day name and shift time; unchanged shifts are left out.
+
+    Returns:
+        list: {"day", "shift", "id", "added", "removed"} for every changed shift, where
+        added/removed list {"name", "role"} entries.
+    """
+    def entries(days):
+        shifts = {}
+        for day in days or []:
+            for shift in day.get("shifts", []):
+                key = (day.get("name"), shift.get("time"))
+                shifts[key] = {(emp.get("name"), emp.get("role")) for emp in shift.get("employees", [])}
+        return shifts
+
+    before = entries(previous_days)
+    diff = []
+    for day in schedule:
+        for shift in day["shifts"]:
+            key = (day["name"], shift["time"])
+            after = {(emp["name"], emp["role"]) for emp in shift["employees"]}
+            old = before.get(key, set())
+            if after != old:
+                diff.append({
+                    "day": day["name"],
+                    "shift": shift["time"],
+                    "id": shift["id"],
+                    "added": [{"name": name, "role": role} for name, role in sorted(after - old)],
+                    "removed": [{"name": name, "role": role} for name, role in sorted(old - after)],
+                })
+    return diff
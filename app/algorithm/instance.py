@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+
+@dataclass(frozen=True)
+class ProblemInstance:
+    """
+    Immutable, index-based view of the solver input.
+
+    Employees, shifts and roles are addressed by integer ids:
+      - employee id: position in `employees`
+      - shift id: day_index * shifts_per_day + shift_num (same as the availability ids)
+      - role id: position in `roles`
+    """
+    employees: Tuple[str, ...]
+    roles: Tuple[str, ...]
+    work_days: Tuple[str, ...]
+    shift_names: Tuple[str, ...]
+    shifts_per_day: int
+    num_shifts: int
+    min_employees: int
+    max_employees: int
+    max_consecutive_shifts: int
+    role_importance: Tuple[int, ...]          # role id -> weight
+    skills: Tuple[frozenset, ...]             # employee id -> role ids
+    availability: Tuple[frozenset, ...]       # employee id -> shift ids
+    priority: Mapping                         # (employee id, shift id) -> priority
+    shift_roles: Tuple[Tuple[Tuple[int, int], ...], ...]  # shift id -> ((role id, required), ...)
+    eligible: Mapping                         # (shift id, role id) -> employee ids
+    shift_employees: Tuple[Tuple[int, ...], ...]  # shift id -> employees eligible for any role
+    role_employees: Mapping                   # role id -> employee ids holding the skill
+    data: Mapping                             # the raw parse_json_to_constraints() payload
+
+    @property
+    def num_employees(self):
+        return len(self.employees)
+
+    def shift_name(self, shift):
+        return self.shift_names[shift % self.shifts_per_day]
+
+    def day_name(self, shift):
+        return self.work_days[shift // self.shifts_per_day]
+
+
+def compile_instance(data):
+    """
+    Builds a ProblemInstance from the output of parse_json_to_constraints().
+    All lookups the model builder and the formatters need are computed once here.
+    """
+    employee_skills = data["employee_skills"]
+    employee_availability = data["employee_availability"]
+    shifts_per_day = data["shifts_per_day"]
+    work_days = tuple(data["work_days"])
+    shift_names = tuple(data["shift_names"])
+    roles_per_shift = data["roles_per_shift"]
+    num_shifts = shifts_per_day * len(work_days)
+
+    employees = tuple(employee_skills.keys())
+
+    # Only roles that some shift actually requires take part in the model
+    roles = []
+    for shift_name in shift_names[:shifts_per_day]:
+        for role in roles_per_shift[shift_name]:
+            if role not in roles:
+                roles.append(role)
+    roles = tuple(roles)
+    role_ids = {role: r for r, role in enumerate(roles)}
+    role_importance = tuple(data["role_importance"][role] for role in roles)
+
+    skills = tuple(
+        frozenset(role_ids[role] for role in employee_skills[employee] if role in role_ids)
+        for employee in employees
+    )
+
+    # Mapping (employee id, shift id) -> priority; the last entry wins on duplicates
+    priority = {}
+    availability = []
+    for e, employee in enumerate(employees):
+        available = set()
+        for shift_id, shift_priority in employee_availability.get(employee, []):
+            if 0 <= shift_id < num_shifts:
+                available.add(shift_id)
+                priority[(e, shift_id)] = shift_priority
+        availability.append(frozenset(available))
+    availability = tuple(availability)
+
+    role_employees = {r: [] for r in range(len(roles))}
+    for e, employee_roles in enumerate(skills):
+        for r in employee_roles:
+            role_employees[r].append(e)
+
+    shift_roles = []
+    eligible = {}
+    shift_employees = []
+    for shift in range(num_shifts):
+        shift_name = shift_names[shift % shifts_per_day]
+        required = tuple((role_ids[role], count) for role, count in roles_per_shift[shift_name].items())
+        shift_roles.append(required)
+        on_shift = set()
+        for r, _ in required:
+            employees_for_role = tuple(e for e in role_employees[r] if shift in availability[e])
+            eligible[(shift, r)] = employees_for_role
+            on_shift.update(employees_for_role)
+        shift_employees.append(tuple(sorted(on_shift)))
+
+    return ProblemInstance(
+        employees=employees,
+        roles=roles,
+        work_days=work_days,
+        shift_names=shift_names,
+        shifts_per_day=shifts_per_day,
+        num_shifts=num_shifts,
+        min_employees=data["min_max_employees_per_shift"]["min"],
+        max_employees=data["min_max_employees_per_shift"]["max"],
+        max_consecutive_shifts=data["max_consecutive_shifts"],
+        role_importance=role_importance,
+        skills=skills,
+        availability=availability,
+        priority=MappingProxyType(priority),
+        shift_roles=tuple(shift_roles),
+        eligible=MappingProxyType(eligible),
+        shift_employees=tuple(shift_employees),
+        role_employees=MappingProxyType({r: tuple(es) for r, es in role_employees.items()}),
+        data=MappingProxyType(dict(data)),
+    )
@@ -0,0 +1,102 @@
+import re
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Collects wall-clock durations (in seconds) of named phases of a schedule generation.
+    Re-entering a phase adds to its total.
+    """
+
+    def __init__(self, timings=None):
+        self.timings = timings if timings is not None else {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+class SearchLogProbe:
+    """
+    CP-SAT log callback that keeps only what the search log alone can tell us:
+    when presolve ended and the size of the presolved model. Nothing is printed.
+    """
+
+    SEARCH_START = re.compile(r"^Starting search at ([\d.]+)s")
+    VARIABLES = re.compile(r"^#Variables: ([\d']+)")
+
+    def __init__(self):
+        self.presolve_time = None
+        self.presolved_variables = None
+        self._in_presolved_model = False
+
+    def __call__(self, message):
+        # CP-SAT may pass several log lines in one message
+        for line in message.splitlines():
+            self._read_line(line)
+
+    def _read_line(self, line):
+        if line.startswith("Presolved optimization model"):
+            self._in_presolved_model = True
+            return
+        if self._in_presolved_model:
+            match = self.VARIABLES.match(line)
+            if match:
+                self.presolved_variables = int(match.group(1).replace("'", ""))
+                self._in_presolved_model = False
+            return
+        match = self.SEARCH_START.match(line)
+        if match:
+            self.presolve_time = float(match.group(1))
+
+    def attach(self, solver):
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = self
+
+
+def model_statistics(model):
+    """
+    Variable and constraint counts of a built CpModel, by constraint type.
+    """
+    proto = model.Proto()
+    by_type = {}
+    for constraint in proto.constraints:
+        kind = constraint.WhichOneof("constraint")
+        by_type[kind] = by_type.get(kind, 0) + 1
+    return {
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "constraints_by_type": by_type,
+    }
+
+
+def solver_statistics(solver, status_ok, probe=None):
+    """
+    CP-SAT response statistics: search effort, bound and gap, and the presolve/search split.
+    """
+    stats = {
+        "wall_time": solver.WallTime(),
+        "user_time": solver.UserTime(),
+        "deterministic_time": solver.ResponseProto().deterministic_time,
+        "branches": solver.NumBranches(),
+        "conflicts": solver.NumConflicts(),
+        "best_bound": solver.BestObjectiveBound(),
+    }
+    if status_ok:
+        objective = solver.ObjectiveValue()
+        stats["objective"] = objective
+        stats["gap"] = abs(objective - stats["best_bound"]) / max(1.0, abs(objective))
+    if probe is not None and probe.presolve_time is not None:
+        stats["presolve_time"] = probe.presolve_time
+        stats["search_time"] = max(0.0, stats["wall_time"] - probe.presolve_time)
+        stats["presolved_variables"] = probe.presolved_variables
+    return stats
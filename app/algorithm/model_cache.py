@@ -0,0 +1,96 @@
+import base64
+import os
+import threading
+from ortools.sat.python import cp_model
+from utils.cache import create_cache, stable_hash
+
+# Built models keyed by structure_key(); unlike the schedule cache this is not cleared on
+# constraint writes, since a changed priority or role importance keeps the structure
+model_cache = create_cache("model", ttl=int(os.getenv("MODEL_CACHE_TTL", 24 * 3600)), maxsize=4)
+
+
+def structure_key(instance, consecutive_encoding, carry=None):
+    """
+    Hash of everything build_model() turns into variables and constraints: who can work
+    which shift in which role, the requirements and the per-shift and consecutive limits.
+    Priorities and role importance only weight the objective and are left out.
+    """
+    return stable_hash({
+        "employees": instance.num_employees,
+        "skills": [sorted(roles) for roles in instance.skills],
+        "availability": [sorted(shifts) for shifts in instance.availability],
+        "shift_roles": instance.shift_roles,
+        "max_employees": instance.max_employees,
+        "max_consecutive_shifts": instance.max_consecutive_shifts,
+        "consecutive_encoding": consecutive_encoding,
+        "carry": carry,
+    })
+
+
+def pack_model(model, assignments, shifts, structure, build_time):
+    """
+    Serializes a model built by build_model(structure=...) together with the proto indexes of
+    its variables. The entry is plain JSON, so it can live in Redis as well as in memory.
+    """
+    max_shifts, min_shifts = structure["balance"]
+    return {
+        "proto": base64.b64encode(model.Proto().SerializeToString()).decode("ascii"),
+        "assignments": [[e, shift, role, var.Index()] for (e, shift, role), var in assignments.items()],
+        "shifts": [[e, shift, var.Index()] for (e, shift), var in shifts.items()],
+        "shortages": [[shift, role, var.Index()] for (shift, role), var in structure["shortages"].items()],
+        "balance": [max_shifts.Index(), min_shifts.Index()],
+        "build_time": build_time,
+    }
+
+
+def unpack_model(entry):
+    """
+    Rebuilds a model from pack_model(), without hints.
+
+    Returns:
+        tuple: (model, assignments, shifts, shortages, balance) as build_model() and
+        build_model(structure=...) return them.
+    """
+    model = cp_model.CpModel()
+    model.Proto().ParseFromString(base64.b64decode(entry["proto"]))
+    model.ClearHints()
+    var = model.GetIntVarFromProtoIndex
+    assignments = {(e, shift, role): var(index) for e, shift, role, index in entry["assignments"]}
+    shifts = {(e, shift): var(index) for e, shift, index in entry["shifts"]}
+    shortages = {(shift, role): var(index) for shift, role, index in entry["shortages"]}
+    balance = tuple(var(index) for index in entry["balance"])
+    return model, assignments, shifts, shortages, balance
+
+
+class ModelCacheStats:
+    """
+    Hit rate and rebuild time saved by the model cache in this process.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, hit, saved=0.0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.time_saved += saved
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "time_saved": round(self.time_saved, 3),
+            }
+
+
+model_cache_stats = ModelCacheStats()
+
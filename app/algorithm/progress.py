@@ -0,0 +1,73 @@
+import threading
+import time
+from ortools.sat.python import cp_model
+
+
+class ScheduleProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Streams improving solutions while CP-SAT is still searching.
+
+    Every new solution of a minimization is an improvement; to keep the socket traffic
+    bounded, at most one is reported per `interval` seconds. The final schedule is
+    always delivered separately once the search ends.
+
+    `format_solution` receives the callback (which exposes Value() like the solver) and
+    returns the schedule JSON, or is None when only objective and bound can be reported.
+    """
+
+    def __init__(self, format_solution, on_progress, interval):
+        super().__init__()
+        self.format_solution = format_solution
+        self.on_progress = on_progress
+        self.interval = interval
+        self.solution_count = 0
+        self.emitted = 0
+        self._last_emit = None
+
+    def on_solution_callback(self):
+        self.solution_count += 1
+        now = time.monotonic()
+        if self._last_emit is not None and now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+        self.emitted += 1
+        self.on_progress({
+            "solution": self.format_solution(self) if self.format_solution else None,
+            "objective": self.ObjectiveValue(),
+            "best_bound": self.BestObjectiveBound(),
+            "wall_time": self.WallTime(),
+            "solution_count": self.solution_count,
+        })
+
+
+class SearchStopper:
+    """
+    Stops a running CP-SAT search once `should_stop()` returns True.
+
+    CP-SAT only exposes StopSearch(), so a background thread polls `should_stop` every
+    `interval` seconds while the solve runs. The solver then returns the best solution
+    found so far (status FEASIBLE), or no solution if it had none yet.
+    """
+
+    def __init__(self, solver, should_stop, interval=0.25):
+        self.solver = solver
+        self.should_stop = should_stop
+        self.interval = interval
+        self.stopped = False
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def _watch(self):
+        while not self._done.wait(self.interval):
+            if self.should_stop():
+                self.stopped = True
+                self.solver.StopSearch()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
@@ -0,0 +1,156 @@
+import copy
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.algorithm.solver_config import build_solver_config
+from models.schemas import manager_settings_schema
+from utils.validation import validate_data
+
+# Manager settings a scenario may override. role_importance and roles_per_shift are merged
+# into the current values (so one role or one shift can be changed alone); the rest replace them.
+SCENARIO_SETTINGS = ("min_max_employees_per_shift", "shift_names", "roles_per_shift",
+                     "role_importance", "max_consecutive_shifts", "work_days")
+MERGED_SETTINGS = ("role_importance", "roles_per_shift")
+MAX_SCENARIOS = 8
+
+scenario_schema = {key: dict(manager_settings_schema[key], required=False) for key in SCENARIO_SETTINGS}
+
+
+def validate_scenarios(scenarios):
+    """
+    Checks a scenario list from a request: [{"name": str, "settings": {...overrides}}, ...].
+
+    Returns:
+        list: The scenarios with validated settings.
+
+    Raises:
+        ValueError: If the list is empty, too long, or a scenario is malformed.
+    """
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("scenarios must be a non-empty list")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS} scenarios can be compared at once")
+
+    validated = []
+    names = set()
+    for index, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict) or not isinstance(scenario.get("settings"), dict):
+            raise ValueError(f"Scenario {index + 1} must be an object with a 'settings' object")
+        name = str(scenario.get("name") or f"Scenario {index + 1}")
+        if name in names or name == "current":
+            raise ValueError(f"Duplicate scenario name '{name}'")
+        names.add(name)
+        validated.append({"name": name, "settings": validate_data(scenario["settings"], scenario_schema)})
+    return validated
+
+
+def apply_scenario(data, settings):
+    """
+    Returns a copy of a solver instance (parse_json_to_constraints() format) with
+    scenario settings applied. The constraints themselves are shared by all scenarios.
+
+    Availability is stored by shift id (day * shifts_per_day + shift), so when the shift
+    names change every submitted shift is moved to its new id by name; shifts that no
+    longer exist are dropped.
+    """
+    scenario = copy.deepcopy(data)
+    for key, value in settings.items():
+        if key in MERGED_SETTINGS:
+            scenario[key] = dict(scenario[key], **value)
+        else:
+            scenario[key] = value
+    scenario["shifts_per_day"] = len(scenario["shift_names"])
+
+    old_names = data["shift_names"][:data["shifts_per_day"]]
+    old_days = data["work_days"]
+    if list(old_names) != list(scenario["shift_names"]) or list(old_days) != list(scenario["work_days"]):
+        new_shift = {name: s for s, name in enumerate(scenario["shift_names"])}
+        new_day = {day: d for d, day in enumerate(scenario["work_days"])}
+        for employee, availability in scenario["employee_availability"].items():
+            moved = []
+            for shift_id, priority in availability:
+                day, shift_num = divmod(shift_id, data["shifts_per_day"])
+                if day >= len(old_days) or shift_num >= len(old_names):
+                    continue
+                d, s = new_day.get(old_days[day]), new_shift.get(old_names[shift_num])
+                if d is not None and s is not None:
+                    moved.append([d * scenario["shifts_per_day"] + s, priority])
+            scenario["employee_availability"][employee] = moved
+
+    # Shifts and roles a scenario introduces need a demand and an importance to be solvable
+    for shift_name in scenario["shift_names"]:
+        scenario["roles_per_shift"].setdefault(shift_name, {})
+    for demand in scenario["roles_per_shift"].values():
+        for role in demand:
+            scenario["role_importance"].setdefault(role, 1)
+    return scenario
+
+
+def solve_scenario(name, data, solver_options):
+    """
+    Solves one scenario and returns its row of the comparison table. Runs in a worker process
+    (or thread, see compare_scenarios()).
+    """
+    # Imported here so spawned workers load the solver only when they need it
+    from app.algorithm.csp_algoritm import solve
+
+    result = solve(data, solver_options, include_text=False)
+    if not result:
+        return {"name": name, "status": "NO_SOLUTION"}
+    formatted_json, _, report = result
+    breakdown = report["objective_breakdown"]
+    schedule = json.loads(formatted_json)
+    return {
+        "name": name,
+        "status": report["status"],
+        "objective": report["objective"],
+        "shortage": breakdown["shortage"],
+        "balance": breakdown["balance"],
+        "preference": breakdown["preference"],
+        "unfilled_positions": sum(sum(shift["shortages"].values()) for day in schedule for shift in day["shifts"]),
+        "wall_time": report["wall_time"],
+        "num_workers": report["solver_settings"]["num_workers"],
+    }
+
+
+def compare_scenarios(data, scenarios, solver_options, max_processes=None):
+    """
+    Solves the current settings and every scenario concurrently against the same
+    snapshot of constraints, in a pool of processes. Nothing is written to the database.
+    Inside a daemonic process (a Celery prefork worker), which may not start children,
+    the pool is made of threads instead; CP-SAT releases the GIL while it searches.
+
+    Args:
+        data (dict): The constraints snapshot (parse_json_to_constraints() format).
+        scenarios (list): Output of validate_scenarios().
+        solver_options (dict): Options for build_solver_config(), shared by all scenarios; the
+            num_workers are split between the processes.
+        max_processes (int): Pool size; defaults to one process (or thread) per scenario, up to
+            the CPU count.
+
+    Returns:
+        list: One row per scenario, "current" first, with the differences to "current".
+    """
+    jobs = [("current", data)] + [(s["name"], apply_scenario(data, s["settings"])) for s in scenarios]
+    processes = max_processes or min(len(jobs), os.cpu_count() or 1)
+    # The processes share the configured CP-SAT workers instead of each starting all of them
+    total_workers = build_solver_config(solver_options)["num_workers"]
+    solver_options = dict(solver_options or {}, num_workers=max(1, total_workers // processes))
+
+    if multiprocessing.current_process().daemon:
+        pool = ThreadPoolExecutor(max_workers=processes)
+    else:
+        # spawn: forking a process that holds OR-Tools threads or a MongoClient is unsafe
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    with pool:
+        futures = [pool.submit(solve_scenario, name, scenario, solver_options) for name, scenario in jobs]
+        rows = [future.result() for future in futures]
+
+    baseline = rows[0]
+    for row in rows[1:]:
+        if "objective" in row and "objective" in baseline:
+            row["delta"] = {key: row[key] - baseline[key]
+                            for key in ("objective", "shortage", "balance", "preference", "unfilled_positions")}
+    return rows
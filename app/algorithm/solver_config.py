@@ -0,0 +1,131 @@
+import os
+
+# CP-SAT's portfolio search needs several workers to be effective, even on small machines
+DEFAULT_NUM_WORKERS = max(os.cpu_count() or 1, 8)
+
+# Server-side caps on what a request may ask for, so one request cannot hold a worker indefinitely
+MAX_NUM_WORKERS = int(os.getenv("SOLVER_MAX_WORKERS", DEFAULT_NUM_WORKERS))
+MAX_TIME_LIMIT = float(os.getenv("SOLVER_MAX_TIME_LIMIT", 300))
+
+# Settings shared by every preset
+BASE_SETTINGS = {
+    "num_workers": DEFAULT_NUM_WORKERS,
+    "random_seed": 0,
+    "warm_start": True,
+    "use_cache": True,
+    "stream_interval": 0.0,
+    "aggregate_employees": False,
+    "instant_draft": True,
+    "draft_hint": True,
+    "decompose": False,
+    "objective_mode": "weighted",
+    "consecutive_encoding": "windows",
+    "carry_over": False,
+    "model_cache": True,
+}
+
+# Named presets a request can start from; any field can still be overridden per request
+SOLVER_PRESETS = {
+    # Fast draft: stop after 5 seconds or as soon as we are within 5% of the bound
+    "fast": dict(BASE_SETTINGS, time_limit=5.0, relative_gap_limit=0.05),
+    # Best effort: use the full minute and only stop early on a proven optimum
+    "best": dict(BASE_SETTINGS, time_limit=60.0, relative_gap_limit=0.0),
+}
+DEFAULT_PRESET = "best"
+
+# 'weighted' minimizes one weighted sum of shortage, balance and preference; 'lexicographic'
+# minimizes them one at a time in that order, fixing each before the next
+OBJECTIVE_MODES = ("weighted", "lexicographic")
+
+# How max_consecutive_shifts is modelled: one linear constraint per sliding window, or one
+# automaton per run of shifts an employee can work (fewer constraints on long horizons)
+CONSECUTIVE_ENCODINGS = ("windows", "automaton")
+
+
+def build_solver_config(options=None):
+    """
+    Resolves the solver settings for a single run.
+
+    Args:
+        options (dict): Optional request options, any of:
+            preset: One of SOLVER_PRESETS, supplying every setting not given (default "best").
+            num_workers: CP-SAT search workers, at most MAX_NUM_WORKERS.
+            time_limit: Seconds for the whole run, at most MAX_TIME_LIMIT.
+            relative_gap_limit: Stop once within this fraction of the best bound, in [0, 1).
+            random_seed: CP-SAT's random seed.
+            warm_start: Hint the search with the latest published schedule.
+            use_cache: Return a cached schedule when the solver inputs are unchanged.
+            stream_interval: Minimum seconds between streamed intermediate solutions; 0 disables streaming.
+            aggregate_employees: Model interchangeable employees as one class.
+            instant_draft: Build a greedy draft schedule before the solve.
+            draft_hint: Hint the search with that draft when there is no published schedule to start from.
+            decompose: Solve independent groups of employees as separate models, in parallel.
+            objective_mode: One of OBJECTIVE_MODES.
+            consecutive_encoding: One of CONSECUTIVE_ENCODINGS.
+            carry_over: Count the shifts worked in a row at the end of the published schedule
+                towards the consecutive-shift limit.
+            model_cache: Reuse the built model of an instance with the same structure
+                (see app/algorithm/model_cache.py).
+
+    Returns:
+        dict: The full, validated settings including the preset name.
+
+    Raises:
+        ValueError: If the preset is unknown or a value is out of range.
+    """
+    options = dict(options or {})
+    preset = options.pop("preset", None) or DEFAULT_PRESET
+    if preset not in SOLVER_PRESETS:
+        raise ValueError(f"Unknown solver preset '{preset}'. Expected one of: {', '.join(SOLVER_PRESETS)}")
+
+    config = dict(SOLVER_PRESETS[preset])
+    unknown = set(options) - set(config)
+    if unknown:
+        raise ValueError(f"Unknown solver options: {', '.join(sorted(unknown))}")
+
+    for key, value in options.items():
+        if value is not None:
+            config[key] = value
+
+    try:
+        config["num_workers"] = int(config["num_workers"])
+        config["time_limit"] = float(config["time_limit"])
+        config["relative_gap_limit"] = float(config["relative_gap_limit"])
+        config["random_seed"] = int(config["random_seed"])
+        config["stream_interval"] = float(config["stream_interval"])
+    except (TypeError, ValueError):
+        raise ValueError("Solver options must be numeric")
+
+    for flag in ("warm_start", "use_cache", "aggregate_employees", "instant_draft", "draft_hint", "decompose",
+                 "carry_over", "model_cache"):
+        if not isinstance(config[flag], bool):
+            raise ValueError(f"{flag} must be a boolean")
+
+    if config["objective_mode"] not in OBJECTIVE_MODES:
+        raise ValueError(f"objective_mode must be one of: {', '.join(OBJECTIVE_MODES)}")
+    if config["consecutive_encoding"] not in CONSECUTIVE_ENCODINGS:
+        raise ValueError(f"consecutive_encoding must be one of: {', '.join(CONSECUTIVE_ENCODINGS)}")
+    if config["objective_mode"] == "lexicographic" and (config["aggregate_employees"] or config["decompose"]):
+        raise ValueError("The lexicographic objective cannot be combined with aggregate_employees or decompose")
+
+    if not 1 <= config["num_workers"] <= MAX_NUM_WORKERS:
+        raise ValueError(f"num_workers must be between 1 and {MAX_NUM_WORKERS}")
+    if not 0 < config["time_limit"] <= MAX_TIME_LIMIT:
+        raise ValueError(f"time_limit must be positive and at most {MAX_TIME_LIMIT:g} seconds")
+    if not 0 <= config["relative_gap_limit"] < 1:
+        raise ValueError("relative_gap_limit must be in [0, 1)")
+    if config["stream_interval"] < 0:
+        raise ValueError("stream_interval must not be negative")
+
+    config["preset"] = preset
+    return config
+
+
+def apply_solver_config(solver, config):
+    """
+    Copies the resolved settings onto a CpSolver's parameters.
+    """
+    solver.parameters.num_workers = config["num_workers"]
+    solver.parameters.max_time_in_seconds = config["time_limit"]
+    solver.parameters.relative_gap_limit = config["relative_gap_limit"]
+    solver.parameters.random_seed = config["random_seed"]
@@ -0,0 +1,184 @@
+import time
+from collections import defaultdict
+from ortools.sat.python import cp_model
+
+
+def employee_classes(instance):
+    """
+    Groups interchangeable employees: same skills and the same availability with the same
+    priorities. Any permutation of employees inside a class yields an equivalent schedule.
+
+    Returns:
+        list: Tuples of employee ids, ordered by their first member.
+    """
+    groups = defaultdict(list)
+    for e in range(instance.num_employees):
+        availability = tuple(sorted((shift, instance.priority[(e, shift)]) for shift in instance.availability[e]))
+        groups[(instance.skills[e], availability)].append(e)
+    return [tuple(members) for members in groups.values()]
+
+
+def build_aggregated_model(instance, classes, weights):
+    """
+    Builds the scheduling model over employee classes instead of individual employees:
+    one integer count per (class, shift, role) says how many members of the class fill that role.
+
+    Constraint 4 is enforced on the class totals (a necessary condition); disaggregate()
+    then checks it per employee. Constraint 5 uses the best split a class can get: every
+    member works floor(total / size) or ceil(total / size) shifts.
+
+    Args:
+        weights (tuple): (balance, shortage, preference) objective weights.
+
+    Returns:
+        tuple: (model, counts, class_shifts) where counts maps (class, shift, role) and
+        class_shifts maps (class, shift) to the number of class members on that shift.
+    """
+    balance_weight, shortage_weight, preference_weight = weights
+    model = cp_model.CpModel()
+    NUM_SHIFTS = instance.num_shifts
+    max_consecutive_shifts = instance.max_consecutive_shifts
+
+    counts = {}
+    class_shifts = {}
+    total_preference_cost = []
+    for c, members in enumerate(classes):
+        representative = members[0]
+        size = len(members)
+        for shift in sorted(instance.availability[representative]):
+            role_vars = []
+            for role, required_count in instance.shift_roles[shift]:
+                if role in instance.skills[representative]:
+                    var = model.NewIntVar(0, min(size, required_count), f'count_{c}_{shift}_{role}')
+                    counts[(c, shift, role)] = var
+                    role_vars.append(var)
+                    priority = instance.priority[(representative, shift)]
+                    total_preference_cost.append((10 - priority) * var)
+            if role_vars:
+                # Each member fills at most one role per shift
+                class_shifts[(c, shift)] = model.NewIntVar(0, size, f'class_shift_{c}_{shift}')
+                model.Add(sum(role_vars) == class_shifts[(c, shift)])
+
+    # Role requirements with shortage variables
+    total_shortage_cost = []
+    for shift in range(NUM_SHIFTS):
+        for role, required_count in instance.shift_roles[shift]:
+            shortage = model.NewIntVar(0, required_count, f'shortage_{shift}_{role}')
+            filled = [counts[(c, shift, role)] for c in range(len(classes)) if (c, shift, role) in counts]
+            model.Add(sum(filled) + shortage == required_count)
+            total_shortage_cost.append(shortage * instance.role_importance[role])
+
+    # Maximum number of employees per shift
+    for shift in range(NUM_SHIFTS):
+        on_shift = [class_shifts[(c, shift)] for c in range(len(classes)) if (c, shift) in class_shifts]
+        if on_shift:
+            model.Add(sum(on_shift) <= instance.max_employees)
+
+    # Consecutive shifts, summed over the class
+    for c, members in enumerate(classes):
+        for start_shift in range(NUM_SHIFTS):
+            if start_shift + max_consecutive_shifts < NUM_SHIFTS:
+                window = [class_shifts[(c, s)] for s in range(start_shift, start_shift + max_consecutive_shifts + 1)
+                          if (c, s) in class_shifts]
+                if window:
+                    model.Add(sum(window) <= len(members) * max_consecutive_shifts)
+
+    # Balance: the least loaded member gets floor(total / size), the most loaded ceil(total / size)
+    lows, highs = [], []
+    for c, members in enumerate(classes):
+        size = len(members)
+        total = model.NewIntVar(0, size * NUM_SHIFTS, f'class_total_{c}')
+        model.Add(total == sum(class_shifts[(c, s)] for s in range(NUM_SHIFTS) if (c, s) in class_shifts))
+        low = model.NewIntVar(0, NUM_SHIFTS, f'class_low_{c}')
+        high = model.NewIntVar(0, NUM_SHIFTS, f'class_high_{c}')
+        model.Add(size * low <= total)
+        model.Add(total <= size * low + size - 1)
+        model.Add(size * high >= total)
+        model.Add(size * high <= total + size - 1)
+        lows.append(low)
+        highs.append(high)
+
+    min_shifts_per_employee = model.NewIntVar(0, NUM_SHIFTS, 'min_shifts')
+    max_shifts_per_employee = model.NewIntVar(0, NUM_SHIFTS, 'max_shifts')
+    model.AddMinEquality(min_shifts_per_employee, lows)
+    model.AddMaxEquality(max_shifts_per_employee, highs)
+
+    model.Minimize(balance_weight * (max_shifts_per_employee - min_shifts_per_employee) +
+                   shortage_weight * sum(total_shortage_cost) +
+                   preference_weight * sum(total_preference_cost))
+
+    return model, counts, class_shifts
+
+
+def disaggregate(solver, instance, classes, counts, class_shifts, time_limit=10.0, num_workers=8):
+    """
+    Turns the class counts of a solved aggregated model back into named assignments.
+
+    Members of each class are spread so that everyone works floor or ceil of the class
+    average and no one exceeds max_consecutive_shifts in any window. Classes of one
+    employee are read off directly; larger classes are split with a small CP-SAT model.
+    `time_limit` is the budget of all those splits together.
+
+    Returns:
+        set: (employee id, shift id, role id) tuples, or None if some class cannot be split
+        within the time limit (the caller then falls back to the per-employee model).
+    """
+    NUM_SHIFTS = instance.num_shifts
+    max_consecutive_shifts = instance.max_consecutive_shifts
+    deadline = time.perf_counter() + time_limit
+
+    working_by_class = defaultdict(dict)
+    for (c, shift), var in class_shifts.items():
+        value = solver.Value(var)
+        if value:
+            working_by_class[c][shift] = value
+
+    assigned = set()
+    for c, members in enumerate(classes):
+        working = working_by_class.get(c, {})
+        if not working:
+            continue
+        size = len(members)
+
+        if size == 1:
+            on_shift = {shift: [members[0]] for shift in working}
+        else:
+            sub = cp_model.CpModel()
+            work = {(i, shift): sub.NewBoolVar(f'work_{i}_{shift}') for i in range(size) for shift in working}
+            for shift, needed in working.items():
+                sub.Add(sum(work[(i, shift)] for i in range(size)) == needed)
+            total = sum(working.values())
+            for i in range(size):
+                for start_shift in range(NUM_SHIFTS):
+                    if start_shift + max_consecutive_shifts < NUM_SHIFTS:
+                        window = [work[(i, s)] for s in range(start_shift, start_shift + max_consecutive_shifts + 1)
+                                  if (i, s) in work]
+                        if len(window) > max_consecutive_shifts:
+                            sub.Add(sum(window) <= max_consecutive_shifts)
+                member_total = sum(work[(i, shift)] for shift in working)
+                sub.Add(member_total >= total // size)
+                sub.Add(member_total <= -(-total // size))
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            sub_solver = cp_model.CpSolver()
+            sub_solver.parameters.max_time_in_seconds = remaining
+            sub_solver.parameters.num_workers = num_workers
+            if sub_solver.Solve(sub) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return None
+            on_shift = {
+                shift: [members[i] for i in range(size) if sub_solver.Value(work[(i, shift)])]
+                for shift in working
+            }
+
+        # Hand out the roles of each shift to the members working it
+        for shift, employees in on_shift.items():
+            employees = iter(employees)
+            for role, _ in instance.shift_roles[shift]:
+                if (c, shift, role) in counts:
+                    for _ in range(solver.Value(counts[(c, shift, role)])):
+                        assigned.add((next(employees), shift, role))
+
+    return assigned
+
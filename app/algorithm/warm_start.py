@@ -0,0 +1,110 @@
+from collections import defaultdict
+
+
+def schedule_entries(instance, days):
+    """
+    Walks a published schedule (the `days` list stored by WeeklyScheduleModel).
+
+    Days and shifts are matched by name, so a schedule published under a slightly
+    different set of work days or shift names still maps wherever it overlaps.
+
+    Yields:
+        tuple: (shift id of the current instance or None, employee entry) for every assignment.
+    """
+    day_ids = {day: d for d, day in enumerate(instance.work_days)}
+    shift_nums = {name: s for s, name in enumerate(instance.shift_names[:instance.shifts_per_day])}
+    for day in days or []:
+        if not isinstance(day, dict):
+            continue
+        day_index = day_ids.get(day.get("name"))
+        for shift in day.get("shifts", []):
+            shift_num = shift_nums.get(shift.get("time"))
+            shift_id = None
+            if day_index is not None and shift_num is not None:
+                shift_id = day_index * instance.shifts_per_day + shift_num
+            for employee in shift.get("employees", []):
+                yield shift_id, employee
+
+
+def map_schedule_to_assignments(instance, days):
+    """
+    Maps a published schedule back onto (employee id, shift id, role id) keys of the
+    current instance (see schedule_entries() for how days and shifts are matched).
+
+    Returns:
+        tuple: (set of matched keys, number of assignments found in the schedule)
+    """
+    employee_ids = {name: e for e, name in enumerate(instance.employees)}
+    role_ids = {role: r for r, role in enumerate(instance.roles)}
+
+    matched = set()
+    seen = set()  # (employee id, shift id) pairs already matched; one role per shift
+    total = 0
+    for shift_id, employee in schedule_entries(instance, days):
+        total += 1
+        if shift_id is None:
+            continue
+        e = employee_ids.get(employee.get("name"))
+        r = role_ids.get(employee.get("role"))
+        if (e, shift_id) in seen:
+            continue
+        if e is not None and r is not None and e in instance.eligible.get((shift_id, r), ()):
+            matched.add((e, shift_id, r))
+            seen.add((e, shift_id))
+    return matched, total
+
+
+def add_schedule_hints(model, instance, assignments, shifts, days):
+    """
+    Adds a previous schedule as a complete solution hint: matched (employee, shift, role)
+    tuples are hinted to 1 and every other assignment to 0, so CP-SAT starts from the
+    old roster and only has to repair what changed.
+
+    Returns:
+        dict: Hint coverage for the task result.
+    """
+    matched, total = map_schedule_to_assignments(instance, days)
+    hint_assignments(model, instance, assignments, shifts, matched)
+
+    return {
+        "previous_assignments": total,
+        "matched": len(matched),
+        "coverage": round(len(matched) / total, 3) if total else 0.0,
+    }
+
+
+def hint_assignments(model, instance, assignments, shifts, assigned):
+    """
+    Hints a complete solution: the given (employee, shift, role) tuples to 1, every
+    other assignment (and the matching shift indicators) to 0.
+    """
+    for key, var in assignments.items():
+        model.AddHint(var, 1 if key in assigned else 0)
+    working = {(e, shift) for e, shift, _ in assigned}
+    for (e, shift), var in shifts.items():
+        if any((e, shift, r) in assignments for r, _ in instance.shift_roles[shift]):
+            model.AddHint(var, 1 if (e, shift) in working else 0)
+
+
+def add_aggregated_hints(model, instance, classes, counts, days):
+    """
+    Same as add_schedule_hints for the aggregated model: the previous schedule is
+    summed into a hinted member count per (class, shift, role).
+
+    Returns:
+        dict: Hint coverage for the task result.
+    """
+    matched, total = map_schedule_to_assignments(instance, days)
+    class_of = {e: c for c, members in enumerate(classes) for e in members}
+    hinted = defaultdict(int)
+    for e, shift, role in matched:
+        hinted[(class_of[e], shift, role)] += 1
+
+    for key, var in counts.items():
+        model.AddHint(var, hinted.get(key, 0))
+
+    return {
+        "previous_assignments": total,
+        "matched": len(matched),
+        "coverage": round(len(matched) / total, 3) if total else 0.0,
+    }
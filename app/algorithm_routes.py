@@ -1,7 +1,15 @@
 
+import uuid
 from flask import Blueprint, request, jsonify
 # from app.algorithm.csp_algoritm import solve_schedule
-from tasks import generate_schedule
+from tasks import generate_schedule, resolve_schedule, compare_schedule_scenarios
+from app.algorithm.scenarios import validate_scenarios
+from models.constraints_model import get_employee_names
+from app.algorithm.solver_config import build_solver_config
+from models.manager_settings_model import get_manager_settings
+from socketio_server import socketio
+from utils.cache import stable_hash
+from utils.jobs import job_registry
 
 alg_api = Blueprint("alg_api", __name__)
 
@@ -14,11 +22,144 @@ def enqueue_schedule():
     if not socket_id:
         return jsonify({"error": "socket_id is required"}), 400
 
-    # enqueue the background job
-    task = generate_schedule.delay(socket_id)
+    # optional solver settings: {"preset": "fast" | "best", "time_limit": ..., "num_workers": ...}
+    try:
+        solver_options = build_solver_config(data.get("solver"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # the per-shift text summary is only rendered when the client asks for it
+    include_text = data.get("include_text", False)
+    if not isinstance(include_text, bool):
+        return jsonify({"error": "include_text must be true or false"}), 400
+
+    # single-flight: an identical request for the same activeVersion and settings joins the job already running
+    settings = get_manager_settings() or {}
+    job_key = stable_hash({"activeVersion": settings.get("activeVersion"), "settingsEpoch": settings.get("settingsEpoch"),
+                           "solver": solver_options, "include_text": include_text})
+    task_id = str(uuid.uuid4())
+    for _ in range(2):
+        running = job_registry.claim(job_key, task_id)
+        if running is None:
+            break
+        # Listen first, then check the job is still running: otherwise it may have emitted already
+        job_registry.add_listener(running, socket_id)
+        if job_registry.running(job_key) == running:
+            return jsonify({
+                "status": "attached",
+                "task_id": running,
+                "solver_settings": solver_options
+            }), 202
+    else:
+        return jsonify({"error": "Could not start the schedule generation, please retry"}), 409
+
+    # enqueue the background job; if that fails (e.g. the broker is down) release the claim,
+    # otherwise identical requests would attach to a task that never runs
+    try:
+        generate_schedule.apply_async(args=(socket_id, solver_options, include_text, job_key), task_id=task_id)
+    except Exception as e:
+        print(f"[generate-schedule] could not enqueue: {e}")
+        job_registry.finish(job_key, task_id)
+        job_registry.clear(task_id)
+        return jsonify({"error": "Schedule generation is unavailable, please retry later"}), 503
 
     # immediately return a 202 so the browser stays responsive
     return jsonify({
         "status": "queued",
-        "task_id": task.id
-    }), 202
\ No newline at end of file
+        "task_id": task_id,
+        "solver_settings": solver_options
+    }), 202
+
+
+@alg_api.route("/cancel", methods=["POST"])
+def cancel_schedule():
+    """
+    Stops a running generation (body: {"task_id"}). The search ends within a fraction of a
+    second and every listening socket receives the best schedule found so far as schedule_ready,
+    or schedule_cancelled if there was none yet.
+    """
+    data = request.get_json() or {}
+    task_id = data.get("task_id")
+    if not task_id:
+        return jsonify({"error": "task_id is required"}), 400
+    job_registry.cancel(task_id)
+    return jsonify({"status": "cancelling", "task_id": task_id}), 202
+
+
+@socketio.on("cancel_schedule")
+def on_cancel_schedule(data):
+    task_id = (data or {}).get("task_id")
+    if task_id:
+        job_registry.cancel(task_id)
+
+
+@socketio.on("disconnect")
+def on_disconnect(*args):
+    # A generation nobody is waiting for any more (every tab closed) is stopped
+    for task_id in job_registry.remove_listener(request.sid):
+        job_registry.cancel(task_id)
+
+
+@alg_api.route("/resolve-schedule", methods=["POST"])
+def enqueue_incremental_schedule():
+    """
+    Re-optimizes the latest published schedule after the constraints of a few employees
+    changed (body: {"socket_id", "uids": [...], "solver", "include_text"}). Only the shifts
+    around those employees are solved again; the result includes a per-shift diff.
+    """
+    data = request.get_json() or {}
+    socket_id = data.get("socket_id")
+    if not socket_id:
+        return jsonify({"error": "socket_id is required"}), 400
+    uids = data.get("uids")
+    if not uids or not isinstance(uids, list):
+        return jsonify({"error": "uids must be a non-empty list"}), 400
+
+    try:
+        solver_options = build_solver_config(data.get("solver"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    include_text = data.get("include_text", False)
+    if not isinstance(include_text, bool):
+        return jsonify({"error": "include_text must be true or false"}), 400
+
+    changed_employees = get_employee_names(uids)
+    if not changed_employees:
+        return jsonify({"error": "No users found for the given uids"}), 404
+
+    task = resolve_schedule.delay(socket_id, changed_employees, solver_options, include_text)
+    return jsonify({
+        "status": "queued",
+        "task_id": task.id,
+        "employees": changed_employees,
+        "solver_settings": solver_options
+    }), 202
+
+
+@alg_api.route("/scenarios", methods=["POST"])
+def enqueue_scenarios():
+    """
+    What-if comparison of manager settings (body: {"socket_id", "scenarios": [{"name",
+    "settings": {...overrides}}], "solver"}). The current settings and every scenario are
+    solved in parallel without saving anything; the comparison table arrives as "scenarios_ready"
+    (or "scenarios_error" if the comparison fails).
+    """
+    data = request.get_json() or {}
+    socket_id = data.get("socket_id")
+    if not socket_id:
+        return jsonify({"error": "socket_id is required"}), 400
+
+    try:
+        scenarios = validate_scenarios(data.get("scenarios"))
+        # Comparisons default to the fast preset; each scenario is a full solve
+        solver_options = build_solver_config(data.get("solver") or {"preset": "fast"})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    task = compare_schedule_scenarios.delay(socket_id, scenarios, solver_options)
+    return jsonify({
+        "status": "queued",
+        "task_id": task.id,
+        "scenarios": [scenario["name"] for scenario in scenarios],
+        "solver_settings": solver_options
+    }), 202
@@ -105,7 +105,7 @@ def load_draft_route(uid):
 def get_employees_constraints():
     try:
         # קבלת כל האילוצים מהמסד נתונים
-        all_constraints = get_all_constraints()
+        all_constraints = get_all_constraints(fields="summary")
         
         # יצירת רשימה עם המידע הנדרש בלבד
         filtered_constraints = []
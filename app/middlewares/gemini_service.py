@@ -198,7 +198,6 @@ def chat_with_manager(manager_message, first_message):
     
     # Fetch fresh data each time the function is called
     manager_settings = get_manager_settings()
-    all_constraints = list(get_all_constraints())
 
     MODEL = "gemini-1.5-flash"
     model = genai.GenerativeModel(MODEL)
@@ -215,6 +214,7 @@ def chat_with_manager(manager_message, first_message):
     if first_message:
         conversation_history = []  # Clear previous history
         # Build the prompt with system information from manager settings and all constraints.
+        all_constraints = get_all_constraints(fields="prompt")
         initial_context = base_prompt + "\n\nSystem information: " + build_prompt_data(manager_settings, all_constraints)
         conversation_history.append("System: " + initial_context)
     
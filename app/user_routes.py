@@ -1,10 +1,9 @@
 from flask import Blueprint, jsonify, request
-from models.database import get_collection
 from app.middlewares.session_middleware import verify_token
 from cloudinary.uploader import upload
 from configs.cloudinary_config import cloudinary
 from models.user_model import UserModel
-from models.constraints_model import delete_constraints
+from models.constraints_model import delete_constraints, update_constraint_roles
 from app.middlewares.email_sender import send_contact_email
 import firebase_admin
 from firebase_admin import auth
@@ -15,10 +14,11 @@ user_api = Blueprint('user_api', __name__)
 #get all users
 @user_api.route('/users', methods=['GET'])
 def get_users():
-    users_collection = get_collection('users')
-    users = list(users_collection.find())  # שליפת כל המסמכים מהקולקשן
-    for user in users:
-        user['_id'] = str(user['_id'])  # המרה של ObjectId למחרוזת
+    # the "summary" preset by default; ?fields=<preset> picks another UserModel.FIELDS preset
+    try:
+        users = UserModel.get_all(fields=request.args.get("fields", "summary"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(users), 200
 
 
@@ -111,7 +111,7 @@ def get_all_employees_route():
     Retrieve all employees with their first name, last name, and jobs (split into a list).
     """
     try:
-        employees = UserModel.get_all_employees()  # Retrieves all employee documents
+        employees = UserModel.get_all_employees(fields="roster")
         # Filter each document to only include first_name, last_name, and split jobs into a list
         result = [
             {
@@ -133,13 +133,13 @@ def get_all_employees_management():
     Retrieve all employees with their first name, last name, and jobs (split into a list).
     """
     try:
-        employees = UserModel.get_all_employees()  # Retrieves all employee documents
+        employees = UserModel.get_all_employees(fields="roster")
         # Filter each document to only include first_name, last_name, and split jobs into a list
         result = [
             {
                 "uid": emp.get("uid", ""),
                 "name": emp.get("first_name", "")+" "+emp.get("last_name", ""),
-                "roles": [job.strip() for job in emp.get("jobs", "").split(",") if job.strip()]
+                "roles": UserModel.normalize_roles(emp.get("jobs", ""))
             }
             for emp in employees
         ]
@@ -153,18 +153,24 @@ def update_employees():
         data = request.get_json()
         # Get the list of employees from the payload.
         employees_list = data.get("employees", [])
+        roles_by_uid = {}
         for emp in employees_list:
             uid = emp.get("uid")
-            roles_list = emp.get("roles", [])
-            jobs = ",".join(roles_list)
-            data = {
-                "jobs": jobs
-            }
             if uid is None:
-                continue  
-            UserModel.update(uid, data)
-            
-        return jsonify({"message": "Employees updated successfully"}), 200
+                continue
+            # Normalized once, so the users' jobs and the constraints' roles get the same list
+            roles_by_uid[uid] = UserModel.normalize_roles(emp.get("roles", []))
+
+        # One bulk write for the users, then one for their submitted constraints
+        results = UserModel.bulk_update({uid: {"jobs": ",".join(roles)} for uid, roles in roles_by_uid.items()})
+        updated = {uid: roles for uid, roles in roles_by_uid.items() if results[uid] == "updated"}
+        constraints_updated = update_constraint_roles(updated)
+
+        return jsonify({
+            "message": "Employees updated successfully",
+            "results": [{"uid": uid, "status": status} for uid, status in results.items()],
+            "constraints_updated": constraints_updated,
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -0,0 +1,165 @@
+"""
+Solver benchmark across instance size tiers.
+
+    python -m benchmarks.solver_benchmark --output bench.json
+    python -m benchmarks.solver_benchmark --tiers 20 100 --compare bench.json
+
+Each tier is a seeded synthetic instance from app.algorithm.generator, so runs on
+different releases solve exactly the same problems. Results are written as JSON;
+--compare flags tiers whose model build or solve got slower, or whose objective got worse.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from ortools import __version__ as ortools_version
+from app.algorithm.csp_algoritm import solve
+from app.algorithm.generator import generate_instance
+from app.algorithm.solver_config import OBJECTIVE_MODES, CONSECUTIVE_ENCODINGS
+
+DEFAULT_TIERS = [20, 100, 500, 2000]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def unfilled_positions(formatted_json):
+    schedule = json.loads(formatted_json)
+    return sum(sum(shift["shortages"].values()) for day in schedule for shift in day["shifts"])
+
+
+def run_tier(num_employees, seed, solver_options, generator_options):
+    data = generate_instance(num_employees, seed=seed, **generator_options)
+    started = time.perf_counter()
+    result = solve(data, solver_options, include_text=False)
+    elapsed = time.perf_counter() - started
+
+    record = {"employees": num_employees, "seed": seed, "total_time": elapsed}
+    if not result:
+        record["status"] = "NO_SOLUTION"
+        return record
+
+    formatted_json, _, report = result
+    record.update({
+        "status": report["status"],
+        "build_time": report["timings"].get("build"),
+        "solve_time": report["timings"].get("solve"),
+        "timings": report["timings"],
+        "variables": report["model"]["variables"] if report["model"] else None,
+        "constraints": report["model"]["constraints"] if report["model"] else None,
+        "objective": report["objective"],
+        "best_bound": report["best_bound"],
+        "objective_breakdown": report["objective_breakdown"],
+        "stages": report["stages"],
+        "shortage": report["objective_breakdown"]["shortage"],
+        "unfilled_positions": unfilled_positions(formatted_json),
+    })
+    return record
+
+
+# Timing differences below this are noise, whatever the relative change
+MIN_TIME_DELTA = 0.05
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of human-readable regressions of `results` against a previous run.
+    """
+    previous = {(r["employees"], r["seed"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for record in results:
+        old = previous.get((record["employees"], record["seed"]))
+        if not old or "objective" not in old:
+            continue
+        if "objective" not in record:
+            regressions.append(f"{record['employees']} employees: no solution (was {old['objective']:.0f})")
+            continue
+        for key in ("build_time", "solve_time"):
+            # A phase one of the runs did not have (e.g. no "build" with --decompose) is not compared
+            if old.get(key) is None or record.get(key) is None:
+                continue
+            if record[key] > old[key] * (1 + tolerance) and record[key] - old[key] > MIN_TIME_DELTA:
+                regressions.append(f"{record['employees']} employees: {key} {old[key]:.3f}s -> {record[key]:.3f}s")
+        if record["objective"] > old["objective"]:
+            regressions.append(f"{record['employees']} employees: objective {old['objective']:.0f} -> {record['objective']:.0f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.solver_benchmark", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", type=int, nargs="+", default=DEFAULT_TIERS, help="employee counts to benchmark")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="instance seeds per tier")
+    parser.add_argument("--preset", default="best")
+    parser.add_argument("--time-limit", dest="time_limit", type=float, default=30.0)
+    parser.add_argument("--workers", dest="num_workers", type=int)
+    parser.add_argument("--aggregate", action="store_true", help="aggregate interchangeable employees")
+    parser.add_argument("--decompose", action="store_true", help="solve independent groups of employees in parallel")
+    parser.add_argument("--objective", dest="objective_mode", default="weighted", choices=OBJECTIVE_MODES)
+    parser.add_argument("--encoding", default="windows", choices=CONSECUTIVE_ENCODINGS,
+                        help="encoding of the consecutive-shift limit")
+    parser.add_argument("--shifts-per-day", dest="shifts_per_day", type=int, default=3)
+    parser.add_argument("--work-days", dest="work_days", type=int, default=6)
+    parser.add_argument("--max-consecutive", dest="max_consecutive_shifts", type=int, default=2)
+    parser.add_argument("--density", type=float, default=0.5, help="availability density")
+    parser.add_argument("--priorities", default="uniform", help="priority distribution")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    # A fixed seed keeps the search itself reproducible between runs; every build is timed cold
+    solver_options = {"preset": args.preset, "time_limit": args.time_limit, "random_seed": 0,
+                      "use_cache": False, "model_cache": False, "warm_start": False, "aggregate_employees": args.aggregate,
+                      "decompose": args.decompose, "objective_mode": args.objective_mode,
+                      "consecutive_encoding": args.encoding}
+    if args.num_workers:
+        solver_options["num_workers"] = args.num_workers
+    generator_options = {"availability_density": args.density, "priority_distribution": args.priorities,
+                         "shifts_per_day": args.shifts_per_day, "work_days": args.work_days,
+                         "max_consecutive_shifts": args.max_consecutive_shifts}
+
+    results = []
+    for num_employees in args.tiers:
+        for seed in args.seeds:
+            record = run_tier(num_employees, seed, solver_options, generator_options)
+            results.append(record)
+            print(f"{num_employees:>6} employees (seed {seed}): {record['status']:<11} "
+                  f"build {record.get('build_time') or 0:.3f}s  solve {record.get('solve_time') or 0:.3f}s  "
+                  f"objective {record.get('objective', float('nan')):.0f}  unfilled {record.get('unfilled_positions', '-')}  "
+                  f"constraints {record.get('constraints') or '-'}")
+
+    output = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "ortools_version": ortools_version,
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "solver_options": solver_options,
+        "generator_options": generator_options,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
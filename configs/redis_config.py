@@ -0,0 +1,7 @@
+import os
+import redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# redis-py connects lazily, so importing this module never blocks on the server
+redis_client = redis.Redis.from_url(REDIS_URL)
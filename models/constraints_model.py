@@ -1,22 +1,38 @@
 # models/constraints_model.py
 from datetime import datetime, timezone
-from models.database import get_collection
-from models.manager_settings_model import get_manager_settings
+from pymongo import UpdateOne
+from models.database import get_collection, projection
+from models.manager_settings_model import get_manager_settings, load_manager_settings
+from models.user_model import UserModel
 from utils.validation import validate_data
 from models.schemas import constraints_schema
+from utils.cache import invalidate_schedule_cache
 
 
 constraints_collection = get_collection("constraints")
 users_collection = get_collection("users")
+
+# Field sets for listing constraints (see models.database.projection)
+CONSTRAINT_FIELDS = {
+    # /constraints/employees-constraints: who wrote which free-text constraints
+    "summary": ["first_name", "last_name", "constraints"],
+    # format_schedule_input: what the scheduling algorithm reads
+    "solver": ["first_name", "last_name", "roles", "availability"],
+    # chat_with_manager: what build_prompt_data puts in the prompt
+    "prompt": ["first_name", "last_name", "roles", "availability"],
+}
 def create_or_update_constraint(uid, data):
     data["last_updated"] = datetime.now(timezone.utc)
     data["status"] = "active"
     user = users_collection.find_one({"uid": uid},{"jobs": 1, "first_name": 1, "last_name": 1})
     data["first_name"]=user["first_name"] 
     data["last_name"]=user["last_name"] 
-    data["roles"] = user["jobs"].split(",") if user and "jobs" in user else []
-    settings = get_manager_settings()
+    data["roles"] = UserModel.normalize_roles(user["jobs"]) if user and "jobs" in user else []
+    # Read fresh: a cached copy that missed an invalidation would stamp an old epoch and the
+    # submission would silently never count
+    settings = load_manager_settings()
     data["version"] = settings.get("activeVersion")
+    data["epoch"] = settings.get("settingsEpoch", 0)
     data["is_final"] = True
     validate_data(data, constraints_schema)
 
@@ -25,13 +41,73 @@ def create_or_update_constraint(uid, data):
         {"$set": data},
         upsert=True
     )
+    invalidate_schedule_cache()
     return {"message": "Constraint created/updated successfully"}
 
+def update_constraint_roles(roles_by_uid):
+    """
+    Copies changed user roles onto the employees' submitted constraints in one unordered bulk
+    write, so the solver sees them without each employee resubmitting. Employees without a
+    submission are skipped.
+
+    Args:
+        roles_by_uid (dict): uid -> list of role names.
+
+    Returns:
+        int: Number of constraint documents changed.
+    """
+    if not roles_by_uid:
+        return 0
+    result = constraints_collection.bulk_write(
+        [UpdateOne({"uid": uid}, {"$set": {"roles": roles}}) for uid, roles in roles_by_uid.items()],
+        ordered=False,
+    )
+    if result.modified_count:
+        invalidate_schedule_cache()
+    return result.modified_count
+
+def get_employee_names(uids):
+    """
+    Full names of the given users, as the scheduling algorithm identifies employees.
+    Users are read from the users collection, so employees whose constraints were deleted are included.
+    """
+    users = users_collection.find({"uid": {"$in": list(uids)}}, {"first_name": 1, "last_name": 1})
+    return [f"{user.get('first_name', '').strip()} {user.get('last_name', '').strip()}" for user in users]
+
+def final_constraints_filter(settings):
+    """
+    Mongo filter for the submissions that count in the current cycle: made under the active
+    version and the current settings epoch. Saving the settings or starting a new cycle thus
+    invalidates every submission without rewriting them. Submissions made before epochs
+    existed have no 'epoch' and count as epoch 0.
+    """
+    epoch = settings.get("settingsEpoch", 0)
+    return {
+        "is_final": True,
+        "version": settings.get("activeVersion"),
+        "epoch": epoch if epoch else {"$in": [0, None]},
+    }
+
+def is_constraint_final(constraint, settings):
+    """
+    Whether one constraint document matches final_constraints_filter(settings).
+    """
+    return (constraint.get("is_final", False)
+            and constraint.get("version") == settings.get("activeVersion")
+            and constraint.get("epoch", 0) == settings.get("settingsEpoch", 0))
+
 def get_constraints_by_uid(uid):
-    return constraints_collection.find_one({"uid": uid})
+    """
+    The employee's constraint document, with 'is_final' derived from the current settings.
+    """
+    constraint = constraints_collection.find_one({"uid": uid})
+    if constraint:
+        constraint["is_final"] = is_constraint_final(constraint, get_manager_settings() or {})
+    return constraint
 
 def delete_constraints(uid):
     constraints_collection.delete_one({"uid": uid})
+    invalidate_schedule_cache()
     return {"message": "Constraint deleted successfully"}
 
 
@@ -63,10 +139,23 @@ def load_draft(uid):
         raise ValueError(str(e))
     
 
-def get_all_constraints():
-    constraints = list(constraints_collection.find())
+def get_all_constraints(fields=None):
+    """
+    All constraint documents, or only `fields` of them (a CONSTRAINT_FIELDS preset or a list).
+    Whole documents get 'is_final' derived from the current settings.
+    """
+    settings = (get_manager_settings() or {}) if fields is None else None
+    constraints = list(constraints_collection.find({}, projection(CONSTRAINT_FIELDS, fields)))
     for constraint in constraints:
         if "_id" in constraint:
             constraint["_id"] = str(constraint["_id"])
+        if settings is not None:
+            constraint["is_final"] = is_constraint_final(constraint, settings)
     return constraints
 
+def get_final_constraints(settings, fields="solver"):
+    """
+    The submissions that count in the current cycle (see final_constraints_filter), as a cursor.
+    """
+    return constraints_collection.find(final_constraints_filter(settings), projection(CONSTRAINT_FIELDS, fields))
+
@@ -11,3 +11,25 @@ else:
     db = client["main"]
 def get_collection(name):
     return db[name]
+
+def projection(presets, fields=None):
+    """
+    Builds a find() projection so list queries only transfer and decode the fields a caller uses.
+
+    Args:
+        presets (dict): Preset name -> field names, declared next to each model.
+        fields (str | list): A preset name, a list of field names, or None for whole documents.
+
+    Returns:
+        dict: {field: 1, ...}, or None for whole documents.
+
+    Raises:
+        ValueError: If `fields` names an unknown preset.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        if fields not in presets:
+            raise ValueError(f"Unknown field set '{fields}'. Expected one of: {', '.join(presets)}")
+        fields = presets[fields]
+    return {field: 1 for field in fields}
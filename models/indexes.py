@@ -0,0 +1,160 @@
+"""
+Indexes every collection needs, and a check that the hot queries use them.
+
+    python -m models.indexes ensure    # create missing indexes (idempotent)
+    python -m models.indexes explain   # explain() each hot query and flag collection scans
+"""
+import argparse
+import sys
+import threading
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+from models.database import get_collection, projection
+from models.constraints_model import CONSTRAINT_FIELDS, final_constraints_filter
+
+# Collection name -> indexes, each serving the queries named next to it
+INDEXES = {
+    "constraints": [
+        # create_or_update_constraint / save_draft / load_draft / get_constraints_by_uid
+        IndexModel([("uid", ASCENDING)], name="uid"),
+        # format_schedule_input: the final submissions of the active version and settings epoch
+        IndexModel([("version", ASCENDING), ("epoch", ASCENDING), ("is_final", ASCENDING)],
+                   name="version_epoch_is_final"),
+    ],
+    "users": [
+        # UserModel.find_by_uid / update / delete, get_employee_names
+        IndexModel([("uid", ASCENDING)], name="uid"),
+        # UserModel.get_all_employees / get_all_employee_emails
+        IndexModel([("role", ASCENDING)], name="role"),
+    ],
+    "weekly_schedule": [
+        # WeeklyScheduleModel latest / history / oldest
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "notifications": [
+        # get_last_notifications and the oldest-first trim in create_global_notification.
+        # The unread queries filter on {"read_by": {"$ne": uid}}, which no index serves; the
+        # collection is capped at 5 documents, so scanning it is cheap
+        IndexModel([("createdAt", DESCENDING)], name="createdAt"),
+    ],
+    "manager_messages": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "solver_runs": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+}
+
+# The queries explain_hot_queries() checks: (name, collection, filter, sort, projection).
+# Where the app builds a query with a helper, the entry uses the same helper, so the
+# checked query cannot drift from the one that runs
+HOT_QUERIES = [
+    ("constraints by uid", "constraints", {"uid": ""}, None, None),
+    ("final constraints of a version", "constraints", final_constraints_filter({"activeVersion": ""}), None,
+     projection(CONSTRAINT_FIELDS, "solver")),
+    ("user by uid", "users", {"uid": ""}, None, None),
+    ("employees", "users", {"role": "worker"}, None, None),
+    ("latest schedule", "weekly_schedule", {}, [("created_at", DESCENDING)], None),
+    ("latest notifications", "notifications", {}, [("createdAt", DESCENDING)], None),
+    ("latest manager messages", "manager_messages", {}, [("created_at", DESCENDING)], None),
+    ("latest solver runs", "solver_runs", {}, [("created_at", DESCENDING)], None),
+]
+
+
+def ensure_indexes():
+    """
+    Creates the declared indexes. Indexes that already exist with the same keys are left
+    alone, so this is safe to run on every start. A collection that fails (e.g. an existing
+    index with the same name but other options) is reported and skipped.
+
+    Returns:
+        dict: Collection name -> created index names, or the error message.
+    """
+    results = {}
+    for name, indexes in INDEXES.items():
+        try:
+            results[name] = get_collection(name).create_indexes(indexes)
+        except PyMongoError as e:
+            print(f"[indexes] {name}: {e}")
+            results[name] = str(e)
+    return results
+
+
+def start_index_bootstrap():
+    """
+    Runs ensure_indexes() in a daemon thread, so startup does not wait for index builds.
+    """
+    thread = threading.Thread(target=ensure_indexes, name="index-bootstrap", daemon=True)
+    thread.start()
+    return thread
+
+
+def plan_stages(plan):
+    """
+    All stage names in an explain() plan, outermost first. Works for both the classic
+    and the slot-based engine's layout (queryPlanner.winningPlan[.queryPlan]).
+    """
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node["stage"])
+            pending.extend(value for key, value in node.items() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            pending.extend(node)
+    return stages
+
+
+def explain_hot_queries():
+    """
+    Runs explain() on every HOT_QUERIES entry.
+
+    Returns:
+        list: {"query", "collection", "stages", "collscan" (True if the winning plan scans the
+        whole collection), "in_memory_sort", "docs_examined", "keys_examined"} per query.
+    """
+    results = []
+    for name, collection, query, sort, fields in HOT_QUERIES:
+        cursor = get_collection(collection).find(query, fields)
+        if sort:
+            cursor = cursor.sort(sort)
+        explained = cursor.explain()
+        stages = plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+        stats = explained.get("executionStats", {})
+        results.append({
+            "query": name,
+            "collection": collection,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "in_memory_sort": "SORT" in stages,
+            "docs_examined": stats.get("totalDocsExamined"),
+            "keys_examined": stats.get("totalKeysExamined"),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m models.indexes", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["ensure", "explain"])
+    args = parser.parse_args(argv)
+
+    if args.command == "ensure":
+        for name, created in ensure_indexes().items():
+            print(f"{name}: {created}")
+        return 0
+
+    flagged = 0
+    for result in explain_hot_queries():
+        problems = [label for label, key in (("COLLSCAN", "collscan"), ("in-memory SORT", "in_memory_sort"))
+                    if result[key]]
+        flagged += bool(problems)
+        print(f"{'!!' if problems else 'ok'} {result['query']} ({result['collection']}): "
+              f"{' > '.join(result['stages'])}" + (f"  <- {', '.join(problems)}" if problems else ""))
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ import random
 from models.database import get_collection
 from models.schemas import manager_settings_schema
 from utils.validation import validate_data
+from utils.cache import invalidate_schedule_cache, ReadThroughCache, create_invalidation_channel
+import os
 # Get the collection for manager settings
 manager_settings_collection = get_collection("manager_settings")
 
@@ -10,15 +12,27 @@ def generate_random_version(length=8) -> str:
     characters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
     return ''.join(random.choices(characters, k=length))
 
-def get_manager_settings():
+def load_manager_settings():
     """
-    Retrieve the single manager settings document.
+    Read the single manager settings document from the database.
     """
     settings = manager_settings_collection.find_one({})
     if settings:
         settings["_id"] = str(settings["_id"])
     return settings
 
+# The settings document changes about once a week but is read on almost every request and
+# several times per solve. Writes below invalidate every web and Celery process through the channel.
+settings_cache = ReadThroughCache(load_manager_settings,
+                                  ttl=int(os.getenv("MANAGER_SETTINGS_CACHE_TTL", 300)),
+                                  channel=create_invalidation_channel("manager_settings"))
+
+def get_manager_settings():
+    """
+    Retrieve the single manager settings document (cached, see settings_cache).
+    """
+    return settings_cache.get()
+
 def update_manager_settings(data: dict):
     """
     Update (or create) the unique manager settings document.
@@ -34,16 +48,20 @@ def update_manager_settings(data: dict):
     if "submissionEnd" in data and isinstance(data["submissionEnd"], str):
         data["submissionEnd"] = datetime.fromisoformat(data["submissionEnd"].replace("Z", "+00:00"))
 
+    # The epoch is owned by the server and only ever incremented below
+    data.pop("settingsEpoch", None)
+
     # Optionally validate the incoming data against the schema.
     validated_data = validate_data(data, manager_settings_schema)
     
     # Add a timestamp for when the document was updated.
     validated_data["last_updated"] = datetime.now(timezone.utc)
     
-    # Update (or insert) the unique document.
-    manager_settings_collection.update_one({}, {"$set": validated_data}, upsert=True)
-    constraints_collection = get_collection("constraints")
-    constraints_collection.update_many({}, {"$set": {"is_final": False}})
+    # Update (or insert) the unique document. Bumping the epoch makes every submission made
+    # under the previous settings non-final (see constraints_model.final_constraints_filter)
+    manager_settings_collection.update_one({}, {"$set": validated_data, "$inc": {"settingsEpoch": 1}}, upsert=True)
+    settings_cache.invalidate()
+    invalidate_schedule_cache()
     # Return the updated document.
     return get_manager_settings()
 
@@ -51,7 +69,7 @@ def update_manager_settings(data: dict):
 def transition_cycle():
     try:
         print("Transitioning cycle..........................")
-        settings = get_manager_settings()  
+        settings = load_manager_settings()  # read fresh: the rollover must not act on a stale copy
         submission_start = settings.get("submissionStart")
         submission_end = settings.get("submissionEnd")
         # Ensure submission_start and submission_end are timezone-aware
@@ -85,8 +103,9 @@ def transition_cycle():
                 "submissionStart": new_submission_start,
                 "submissionEnd": new_submission_end,
             }
+            # Submissions of the previous cycle stop being final with the new activeVersion
             manager_settings_collection.update_one({}, {"$set": update_data}, upsert=True)
-            constraints_collection = get_collection("constraints")
-            constraints_collection.update_many({}, {"$set": {"is_final": False}})
+            settings_cache.invalidate()
+            invalidate_schedule_cache()
     except Exception as e:
         print("Exception in transition_cycle:", e)
\ No newline at end of file
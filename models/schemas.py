@@ -63,6 +63,7 @@ constraints_schema = {
     },
     "last_updated": {"type": "datetime", "required": True},  # תאריך עדכון אחרון
     "version": {"type": "string", "required": True}, 
+    "epoch": {"type": "integer", "required": False},  # manager_settings.settingsEpoch at submission
     "is_final": {"type": "boolean", "required": True}
 }
 
@@ -112,6 +113,7 @@ manager_settings_schema = {
     "last_updated": {"type": "datetime", "required": False},
     "required_shifts": {"type": "integer", "required": True},
     "activeVersion": {"type": "string", "required": True}, 
+    "settingsEpoch": {"type": "integer", "required": False},  # bumped by the server on every save
     "submissionStart": {"type": "datetime", "required": True},
     "submissionEnd": {"type": "datetime", "required": True}
 }
@@ -0,0 +1,32 @@
+from models.database import get_collection
+from datetime import datetime, timezone
+
+class SolverRunModel:
+    collection = get_collection("solver_runs")
+
+    @staticmethod
+    def record_run(report, socket_id=None, task_id=None):
+        """
+        Store the report of one schedule generation (timings, model size, search statistics)
+        for later performance analysis.
+        """
+        run = {
+            "created_at": datetime.now(timezone.utc),
+            "socket_id": socket_id,
+            "task_id": task_id,
+            "status": report.get("status"),
+            "report": report,
+        }
+        result = SolverRunModel.collection.insert_one(run)
+        return str(result.inserted_id)
+
+    @staticmethod
+    def get_recent_runs(limit=20):
+        """
+        Get the latest solver runs, newest first.
+        """
+        runs = list(SolverRunModel.collection.find().sort("created_at", -1).limit(limit))
+        for run in runs:
+            run["_id"] = str(run["_id"])  # Convert ObjectId to string
+            run["created_at"] = run["created_at"].isoformat()  # Convert datetime to string
+        return runs
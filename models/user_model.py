@@ -1,4 +1,6 @@
-from models.database import get_collection
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models.database import get_collection, projection
 from utils.validation import validate_data
 from models.schemas import user_schema
 
@@ -6,6 +8,14 @@ from models.schemas import user_schema
 class UserModel:
     collection = get_collection("users")
 
+    # Field sets for listing users (see models.database.projection)
+    FIELDS = {
+        # /user/users (the default there): everything but contact and audit details
+        "summary": ["uid", "first_name", "last_name", "email", "role", "jobs", "profile_picture"],
+        # employee listings and role management
+        "roster": ["uid", "first_name", "last_name", "jobs"],
+    }
+
     @staticmethod
     def create(user_data):
         """
@@ -71,6 +81,54 @@ class UserModel:
             return result
         raise ValueError("User not found")
 
+    @staticmethod
+    def bulk_update(updates):
+        """
+        Update several users with a single unordered bulk write, instead of one round trip each.
+
+        Args:
+            updates (dict): uid -> the data to update.
+
+        Returns:
+            dict: uid -> "updated", "not_found", or the error message of a failed write.
+        """
+        if not updates:
+            return {}
+        existing = {user["uid"] for user in UserModel.collection.find({"uid": {"$in": list(updates)}}, {"uid": 1})}
+        results = {uid: "not_found" for uid in updates if uid not in existing}
+        uids = [uid for uid in updates if uid in existing]
+        errors = {}
+        if uids:
+            try:
+                UserModel.collection.bulk_write([UpdateOne({"uid": uid}, {"$set": updates[uid]}) for uid in uids],
+                                                ordered=False)
+            except BulkWriteError as e:
+                # Unordered: the other writes went through; errors refer to positions in the batch
+                errors = {uids[error["index"]]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+        results.update({uid: errors.get(uid, "updated") for uid in uids})
+        return results
+
+    @staticmethod
+    def normalize_roles(roles):
+        """
+        Role names the way both the user's 'jobs' and the constraints' 'roles' hold them:
+        stripped, without empty entries.
+
+        Args:
+            roles (str | list): A comma-separated 'jobs' string or a list of role names.
+
+        Returns:
+            list: The role names, in order.
+
+        Raises:
+            ValueError: If roles is neither a string nor a list of strings.
+        """
+        if isinstance(roles, str):
+            roles = roles.split(",")
+        if not isinstance(roles, list) or not all(isinstance(role, str) for role in roles):
+            raise ValueError("roles must be a list of role names")
+        return [role.strip() for role in roles if role.strip()]
+
     @staticmethod
     def delete(uid):
         """
@@ -97,15 +155,34 @@ class UserModel:
         emails = [user["email"] for user in employees if "email" in user]
         return emails
     @staticmethod
-    def get_all_employees():
+    def get_all(fields=None):
+        """
+        Retrieve all users.
+
+        Args:
+            fields (str | list): A FIELDS preset or field names; None returns whole documents.
+
+        Returns:
+            list: A list of user dictionaries.
+        """
+        users = list(UserModel.collection.find({}, projection(UserModel.FIELDS, fields)))
+        for user in users:
+            user["_id"] = str(user["_id"])  # Convert ObjectId to string
+        return users
+
+    @staticmethod
+    def get_all_employees(fields=None):
         """
         Retrieve all employees (users with role 'worker').
+
+        Args:
+            fields (str | list): A FIELDS preset or field names; None returns whole documents.
         
         Returns:
             list: A list of employee dictionaries.
         """
         # Query the users collection for documents where role equals "worker"
-        employees_cursor = UserModel.collection.find({"role": "worker"})
+        employees_cursor = UserModel.collection.find({"role": "worker"}, projection(UserModel.FIELDS, fields))
         employees = []
         for employee in employees_cursor:
             employee["_id"] = str(employee["_id"])  # Convert ObjectId to string
@@ -6,6 +6,17 @@ class WeeklyScheduleModel:
     collection = get_collection("weekly_schedule")
     MAX_DOCUMENTS = 16
 
+    @staticmethod
+    def next_week_start(current_date):
+        """
+        The Sunday (midnight) starting the week a schedule published at `current_date` is for.
+        """
+        # Find the next Sunday (0 is Monday, 6 is Sunday in Python)
+        days_until_sunday = (6 - current_date.weekday()) % 7
+        if days_until_sunday == 0:
+            days_until_sunday = 7  # If today is Sunday, get next Sunday
+        return current_date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_until_sunday)
+
     @staticmethod
     def add_schedule(data):
         """
@@ -15,12 +26,7 @@ class WeeklyScheduleModel:
         data["created_at"] = datetime.now(timezone.utc)
         
         # Calculate the week range
-        current_date = data["created_at"]
-        # Find the next Sunday (0 is Monday, 6 is Sunday in Python)
-        days_until_sunday = (6 - current_date.weekday()) % 7
-        if days_until_sunday == 0:
-            days_until_sunday = 7  # If today is Sunday, get next Sunday
-        start_of_week = current_date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_until_sunday)
+        start_of_week = WeeklyScheduleModel.next_week_start(data["created_at"])
         end_of_week = start_of_week + timedelta(days=6)  # Add 6 days to get to Saturday
         
         # Format the week range in the new format
@@ -77,6 +77,7 @@ from flask_mail import Mail
 from configs.envconfig import MAIL_USERNAME, MAIL_PASSWORD, PORT
 from socketio_server import socketio
 from utils.scheduler import start_scheduler
+from models.indexes import start_index_bootstrap
 
 # ייבוא ה-blueprints
 from app.user_routes import user_api
@@ -104,6 +105,7 @@ app.config.update(
 
 Mail(app)
 start_scheduler()
+start_index_bootstrap()
 
 socketio.init_app(app)
 
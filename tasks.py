@@ -27,31 +27,150 @@
 
 
 # back/tasks.py
+import time
 from celery_app import celery      # או פשוט: from celery_app import celery
 from socketio_server import socketio
-from app.algorithm.csp_algoritm import solve_schedule
+from app.algorithm.csp_algoritm import solve_schedule, solve_schedule_incremental, parse_json_to_constraints
+from app.algorithm.scenarios import compare_scenarios
+from models.solver_runs_model import SolverRunModel
+from utils.jobs import job_registry
 
 @celery.task(bind=True)
-def generate_schedule(self, socket_id):
+def generate_schedule(self, socket_id, solver_options=None, include_text=False, job_key=None):
+    """
+    Solves the current constraints and sends the schedule to every socket listening to this
+    task (identical requests attach to it, see POST /csp/generate-schedule). `job_key` is the
+    single-flight key the request claimed; it is released as soon as the solve ends.
+    """
     print(f"[generate_schedule] start for socket_id={socket_id}")
-    result = solve_schedule()
-    if not result:
-        print("[generate_schedule] no solution")
+    task_id = self.request.id
+    job_registry.add_listener(task_id, socket_id)
+
+    try:
+        result = solve_schedule(solver_options, on_progress=progress_emitter(task_id, socket_id),
+                                include_text=include_text, on_draft=draft_emitter(task_id, socket_id),
+                                should_stop=lambda: job_registry.is_cancelled(task_id))
+    except Exception as e:
+        emit_schedule_failure("generate_schedule", task_id, socket_id, e)
+        raise
+    finally:
+        # Requests arriving from now on start a new job instead of waiting for this one
+        if job_key:
+            job_registry.finish(job_key, task_id)
+    return emit_schedule_result("generate_schedule", task_id, socket_id, result)
+
+
+@celery.task(bind=True)
+def resolve_schedule(self, socket_id, changed_employees, solver_options=None, include_text=False):
+    """
+    Re-optimizes the published schedule around employees whose constraints changed.
+    The schedule_ready payload carries report["diff"] with the changed shifts.
+    """
+    print(f"[resolve_schedule] start for socket_id={socket_id}, employees={changed_employees}")
+    task_id = self.request.id
+    job_registry.add_listener(task_id, socket_id)
+
+    try:
+        result = solve_schedule_incremental(changed_employees, solver_options,
+                                            on_progress=progress_emitter(task_id, socket_id),
+                                            include_text=include_text, on_draft=draft_emitter(task_id, socket_id),
+                                            should_stop=lambda: job_registry.is_cancelled(task_id))
+    except Exception as e:
+        emit_schedule_failure("resolve_schedule", task_id, socket_id, e)
+        raise
+    return emit_schedule_result("resolve_schedule", task_id, socket_id, result)
+
+
+@celery.task(bind=True)
+def compare_schedule_scenarios(self, socket_id, scenarios, solver_options=None):
+    """
+    Solves what-if variants of the manager settings side by side (see compare_scenarios()).
+    Settings are never written; every scenario uses the same snapshot of the constraints.
+    """
+    print(f"[compare_schedule_scenarios] start for socket_id={socket_id}, {len(scenarios)} scenarios")
+
+    try:
+        constraints = parse_json_to_constraints()
+        rows = compare_scenarios(constraints, scenarios, solver_options)
+    except Exception as e:
+        print(f"[compare_schedule_scenarios] failed: {e}")
         socketio.emit(
-            "schedule_error",
-            {"error": "No feasible solution found"},
+            "scenarios_error",
+            {"error": "Scenario comparison failed", "task_id": self.request.id},
             namespace="/",
             room=socket_id
         )
-        return
-
-    solution, text = result
-    print("[generate_schedule] emitting schedule_ready")
+        raise
     socketio.emit(
-        "schedule_ready",
-        {"solution": solution, "text": text},
+        "scenarios_ready",
+        {"scenarios": rows, "activeVersion": constraints.get("activeVersion")},
         namespace="/",
         room=socket_id
     )
-    print("[generate_schedule] done")
-    return {"status": "ok"}
+    print("[compare_schedule_scenarios] done")
+    return {"status": "ok", "scenarios": rows}
+
+
+def listening_sockets(task_id, socket_id):
+    return job_registry.listeners(task_id) or {socket_id}
+
+
+def emit_to_listeners(event, payload, task_id, socket_id):
+    for room in listening_sockets(task_id, socket_id):
+        socketio.emit(event, payload, namespace="/", room=room)
+
+
+def progress_emitter(task_id, socket_id):
+    def emit_progress(progress):
+        emit_to_listeners("schedule_progress", dict(progress, task_id=task_id), task_id, socket_id)
+    return emit_progress
+
+
+def draft_emitter(task_id, socket_id):
+    def emit_draft(draft):
+        emit_to_listeners("schedule_draft", dict(draft, task_id=task_id), task_id, socket_id)
+    return emit_draft
+
+
+def emit_schedule_failure(task_name, task_id, socket_id, error):
+    """
+    Tells every listener that the solve raised, and forgets the task's listeners.
+    """
+    print(f"[{task_name}] failed: {error}")
+    emit_to_listeners("schedule_error", {"error": "Schedule generation failed", "task_id": task_id},
+                      task_id, socket_id)
+    job_registry.clear(task_id)
+
+
+def emit_schedule_result(task_name, task_id, socket_id, result):
+    cancelled = job_registry.is_cancelled(task_id)
+    if not result:
+        print(f"[{task_name}] no solution" + (" (cancelled)" if cancelled else ""))
+        emit_to_listeners(
+            "schedule_cancelled" if cancelled else "schedule_error",
+            {"error": "Cancelled before any schedule was found" if cancelled else "No feasible solution found",
+             "task_id": task_id},
+            task_id, socket_id
+        )
+        job_registry.clear(task_id)
+        return
+
+    solution, text, report = result
+    print(f"[{task_name}] emitting schedule_ready" + (" (cancelled, best so far)" if cancelled else ""))
+    started = time.perf_counter()
+    emit_to_listeners(
+        "schedule_ready",
+        {"solution": solution, "text": text, "report": report, "task_id": task_id},
+        task_id, socket_id
+    )
+    report["timings"]["emit"] = time.perf_counter() - started
+    job_registry.clear(task_id)
+    print(f"[{task_name}] done, timings: " +
+          ", ".join(f"{phase}={seconds:.3f}s" for phase, seconds in report["timings"].items()))
+
+    # Keep the run for later analysis; a failed write must not fail the generation
+    try:
+        SolverRunModel.record_run(report, socket_id=socket_id, task_id=task_id)
+    except Exception as e:
+        print(f"[{task_name}] could not record solver run: {e}")
+    return {"status": "ok", "report": report}
@@ -0,0 +1,32 @@
+# tests/unit/conftest.py
+import pytest
+
+
+@pytest.fixture
+def schedule_data():
+    """
+    A tiny solver payload shaped like parse_json_to_constraints() output:
+    two days x two shifts, three employees (one without any availability).
+    """
+    return {
+        "employee_skills": {
+            "Alice Smith": ["Waiter", "Bartender"],
+            "Bob Cohen": ["Waiter"],
+            "Dana Levi": ["Cook"],
+        },
+        "employee_availability": {
+            "Alice Smith": [[0, 10], [1, 5], [3, 7]],
+            "Bob Cohen": [[0, 3], [2, 8]],
+        },
+        "shifts_per_day": 2,
+        "shift_length": 8,
+        "shift_names": ["Morning", "Evening"],
+        "work_days": ["Sunday", "Monday"],
+        "min_max_employees_per_shift": {"min": 1, "max": 3},
+        "roles_per_shift": {
+            "Morning": {"Waiter": 1},
+            "Evening": {"Waiter": 1, "Bartender": 1},
+        },
+        "max_consecutive_shifts": 2,
+        "role_importance": {"Waiter": 3, "Bartender": 2},
+    }
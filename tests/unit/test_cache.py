@@ -0,0 +1,66 @@
+# tests/unit/test_cache.py
+
+from utils.cache import MemoryCache, stable_hash
+
+
+def test_stable_hash_ignores_key_order():
+    a = {"employee_skills": {"Alice": ["Waiter"]}, "max_consecutive_shifts": 2}
+    b = {"max_consecutive_shifts": 2, "employee_skills": {"Alice": ["Waiter"]}}
+    assert stable_hash(a) == stable_hash(b)
+    assert stable_hash(a) != stable_hash(dict(a, max_consecutive_shifts=3))
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1      # 'a' becomes most recently used
+    cache.set("c", 3)               # evicts 'b'
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    import utils.cache as cache_mod
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+
+    cache = MemoryCache(maxsize=4, ttl=10)
+    cache.set("key", "value")
+    now[0] += 5
+    assert cache.get("key") == "value"
+    now[0] += 6
+    assert cache.get("key") is None
+
+
+def test_read_through_cache_loads_once_until_invalidated():
+    from utils.cache import ReadThroughCache, MemoryInvalidationChannel
+    loads = []
+    cache = ReadThroughCache(lambda: loads.append(1) or {"activeVersion": f"V{len(loads)}"}, ttl=60,
+                             channel=MemoryInvalidationChannel("settings"))
+
+    assert cache.get()["activeVersion"] == "V1"
+    cache.get()["activeVersion"] = "changed by a caller"
+    assert cache.get()["activeVersion"] == "V1"
+    assert len(loads) == 1
+
+    cache.channel.publish()   # another process saved the settings
+    assert cache.get()["activeVersion"] == "V2"
+
+
+def test_read_through_cache_drops_a_load_raced_by_a_write():
+    from utils.cache import ReadThroughCache
+    values = iter(["before the write", "after the write"])
+
+    def loader():
+        value = next(values)
+        if value == "before the write":
+            cache.invalidate()  # the settings are saved while this load is in flight
+        return value
+
+    cache = ReadThroughCache(loader, ttl=60)
+    assert cache.get() == "before the write"
+    assert cache.get() == "after the write"
@@ -0,0 +1,50 @@
+# tests/unit/test_capacity.py
+
+import pytest
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from app.algorithm.capacity import capacity_analysis
+from app.algorithm.csp_algoritm import solve
+
+
+def test_one_employee_cannot_fill_two_roles(schedule_data):
+    """
+    Alice is the only one available on both evenings, which need a waiter and a bartender:
+    one of the two stays short, at the bartender's lower importance.
+    """
+    capacity = capacity_analysis(compile_instance(schedule_data))
+
+    assert capacity["shortage_lower_bound"] == 4
+    assert capacity["shift_bounds"] == {1: 2, 3: 2}
+    assert "Sunday Evening can staff at most 1 of 2 positions" in capacity["messages"]
+
+
+def test_missing_skill_is_a_bottleneck(schedule_data):
+    schedule_data["roles_per_shift"]["Morning"]["Cook"] = 2
+    schedule_data["role_importance"]["Cook"] = 5
+
+    capacity = capacity_analysis(compile_instance(schedule_data))
+
+    assert capacity["bottlenecks"][0] == {"role": "Cook", "unfillable": 4, "required": 4}
+    assert "Cook on Sunday Morning can be at most 0/2" in capacity["messages"]
+
+
+def test_report_says_when_the_shortage_is_forced(schedule_data):
+    drafts = []
+    _, _, report = solve(schedule_data, {"preset": "fast", "use_cache": False}, on_draft=drafts.append)
+
+    assert drafts[0]["capacity"]["shortage_lower_bound"] == 4
+    assert report["objective_breakdown"]["shortage"] == 4
+    assert report["capacity"]["shortage_proven"] is True
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_bound_never_exceeds_the_optimum(seed):
+    data = generate_instance(40, availability_density=0.2, staffing_ratio=1.2, seed=seed)
+    data["min_max_employees_per_shift"] = {"min": 1, "max": 2}
+
+    _, _, report = solve(data, {"preset": "best", "time_limit": 20, "use_cache": False,
+                                "objective_mode": "lexicographic"}, include_text=False)
+
+    assert report["stages"][0]["status"] == "OPTIMAL"
+    assert report["capacity"]["shortage_lower_bound"] <= report["objective_breakdown"]["shortage"]
@@ -0,0 +1,32 @@
+# tests/unit/test_constraints_model.py
+
+import pytest
+from models.constraints_model import CONSTRAINT_FIELDS, final_constraints_filter, is_constraint_final
+
+SETTINGS = {"activeVersion": "ABC123", "settingsEpoch": 3}
+
+
+@pytest.mark.parametrize("constraint, final", [
+    ({"is_final": True, "version": "ABC123", "epoch": 3}, True),
+    ({"is_final": True, "version": "ABC123", "epoch": 2}, False),   # settings saved since
+    ({"is_final": True, "version": "OLD999", "epoch": 3}, False),   # previous cycle
+    ({"is_final": False, "version": "ABC123", "epoch": 3}, False),
+])
+def test_finality_follows_version_and_epoch(constraint, final):
+    assert is_constraint_final(constraint, SETTINGS) is final
+
+
+def test_submissions_before_epochs_count_as_epoch_zero():
+    legacy = {"is_final": True, "version": "ABC123"}
+
+    assert is_constraint_final(legacy, {"activeVersion": "ABC123"})
+    assert not is_constraint_final(legacy, SETTINGS)
+    assert final_constraints_filter({"activeVersion": "ABC123"})["epoch"] == {"$in": [0, None]}
+
+
+def test_filter_matches_the_current_cycle():
+    assert final_constraints_filter(SETTINGS) == {"is_final": True, "version": "ABC123", "epoch": 3}
+
+
+def test_solver_preset_has_what_the_solver_reads():
+    assert {"first_name", "last_name", "roles", "availability"} <= set(CONSTRAINT_FIELDS["solver"])
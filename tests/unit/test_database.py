@@ -21,3 +21,14 @@ def test_get_collection_switches_db(monkeypatch):
     # 3. get_collection should return a pymongo Collection whose name matches the argument
     col = db_mod.get_collection("just")
     assert col.name == "just"
+
+
+def test_projection_presets():
+    from models.database import projection
+    presets = {"summary": ["first_name", "last_name"]}
+
+    assert projection(presets) is None
+    assert projection(presets, "summary") == {"first_name": 1, "last_name": 1}
+    assert projection(presets, ["uid"]) == {"uid": 1}
+    with pytest.raises(ValueError):
+        projection(presets, "everything")
@@ -0,0 +1,99 @@
+# tests/unit/test_decomposition.py
+
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from app.algorithm.decomposition import find_components
+from app.algorithm import csp_algoritm
+from app.algorithm.csp_algoritm import solve
+
+OPTIONS = {"preset": "fast", "use_cache": False, "time_limit": 10}
+
+
+def two_departments(num_employees=60):
+    """
+    Two generated instances merged into one week: the second one's employees and roles are
+    renamed, so nobody in one department can fill a position of the other.
+    """
+    kitchen = generate_instance(num_employees, num_roles=2, staffing_ratio=0.8, seed=1)
+    bar = generate_instance(num_employees, num_roles=2, staffing_ratio=0.8, seed=2)
+    data = dict(kitchen)
+    data["employee_skills"] = dict(kitchen["employee_skills"])
+    data["employee_availability"] = dict(kitchen["employee_availability"])
+    for name, skills in bar["employee_skills"].items():
+        data["employee_skills"][f"Bar {name}"] = [f"Bar {role}" for role in skills]
+    for name, availability in bar["employee_availability"].items():
+        data["employee_availability"][f"Bar {name}"] = availability
+    data["roles_per_shift"] = {
+        shift: dict(demand, **{f"Bar {role}": count for role, count in bar["roles_per_shift"][shift].items()})
+        for shift, demand in kitchen["roles_per_shift"].items()
+    }
+    data["role_importance"] = dict(kitchen["role_importance"],
+                                   **{f"Bar {role}": v for role, v in bar["role_importance"].items()})
+    data["min_max_employees_per_shift"] = {"min": 1, "max": 100}
+    return data
+
+
+def test_departments_are_separate_components():
+    instance = compile_instance(two_departments())
+
+    components = find_components(instance)
+
+    bar = {e for e, name in enumerate(instance.employees) if name.startswith("Bar ")}
+    big = [c for c in components if len(c) > 1]
+    assert len(big) == 2
+    assert all(set(c) <= bar or not set(c) & bar for c in components)
+
+
+def test_binding_shift_maximum_links_departments():
+    data = two_departments()
+    data["min_max_employees_per_shift"] = {"min": 1, "max": 1}
+
+    components = find_components(compile_instance(data))
+
+    assert len([c for c in components if len(c) > 1]) == 1
+
+
+def test_decomposed_solve_matches_monolithic():
+    """
+    Integration of find_components and solve_components: the reconciled schedule is close
+    to the monolithic optimum and never worse than its own balance band.
+    """
+    data = two_departments()
+
+    _, _, whole = solve(data, OPTIONS, include_text=False)
+    _, _, split = solve(data, dict(OPTIONS, decompose=True), include_text=False)
+
+    assert whole["decomposition"]["applied"] is False
+    assert split["decomposition"]["applied"] is True
+    assert split["decomposition"]["solved_components"] == 2
+    low, high = split["decomposition"]["load_band"]
+    assert split["objective_breakdown"]["balance"] <= high - low
+    assert split["objective"] == split["objective_breakdown"]["weighted"]
+    assert split["objective"] <= whole["objective"] * 1.05
+    assert split["best_bound"] is None
+
+
+def test_decomposed_solve_keeps_to_the_time_limit(monkeypatch):
+    """
+    Both passes share one time limit instead of each getting all of it: the first pass
+    gets at most half, the second at most what the first pass's solves left.
+    """
+    solves = []
+    real_run_solver = csp_algoritm.run_solver
+
+    def recording_run_solver(model, solver_config, *args, **kwargs):
+        result = real_run_solver(model, solver_config, *args, **kwargs)
+        solves.append((solver_config["time_limit"], result[0].WallTime()))
+        return result
+    monkeypatch.setattr(csp_algoritm, "run_solver", recording_run_solver)
+
+    _, _, report = solve(two_departments(), dict(OPTIONS, time_limit=4, num_workers=8, decompose=True),
+                         include_text=False)
+
+    assert report["decomposition"]["applied"] and report["decomposition"]["reconciled"]
+    assert report["decomposition"]["concurrency"] == 2
+    first, second = solves[:2], solves[2:]
+    assert len(second) == 2
+    assert all(time_limit <= 4 / 2 for time_limit, _ in first)
+    first_pass = max(wall_time for _, wall_time in first)
+    assert all(time_limit <= 4 - first_pass for time_limit, _ in second)
@@ -0,0 +1,32 @@
+# tests/unit/test_extraction.py
+
+from ortools.sat.python import cp_model
+from app.algorithm.instance import compile_instance
+from app.algorithm.csp_algoritm import build_model
+from app.algorithm.extraction import AssignmentReader, table_from_assigned
+
+
+def test_reader_matches_per_variable_values(schedule_data):
+    """
+    Unit test for AssignmentReader.
+    The single-pass read gives the same table as asking the solver for every variable.
+    """
+    instance = compile_instance(schedule_data)
+    model, assignments, _ = build_model(instance)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+    table = AssignmentReader(instance, assignments).read(solver)
+
+    expected = table_from_assigned(instance, [key for key, var in assignments.items() if solver.Value(var)])
+    assert table == expected
+    assert len(table) == instance.num_shifts
+
+
+def test_table_is_sorted_by_employee(schedule_data):
+    instance = compile_instance(schedule_data)
+    waiter, bartender = 0, 1
+
+    table = table_from_assigned(instance, [(2, 0, waiter), (0, 0, bartender), (1, 3, waiter)])
+
+    assert table == (((0, bartender), (2, waiter)), (), (), ((1, waiter),))
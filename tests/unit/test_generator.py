@@ -0,0 +1,29 @@
+# tests/unit/test_generator.py
+
+import pytest
+from app.algorithm.generator import generate_instance
+from app.algorithm.instance import compile_instance
+
+
+def test_generator_is_seeded_and_compiles():
+    """
+    Unit test for generate_instance.
+    The same seed gives the same instance, a different seed a different one,
+    and the output is accepted by the solver's instance compiler.
+    """
+    a = generate_instance(50, num_roles=3, shifts_per_day=2, work_days=5, seed=11)
+    assert a == generate_instance(50, num_roles=3, shifts_per_day=2, work_days=5, seed=11)
+    assert a != generate_instance(50, num_roles=3, shifts_per_day=2, work_days=5, seed=12)
+
+    instance = compile_instance(a)
+    assert instance.num_employees == 50
+    assert instance.num_shifts == 10
+    assert len(a["roles_per_shift"]) == 2
+    assert all(0 <= shift < 10 for slots in a["employee_availability"].values() for shift, _ in slots)
+
+
+def test_generator_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        generate_instance(10, work_days=8)
+    with pytest.raises(ValueError):
+        generate_instance(10, priority_distribution="bimodal")
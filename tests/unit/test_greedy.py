@@ -0,0 +1,69 @@
+# tests/unit/test_greedy.py
+
+from ortools.sat.python import cp_model
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from app.algorithm import csp_algoritm
+from app.algorithm.csp_algoritm import build_model, solve
+from app.algorithm.greedy import greedy_assign
+
+
+def test_draft_fills_important_roles_first(schedule_data):
+    """
+    Unit test for greedy_assign.
+    Alice is the only one available on Sunday evening; waiters outrank bartenders.
+    """
+    instance = compile_instance(schedule_data)
+    waiter = 0
+
+    assigned = greedy_assign(instance)
+
+    assert (0, 1, waiter) in assigned
+    assert not any(e == 0 and shift == 1 and role != waiter for e, shift, role in assigned)
+
+
+def test_draft_satisfies_every_hard_constraint():
+    """
+    Fixing every assignment of the model to the draft leaves it feasible.
+    """
+    instance = compile_instance(generate_instance(150, max_consecutive_shifts=1, seed=3))
+    assigned = greedy_assign(instance)
+    model, assignments, _ = build_model(instance)
+    for key, var in assignments.items():
+        model.Add(var == (1 if key in assigned else 0))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 8
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+
+def test_draft_is_emitted_and_reported(schedule_data):
+    drafts = []
+    _, _, report = solve(schedule_data, {"preset": "fast", "use_cache": False}, on_draft=drafts.append)
+
+    assert len(drafts) == 1
+    assert drafts[0]["objective"] == report["draft"]["objective"]
+    assert report["draft"]["improvement"] == report["draft"]["objective"] - report["objective"] >= 0
+
+
+def test_timeout_without_incumbent_returns_the_draft(monkeypatch):
+    """
+    A search that ends without any solution (here every solve reports UNKNOWN, as on a
+    timeout) still returns the greedy draft.
+    """
+    real_run_solver = csp_algoritm.run_solver
+
+    def out_of_time(*args, **kwargs):
+        solver, _, progress, search = real_run_solver(*args, **kwargs)
+        return solver, cp_model.UNKNOWN, progress, search
+    monkeypatch.setattr(csp_algoritm, "run_solver", out_of_time)
+
+    result = solve(generate_instance(20, seed=1), {"preset": "best", "use_cache": False, "model_cache": False},
+                   include_text=False)
+
+    assert result is not None
+    _, _, report = result
+    assert report["status"] == "UNKNOWN"
+    assert not report["cancelled"]
+    assert report["from_draft"]
+    assert report["objective"] == report["draft"]["objective"]
@@ -0,0 +1,107 @@
+# tests/unit/test_horizon.py
+
+import json
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from ortools.sat.python import cp_model
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from app.algorithm.extraction import table_from_assigned
+from app.algorithm.greedy import greedy_assign
+from app.algorithm.horizon import weeks_are_contiguous, table_carry, schedule_carry, schedule_precedes
+from app.algorithm.csp_algoritm import build_model, solve_horizon
+from models.weekly_schedule_model import WeeklyScheduleModel
+
+
+def full_week(**kwargs):
+    return generate_instance(40, work_days=7, availability_density=0.9, max_consecutive_shifts=2, seed=8, **kwargs)
+
+
+def test_only_full_weeks_are_contiguous():
+    assert weeks_are_contiguous(compile_instance(full_week()))
+    assert not weeks_are_contiguous(compile_instance(generate_instance(10, work_days=6)))
+    assert not weeks_are_contiguous(SimpleNamespace(work_days=["Sunday", "Saturday"]))
+    assert weeks_are_contiguous(SimpleNamespace(
+        work_days=["Wednesday", "Thursday", "Friday", "Saturday", "Sunday", "Monday", "Tuesday"]))
+
+
+def test_only_the_week_before_carries():
+    # Published on Wednesday 14/10/2026 for the week of Sunday 18/10
+    week_start = WeeklyScheduleModel.next_week_start(datetime(2026, 10, 14, 9, 30)).date()
+    assert week_start == date(2026, 10, 18)
+
+    assert schedule_precedes("11/10/2026 - 17/10/2026", week_start)
+    # Regenerating the week that is already published
+    assert not schedule_precedes("18/10/2026 - 24/10/2026", week_start)
+    assert not schedule_precedes("4/10/2026 - 10/10/2026", week_start)
+    assert not schedule_precedes(None, week_start)
+
+
+def test_carry_counts_the_last_shifts_worked():
+    instance = compile_instance(full_week())
+    last = instance.num_shifts - 1
+    table = table_from_assigned(instance, {(0, last, 0), (0, last - 1, 0), (0, last - 2, 0), (1, last - 1, 0)})
+
+    carry = table_carry(instance, table)
+
+    # Capped at max_consecutive_shifts; employee 1 is off on the last shift
+    assert carry[0] == 2
+    assert carry[1] == 0
+
+
+def test_carry_from_published_schedule():
+    instance = compile_instance(full_week())
+    days = [{"name": "Saturday", "shifts": [
+        {"time": "Night", "employees": [{"name": instance.employees[3], "role": "Chef"}]},
+    ]}]
+
+    assert schedule_carry(instance, days)[3] == 1
+
+
+@pytest.mark.parametrize("encoding", ["windows", "automaton"])
+def test_carry_limits_the_start_of_the_week(encoding):
+    instance = compile_instance(full_week())
+    e = min(set.intersection(*(set(employees) for employees in instance.shift_employees[:3])))
+    carry = tuple(2 if i == e else 0 for i in range(instance.num_employees))
+
+    def feasible(run, carry):
+        model, _, shifts = build_model(instance, consecutive_encoding=encoding, carry=carry)
+        model.ClearObjective()
+        for shift in run:
+            model.Add(shifts[(e, shift)] == 1)
+        return cp_model.CpSolver().Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+    assert feasible([0], None)
+    assert not feasible([0], carry)
+    assert feasible([1, 2], carry)
+
+
+def test_greedy_draft_respects_carry():
+    instance = compile_instance(full_week())
+    carry = (2,) * instance.num_employees
+
+    assigned = greedy_assign(instance, carry)
+
+    assert not any(shift == 0 for _, shift, _ in assigned)
+
+
+def test_horizon_respects_limit_across_weeks():
+    data = full_week()
+    instance = compile_instance(data)
+    weeks = []
+
+    solutions, report = solve_horizon(data, 3, {"preset": "fast", "use_cache": False, "carry_over": True},
+                                      on_week=lambda week, solution, _: weeks.append(week))
+
+    assert weeks == [1, 2, 3]
+    assert report["weeks"] == 3
+    assert report["objective"] == sum(week["objective"] for week in report["week_reports"])
+    # Concatenate the weeks and check every window of max_consecutive_shifts + 1 shifts
+    names = [[{e["name"] for e in shift["employees"]} for day in json.loads(solution) for shift in day["shifts"]]
+             for solution in solutions]
+    timeline = [working for week in names for working in week]
+    window = instance.max_consecutive_shifts + 1
+    for employee in instance.employees:
+        worked = [employee in working for working in timeline]
+        assert all(sum(worked[s:s + window]) < window for s in range(len(worked) - window + 1))
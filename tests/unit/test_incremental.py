@@ -0,0 +1,58 @@
+# tests/unit/test_incremental.py
+
+import json
+from app.algorithm.instance import compile_instance
+from app.algorithm.incremental import neighborhood_shifts, schedule_diff
+from app.algorithm.csp_algoritm import solve_incremental
+
+
+def previous_schedule():
+    return [
+        {"id": "d0", "name": "Sunday", "shifts": [
+            {"id": "s0", "time": "Morning", "employees": [{"name": "Alice Smith", "role": "Waiter"}], "shortages": {}},
+            {"id": "s1", "time": "Evening", "employees": [], "shortages": {"Waiter": 1, "Bartender": 1}},
+        ]},
+        {"id": "d1", "name": "Monday", "shifts": [
+            {"id": "s2", "time": "Morning", "employees": [{"name": "Bob Cohen", "role": "Waiter"}], "shortages": {}},
+            {"id": "s3", "time": "Evening", "employees": [{"name": "Alice Smith", "role": "Waiter"}],
+             "shortages": {"Bartender": 1}},
+        ]},
+    ]
+
+
+def test_neighborhood_covers_changed_shifts_and_their_windows(schedule_data):
+    """
+    Unit test for neighborhood_shifts.
+    Bob worked Monday morning and cannot fill any of the previous shortages, so only
+    that shift is affected; the consecutive-shift windows around it are opened too.
+    """
+    schedule_data["max_consecutive_shifts"] = 1
+    instance = compile_instance(schedule_data)
+
+    affected, free = neighborhood_shifts(instance, previous_schedule(), ["Bob Cohen"])
+
+    assert affected == {2}
+    assert free == {1, 2, 3}
+
+
+def test_incremental_solve_keeps_assignments_outside_the_neighborhood(schedule_data):
+    """
+    Bob withdraws from Monday morning. Sunday morning is outside the neighborhood and
+    keeps Alice, even though the rest of the week changes around it.
+    """
+    schedule_data["max_consecutive_shifts"] = 1
+    schedule_data["employee_availability"]["Bob Cohen"] = [[0, 3]]
+
+    result = solve_incremental(schedule_data, previous_schedule(), ["Bob Cohen"], {"preset": "fast"})
+    assert result is not None
+    formatted_json, _, report = result
+    schedule = json.loads(formatted_json)
+
+    assert schedule[0]["shifts"][0]["employees"][0]["name"] == "Alice Smith"
+    assert report["incremental"]["affected_shifts"] == [2]
+    assert report["incremental"]["free_shifts"] == [1, 2, 3]
+
+    diff = schedule_diff(previous_schedule(), schedule)
+    monday_morning = next(change for change in diff if change["id"] == "s2")
+    assert monday_morning["removed"] == [{"name": "Bob Cohen", "role": "Waiter"}]
+    assert all(change["id"] != "s0" for change in diff)
@@ -0,0 +1,33 @@
+# tests/unit/test_indexes.py
+
+import pytest
+from models.constraints_model import final_constraints_filter
+from models.indexes import INDEXES, HOT_QUERIES, plan_stages
+
+
+def test_plan_stages_classic_engine():
+    plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "uid"}}
+    assert plan_stages(plan) == ["FETCH", "IXSCAN"]
+
+
+def test_plan_stages_slot_based_engine():
+    plan = {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}, "slotBasedPlan": {"slots": "..."}}
+    assert plan_stages(plan) == ["SORT", "COLLSCAN"]
+
+
+@pytest.mark.parametrize("name, collection, query, sort, fields", HOT_QUERIES)
+def test_every_hot_query_has_an_index(name, collection, query, sort, fields):
+    """
+    The leading fields of some declared index are exactly the query's filter fields,
+    or its sort field when there is no filter.
+    """
+    fields = set(query) or {field for field, _ in sort}
+    prefixes = [{field for field, _ in index.document["key"].items()} for index in INDEXES[collection]]
+    assert fields in prefixes, name
+
+
+def test_final_constraints_entry_is_the_production_query():
+    _, _, query, _, fields = next(entry for entry in HOT_QUERIES if entry[0] == "final constraints of a version")
+    assert query == final_constraints_filter({"activeVersion": ""})
+    assert query["epoch"] == {"$in": [0, None]}
+    assert set(fields) == {"first_name", "last_name", "roles", "availability"}
@@ -0,0 +1,39 @@
+# tests/unit/test_instance.py
+
+import pytest
+from app.algorithm.instance import compile_instance
+
+
+def test_compile_instance_builds_indexes(schedule_data):
+    """
+    Unit test for compile_instance.
+    Checks the integer ids, availability sets and per-(shift, role) eligibility lists.
+    """
+    instance = compile_instance(schedule_data)
+
+    assert instance.employees == ("Alice Smith", "Bob Cohen", "Dana Levi")
+    assert instance.roles == ("Waiter", "Bartender")
+    assert instance.num_shifts == 4
+    assert instance.availability[0] == frozenset({0, 1, 3})
+    # Dana has no availability entries at all
+    assert instance.availability[2] == frozenset()
+    assert instance.priority[(1, 2)] == 8
+
+    waiter, bartender = 0, 1
+    assert instance.eligible[(0, waiter)] == (0, 1)
+    assert instance.eligible[(1, bartender)] == (0,)
+    assert instance.eligible[(2, waiter)] == (1,)
+    assert instance.shift_employees[3] == (0,)
+    # Roles nobody needs on a shift are dropped from the skill sets
+    assert instance.skills[2] == frozenset()
+    assert instance.role_employees[waiter] == (0, 1)
+    assert instance.shift_name(3) == "Evening"
+    assert instance.day_name(3) == "Monday"
+
+
+def test_compiled_instance_is_immutable(schedule_data):
+    instance = compile_instance(schedule_data)
+    with pytest.raises(Exception):
+        instance.max_employees = 10
+    with pytest.raises(TypeError):
+        instance.priority[(0, 0)] = 1
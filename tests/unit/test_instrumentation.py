@@ -0,0 +1,37 @@
+# tests/unit/test_instrumentation.py
+
+from app.algorithm.instrumentation import PhaseTimer, SearchLogProbe
+
+
+def test_search_log_probe_reads_presolve_split():
+    """
+    Unit test for SearchLogProbe.
+    Presolve ends when the search starts; the variable count is taken from the presolved
+    model, not the initial one, even when several log lines arrive in one message.
+    """
+    probe = SearchLogProbe()
+    probe("Initial optimization model '': (model_fingerprint: 0x1)\n#Variables: 1'625 (#bools: 1'600)")
+    probe("Starting presolve at 0.00s")
+    probe("Presolved optimization model '': (model_fingerprint: 0x2)")
+    probe("#Variables: 986 (#bools: 970)")
+    probe("Starting search at 0.08s with 8 workers.")
+    probe("#1       0.17s best:2900 next:[2800,2899]")
+
+    assert probe.presolve_time == 0.08
+    assert probe.presolved_variables == 986
+
+
+def test_phase_timer_accumulates_repeated_phases():
+    """
+    Unit test for PhaseTimer.
+    Entering the same phase twice adds to its total.
+    """
+    timer = PhaseTimer()
+    timer.add("db_fetch", 0.5)
+    with timer.phase("db_fetch"):
+        pass
+    with timer.phase("build"):
+        pass
+
+    assert set(timer.timings) == {"db_fetch", "build"}
+    assert timer.timings["db_fetch"] >= 0.5
@@ -0,0 +1,101 @@
+# tests/unit/test_jobs.py
+
+import pytest
+from flask import Flask
+import tasks
+import app.algorithm_routes as routes
+from utils.jobs import MemoryJobRegistry
+from app.algorithm.generator import generate_instance
+from app.algorithm.csp_algoritm import solve
+
+
+def test_identical_requests_share_one_job():
+    """
+    Unit test for MemoryJobRegistry.
+    The first claim registers the job; later claims for the same key get its task id
+    until the job finishes.
+    """
+    registry = MemoryJobRegistry()
+    assert registry.claim("key", "task-1") is None
+    assert registry.claim("key", "task-2") == "task-1"
+
+    registry.add_listener("task-1", "socket-a")
+    registry.add_listener("task-1", "socket-b")
+    assert registry.listeners("task-1") == {"socket-a", "socket-b"}
+
+    registry.finish("key", "task-1")
+    assert registry.running("key") is None
+    assert registry.claim("key", "task-2") is None
+
+
+def test_job_is_orphaned_when_its_last_socket_leaves():
+    registry = MemoryJobRegistry()
+    registry.add_listener("task-1", "socket-a")
+    registry.add_listener("task-1", "socket-b")
+
+    assert registry.remove_listener("socket-a") == []
+    assert registry.remove_listener("socket-b") == ["task-1"]
+
+    registry.cancel("task-1")
+    assert registry.is_cancelled("task-1")
+    registry.clear("task-1")
+    assert not registry.is_cancelled("task-1")
+
+
+def test_cancelled_search_returns_best_solution_so_far():
+    """
+    A cancel during a long search stops it early; the best schedule found so far is still
+    returned, which is at worst the greedy draft.
+    """
+    data = generate_instance(400, seed=1)
+    result = solve(data, {"preset": "best", "use_cache": False}, include_text=False, should_stop=lambda: True)
+
+    assert result is not None
+    _, _, report = result
+    assert report["cancelled"]
+    # Stopped before the search could prove anything
+    assert report["status"] in ("FEASIBLE", "UNKNOWN")
+    assert report["objective"] <= report["draft"]["objective"]
+
+
+def test_failed_solve_notifies_listeners_and_releases_the_job(monkeypatch):
+    registry = MemoryJobRegistry()
+    emitted = []
+    monkeypatch.setattr(tasks, "job_registry", registry)
+    monkeypatch.setattr(tasks.socketio, "emit", lambda event, payload, **kwargs: emitted.append((event, kwargs["room"])))
+
+    def broken_solve(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(tasks, "solve_schedule", broken_solve)
+
+    registry.claim("key", "task-1")
+    registry.add_listener("task-1", "socket-b")
+    with pytest.raises(RuntimeError):
+        tasks.generate_schedule.apply(args=("socket-a", None, False, "key"), task_id="task-1").get()
+
+    assert sorted(emitted) == [("schedule_error", "socket-a"), ("schedule_error", "socket-b")]
+    assert registry.running("key") is None
+    assert registry.listeners("task-1") == set()
+
+
+def test_enqueue_failure_releases_the_claim(monkeypatch):
+    registry = MemoryJobRegistry()
+    claimed = []
+    monkeypatch.setattr(registry, "claim",
+                        lambda key, task_id: claimed.append(key) or MemoryJobRegistry.claim(registry, key, task_id))
+    monkeypatch.setattr(routes, "job_registry", registry)
+    monkeypatch.setattr(routes, "get_manager_settings", lambda: {"activeVersion": "V1"})
+
+    def broker_down(*args, **kwargs):
+        raise ConnectionError("broker unreachable")
+    monkeypatch.setattr(routes.generate_schedule, "apply_async", broker_down)
+
+    app = Flask(__name__)
+    app.register_blueprint(routes.alg_api, url_prefix="/csp")
+    client = app.test_client()
+
+    response = client.post("/csp/generate-schedule", json={"socket_id": "socket-a"})
+
+    assert response.status_code == 503
+    assert len(claimed) == 1
+    assert registry.running(claimed[0]) is None
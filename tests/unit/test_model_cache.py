@@ -0,0 +1,72 @@
+# tests/unit/test_model_cache.py
+
+import json
+import pytest
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from app.algorithm.model_cache import model_cache, structure_key, pack_model, unpack_model
+from app.algorithm.csp_algoritm import build_model, solve
+
+OPTIONS = {"preset": "best", "time_limit": 20, "use_cache": False}
+
+
+@pytest.fixture(autouse=True)
+def empty_model_cache():
+    model_cache.clear()
+    yield
+    model_cache.clear()
+
+
+def small_instance():
+    return generate_instance(20, availability_density=0.5, seed=4)
+
+
+def test_hit_solves_like_a_fresh_build():
+    data = small_instance()
+
+    _, _, cold = solve(data, OPTIONS, include_text=False)
+    _, _, warm = solve(data, OPTIONS, include_text=False)
+    _, _, uncached = solve(data, dict(OPTIONS, model_cache=False), include_text=False)
+
+    assert cold["model_cache"]["hit"] is False
+    assert warm["model_cache"]["hit"] is True
+    assert uncached["model_cache"] is None
+    assert warm["objective"] == cold["objective"] == uncached["objective"]
+
+
+def test_new_priorities_reweight_the_cached_model():
+    data = small_instance()
+    solve(data, OPTIONS, include_text=False)
+    for employee, availability in data["employee_availability"].items():
+        data["employee_availability"][employee] = [[shift, 10 - priority] for shift, priority in availability]
+    data["role_importance"]["Cook"] = 9
+
+    _, _, cached = solve(data, OPTIONS, include_text=False)
+    _, _, uncached = solve(data, dict(OPTIONS, model_cache=False), include_text=False)
+
+    assert cached["model_cache"]["hit"] is True
+    assert cached["objective"] == uncached["objective"]
+
+
+def test_structural_change_misses():
+    data = small_instance()
+    instance = compile_instance(data)
+    data["max_consecutive_shifts"] += 1
+
+    assert structure_key(instance, "windows") != structure_key(compile_instance(data), "windows")
+    assert structure_key(instance, "windows") != structure_key(instance, "automaton")
+
+
+def test_entry_survives_json():
+    instance = compile_instance(small_instance())
+    structure = {}
+    model, assignments, shifts = build_model(instance, structure=structure)
+
+    entry = json.loads(json.dumps(pack_model(model, assignments, shifts, structure, 0.5)))
+    loaded, loaded_assignments, loaded_shifts, shortages, balance = unpack_model(entry)
+
+    assert len(loaded.Proto().variables) == len(model.Proto().variables)
+    assert len(loaded.Proto().constraints) == len(model.Proto().constraints)
+    assert [var.Index() for var in loaded_assignments.values()] == [var.Index() for var in assignments.values()]
+    assert loaded_shifts.keys() == shifts.keys()
+    assert shortages.keys() == structure["shortages"].keys()
@@ -0,0 +1,90 @@
+# tests/unit/test_scenarios.py
+
+import pytest
+from types import SimpleNamespace
+import tasks
+from app.algorithm import scenarios as scenarios_module
+from app.algorithm.scenarios import validate_scenarios, apply_scenario, compare_scenarios
+
+
+def test_extra_shift_moves_availability_by_name(schedule_data):
+    """
+    Unit test for apply_scenario.
+    Inserting a shift name changes shifts_per_day, so every submitted shift id is
+    renumbered; the original snapshot is left untouched.
+    """
+    scenario = apply_scenario(schedule_data, {
+        "shift_names": ["Morning", "Noon", "Evening"],
+        "roles_per_shift": {"Noon": {"Waiter": 1}},
+        "role_importance": {"Waiter": 9},
+    })
+
+    assert scenario["shifts_per_day"] == 3
+    # Alice: Sunday morning, Sunday evening, Monday evening
+    assert scenario["employee_availability"]["Alice Smith"] == [[0, 10], [2, 5], [5, 7]]
+    assert scenario["role_importance"] == {"Waiter": 9, "Bartender": 2}
+    assert schedule_data["shifts_per_day"] == 2
+    assert schedule_data["employee_availability"]["Alice Smith"] == [[0, 10], [1, 5], [3, 7]]
+
+
+@pytest.mark.parametrize("scenarios", [
+    [],
+    [{"name": "x"}],
+    [{"settings": {"activeVersion": "ABC"}}],
+    [{"settings": {"max_consecutive_shifts": "two"}}],
+    [{"name": "a", "settings": {}}, {"name": "a", "settings": {}}],
+])
+def test_invalid_scenarios_raise(scenarios):
+    with pytest.raises(ValueError):
+        validate_scenarios(scenarios)
+
+
+def test_scenarios_are_compared_to_current_settings(schedule_data):
+    """
+    Three waiters per morning: Alice and Bob cover two on Sunday, only Bob is available
+    on Monday. The scenario row shows the three extra unfilled positions relative to the
+    current settings.
+    """
+    scenarios = validate_scenarios([
+        {"name": "busy mornings", "settings": {"roles_per_shift": {"Morning": {"Waiter": 3}}}},
+    ])
+
+    rows = compare_scenarios(schedule_data, scenarios, {"preset": "fast", "num_workers": 8}, max_processes=2)
+
+    assert [row["name"] for row in rows] == ["current", "busy mornings"]
+    assert rows[1]["delta"]["unfilled_positions"] == 3
+    assert rows[1]["delta"]["shortage"] == 3 * 3  # waiter importance
+    assert all(row["num_workers"] == 4 for row in rows)  # the two processes split the 8 workers
+
+
+def test_daemonic_worker_compares_in_threads(schedule_data, monkeypatch):
+    """
+    A Celery prefork worker is a daemonic process and may not start child processes;
+    the scenarios are solved in threads there.
+    """
+    def no_processes(*args, **kwargs):
+        raise AssertionError("daemonic processes are not allowed to have children")
+    monkeypatch.setattr(scenarios_module, "ProcessPoolExecutor", no_processes)
+    monkeypatch.setattr(scenarios_module.multiprocessing, "current_process", lambda: SimpleNamespace(daemon=True))
+    scenarios = validate_scenarios([
+        {"name": "busy mornings", "settings": {"roles_per_shift": {"Morning": {"Waiter": 3}}}},
+    ])
+
+    rows = compare_scenarios(schedule_data, scenarios, {"preset": "fast", "num_workers": 8}, max_processes=2)
+
+    assert [row["name"] for row in rows] == ["current", "busy mornings"]
+    assert rows[1]["delta"]["unfilled_positions"] == 3
+
+
+def test_failed_comparison_notifies_the_socket(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(tasks.socketio, "emit", lambda event, payload, **kwargs: emitted.append((event, kwargs["room"])))
+
+    def broken_parse():
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(tasks, "parse_json_to_constraints", broken_parse)
+
+    with pytest.raises(RuntimeError):
+        tasks.compare_schedule_scenarios.apply(args=("socket-a", [])).get()
+
+    assert emitted == [("scenarios_error", "socket-a")]
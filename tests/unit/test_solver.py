@@ -0,0 +1,121 @@
+# tests/unit/test_solver.py
+
+import json
+import pytest
+from ortools.sat.python import cp_model
+from app.algorithm import csp_algoritm
+from app.algorithm.csp_algoritm import solve, build_model, solve_schedule
+from app.algorithm.instance import compile_instance
+from app.algorithm.generator import generate_instance
+from models.weekly_schedule_model import WeeklyScheduleModel
+from utils.cache import schedule_cache
+
+
+def test_solve_without_database(schedule_data):
+    """
+    Unit test for the pure solve() entry point: no MongoDB, no cache.
+    On Sunday evening only Alice is available; waiters outrank bartenders in
+    role_importance, so she waits tables and the bartender position stays short.
+    """
+    result = solve(schedule_data, {"preset": "fast", "use_cache": False})
+    assert result is not None
+    formatted_json, text, report = result
+
+    schedule = json.loads(formatted_json)
+    assert [day["name"] for day in schedule] == ["Sunday", "Monday"]
+    sunday_evening = schedule[0]["shifts"][1]
+    assert sunday_evening["employees"] == [
+        {"id": "e0_s1", "name": "Alice Smith", "role": "Waiter", "hours": "8"}
+    ]
+    assert sunday_evening["shortages"] == {"Bartender": 1}
+    assert len(text) == 4
+
+    assert report["status"] == "OPTIMAL"
+    breakdown = report["objective_breakdown"]
+    assert breakdown["weighted"] == report["objective"]
+    assert set(report["timings"]) >= {"compile", "build", "solve", "presolve", "search", "extract", "render_text"}
+    assert report["model"]["variables"] > 0
+    assert report["search"]["gap"] == 0
+
+
+def test_text_summary_only_when_requested(schedule_data):
+    formatted_json, text, report = solve(schedule_data, {"preset": "fast", "use_cache": False}, include_text=False)
+
+    assert text is None
+    assert "render_text" not in report["timings"]
+    assert json.loads(formatted_json)
+
+
+def test_lexicographic_mode_reports_each_stage():
+    data = generate_instance(60, seed=4)
+
+    options = {"preset": "best", "time_limit": 10, "use_cache": False}
+    _, _, weighted = solve(data, options, include_text=False)
+    _, _, staged = solve(data, dict(options, objective_mode="lexicographic"), include_text=False)
+
+    assert weighted["stages"] is None
+    assert [stage["stage"] for stage in staged["stages"]] == ["shortage", "balance", "preference"]
+    breakdown = staged["objective_breakdown"]
+    assert [stage["objective"] for stage in staged["stages"]] == [
+        breakdown["shortage"], breakdown["balance"], breakdown["preference"]]
+    # Shortage comes first, so it can never be worse than in the weighted mode
+    assert breakdown["shortage"] <= weighted["objective_breakdown"]["shortage"]
+    assert staged["objective"] == breakdown["weighted"]
+
+
+@pytest.mark.parametrize("encoding", ["windows", "automaton"])
+def test_consecutive_encoding_forbids_long_runs(encoding):
+    """
+    Forcing an employee onto max_consecutive_shifts + 1 shifts in a row is infeasible,
+    while any max_consecutive_shifts in a row are allowed.
+    """
+    data = generate_instance(20, max_consecutive_shifts=2, availability_density=1.0, seed=5)
+    instance = compile_instance(data)
+    # An employee who can work every shift
+    e = min(set.intersection(*(set(employees) for employees in instance.shift_employees)))
+
+    def feasible(run):
+        model, _, shifts = build_model(instance, consecutive_encoding=encoding)
+        model.ClearObjective()
+        for shift in run:
+            model.Add(shifts[(e, shift)] == 1)
+        return cp_model.CpSolver().Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+    assert feasible([4, 5])
+    assert feasible([4, 5, 7, 8])
+    assert not feasible([4, 5, 6])
+
+
+def test_encodings_reach_the_same_optimum():
+    data = generate_instance(80, work_days=7, max_consecutive_shifts=3, availability_density=0.8, seed=6)
+    options = {"preset": "best", "time_limit": 20, "use_cache": False}
+
+    _, _, windows = solve(data, options, include_text=False)
+    _, _, automaton = solve(data, dict(options, consecutive_encoding="automaton"), include_text=False)
+
+    assert windows["status"] == automaton["status"] == "OPTIMAL"
+    assert windows["objective"] == automaton["objective"]
+    assert automaton["model"]["constraints"] < windows["model"]["constraints"]
+
+
+def test_cached_report_is_not_shared_with_callers(schedule_data, monkeypatch):
+    """
+    The in-memory schedule cache keeps its own copy, as Redis does: changing a returned
+    report (tasks add the "emit" timing) leaves the cached one alone.
+    """
+    monkeypatch.setattr(csp_algoritm, "parse_json_to_constraints", lambda: schedule_data)
+    monkeypatch.setattr(WeeklyScheduleModel, "get_latest_schedule", staticmethod(lambda: None))
+    schedule_cache.clear()
+
+    _, _, solved = solve_schedule({"preset": "fast"})
+    solved["timings"]["emit"] = 1.0
+    solved["objective_breakdown"]["shortage"] = -1
+    _, _, cached = solve_schedule({"preset": "fast"})
+    cached["objective_breakdown"]["preference"] = -1
+    _, _, again = solve_schedule({"preset": "fast"})
+    schedule_cache.clear()
+
+    assert cached["cache"]["hit"] and again["cache"]["hit"]
+    assert "emit" not in cached["timings"]
+    assert again["objective_breakdown"]["shortage"] >= 0
+    assert again["objective_breakdown"]["preference"] >= 0
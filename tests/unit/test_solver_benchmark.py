@@ -0,0 +1,11 @@
+# tests/unit/test_solver_benchmark.py
+
+from benchmarks.solver_benchmark import compare
+
+
+def test_compare_skips_phases_missing_from_a_run():
+    baseline = {"results": [{"employees": 100, "seed": 0, "objective": 10.0, "build_time": 0.5, "solve_time": 1.0}]}
+    # A --decompose run has no "build" phase
+    results = [{"employees": 100, "seed": 0, "objective": 10.0, "build_time": None, "solve_time": 2.0}]
+
+    assert compare(results, baseline, tolerance=0.25) == ["100 employees: solve_time 1.000s -> 2.000s"]
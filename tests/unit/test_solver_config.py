@@ -0,0 +1,48 @@
+# tests/unit/test_solver_config.py
+
+import pytest
+from ortools.sat.python import cp_model
+from app.algorithm.solver_config import build_solver_config, apply_solver_config, SOLVER_PRESETS
+
+
+def test_presets_and_overrides():
+    """
+    Unit test for build_solver_config.
+    A preset supplies the defaults, explicit options override them, and the
+    resolved config can be fed back in unchanged (it is what the task receives).
+    """
+    fast = build_solver_config({"preset": "fast"})
+    assert fast["time_limit"] == SOLVER_PRESETS["fast"]["time_limit"] == 5.0
+    assert fast["preset"] == "fast"
+
+    custom = build_solver_config({"preset": "best", "num_workers": 4, "random_seed": 7})
+    assert custom["time_limit"] == 60.0
+    assert custom["num_workers"] == 4
+    assert build_solver_config(custom) == custom
+
+    assert build_solver_config()["preset"] == "best"
+
+
+@pytest.mark.parametrize("options", [
+    {"preset": "slow"},
+    {"workers": 4},
+    {"time_limit": 0},
+    {"time_limit": 1e9},
+    {"num_workers": 512},
+    {"relative_gap_limit": 1.5},
+    {"num_workers": "many"},
+    {"objective_mode": "pareto"},
+    {"consecutive_encoding": "regular"},
+    {"objective_mode": "lexicographic", "decompose": True},
+])
+def test_invalid_options_raise(options):
+    with pytest.raises(ValueError):
+        build_solver_config(options)
+
+
+def test_apply_solver_config():
+    solver = cp_model.CpSolver()
+    apply_solver_config(solver, build_solver_config({"preset": "fast", "num_workers": 4}))
+    assert solver.parameters.num_workers == 4
+    assert solver.parameters.max_time_in_seconds == 5.0
+    assert solver.parameters.relative_gap_limit == pytest.approx(0.05)
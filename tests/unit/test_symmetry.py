@@ -0,0 +1,76 @@
+# tests/unit/test_symmetry.py
+
+from ortools.sat.python import cp_model
+from app.algorithm.instance import compile_instance
+from app.algorithm.symmetry import employee_classes, build_aggregated_model, disaggregate
+
+
+def test_identical_employees_share_a_class(schedule_data):
+    schedule_data["employee_skills"]["Eli Twin"] = ["Bartender", "Waiter"]
+    schedule_data["employee_availability"]["Eli Twin"] = [[3, 7], [0, 10], [1, 5]]
+    instance = compile_instance(schedule_data)
+
+    classes = employee_classes(instance)
+
+    # Alice and Eli differ only in list order; Bob and Dana are unique
+    assert classes == [(0, 3), (1,), (2,)]
+
+
+def test_aggregated_solution_disaggregates_to_named_assignments(schedule_data):
+    """
+    Solves the aggregated model for three interchangeable waiters and checks the
+    disaggregated assignments cover every filled position exactly once.
+    """
+    schedule_data["employee_skills"] = {f"Waiter {i}": ["Waiter"] for i in range(3)}
+    schedule_data["employee_availability"] = {f"Waiter {i}": [[s, 5] for s in range(4)] for i in range(3)}
+    schedule_data["roles_per_shift"] = {"Morning": {"Waiter": 2}, "Evening": {"Waiter": 2}}
+    schedule_data["role_importance"] = {"Waiter": 3}
+    instance = compile_instance(schedule_data)
+    classes = employee_classes(instance)
+    assert classes == [(0, 1, 2)]
+
+    model, counts, class_shifts = build_aggregated_model(instance, classes, (1000, 5000, 100))
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+    assigned = disaggregate(solver, instance, classes, counts, class_shifts)
+
+    # 8 positions, 3 waiters, at most 2 consecutive shifts each: all filled, 3/3/2 split
+    assert len(assigned) == 8
+    per_employee = [sum(1 for e, _, _ in assigned if e == i) for i in range(3)]
+    assert sorted(per_employee) == [2, 3, 3]
+    for shift in range(4):
+        assert sum(1 for _, s, _ in assigned if s == shift) == 2
+
+
+def test_fallback_only_runs_with_time_left(monkeypatch):
+    """
+    A failed disaggregation falls back to the per-employee model with the rest of the time
+    limit; if it used the whole limit up, the draft is returned instead of overrunning it.
+    """
+    import time
+    from app.algorithm import csp_algoritm
+    from app.algorithm.generator import generate_instance
+
+    data = generate_instance(30, seed=3)
+    for name in list(data["employee_skills"]):
+        data["employee_skills"][f"{name} Twin"] = data["employee_skills"][name]
+        data["employee_availability"][f"{name} Twin"] = data["employee_availability"][name]
+    options = {"preset": "fast", "time_limit": 2, "aggregate_employees": True, "instant_draft": True,
+               "use_cache": False}
+
+    monkeypatch.setattr(csp_algoritm, "disaggregate", lambda *args, **kwargs: None)
+    _, _, report = csp_algoritm.solve(data, options, include_text=False)
+    assert report["aggregation"]["fallback"]
+    assert report["status"] in ("OPTIMAL", "FEASIBLE")
+
+    def out_of_time(*args, time_limit, **kwargs):
+        time.sleep(time_limit)
+        return None
+
+    monkeypatch.setattr(csp_algoritm, "disaggregate", out_of_time)
+    started = time.perf_counter()
+    _, _, report = csp_algoritm.solve(data, options, include_text=False)
+    assert not report["aggregation"]["fallback"]
+    assert report["from_draft"]
+    assert time.perf_counter() - started < 3
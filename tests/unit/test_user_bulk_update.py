@@ -0,0 +1,53 @@
+# tests/unit/test_user_bulk_update.py
+
+from pymongo.errors import BulkWriteError
+from models.user_model import UserModel
+
+
+class FakeUsers:
+    """
+    Just enough of a users collection for UserModel.bulk_update: the second write fails.
+    """
+
+    def __init__(self, uids):
+        self.uids = uids
+        self.requests = None
+
+    def find(self, query, projection=None):
+        return [{"uid": uid} for uid in query["uid"]["$in"] if uid in self.uids]
+
+    def bulk_write(self, requests, ordered=True):
+        assert ordered is False
+        self.requests = requests
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 121, "errmsg": "Document failed validation"}]})
+
+
+def test_partial_failure_is_reported_per_uid(monkeypatch):
+    users = FakeUsers({"u1", "u2", "u3"})
+    monkeypatch.setattr(UserModel, "collection", users)
+
+    results = UserModel.bulk_update({"u1": {"jobs": "Cook"}, "missing": {"jobs": "Cook"},
+                                     "u2": {"jobs": "Host"}, "u3": {"jobs": "Waiter"}})
+
+    # Error index 1 is the second write in the batch: u2 (the missing uid is never sent)
+    assert results == {"u1": "updated", "missing": "not_found", "u2": "Document failed validation", "u3": "updated"}
+    assert len(users.requests) == 3
+
+
+def test_role_changes_reach_submitted_constraints(monkeypatch):
+    import models.constraints_model as constraints_model
+    writes = []
+    invalidated = []
+
+    class FakeConstraints:
+        def bulk_write(self, requests, ordered=True):
+            writes.extend(requests)
+            return type("Result", (), {"modified_count": 1})()
+
+    monkeypatch.setattr(constraints_model, "constraints_collection", FakeConstraints())
+    monkeypatch.setattr(constraints_model, "invalidate_schedule_cache", lambda: invalidated.append(True))
+
+    assert constraints_model.update_constraint_roles({"u1": ["Cook", "Host"], "u2": ["Cook"]}) == 1
+    assert [write._doc for write in writes] == [{"$set": {"roles": ["Cook", "Host"]}}, {"$set": {"roles": ["Cook"]}}]
+    assert invalidated == [True]
+    assert constraints_model.update_constraint_roles({}) == 0
@@ -0,0 +1,31 @@
+# tests/unit/test_user_model.py
+
+import pytest
+from models.user_model import UserModel
+from models.constraints_model import constraints_collection, update_constraint_roles
+
+UIDS = ["bulk-test-1", "bulk-test-2"]
+
+
+@pytest.fixture
+def users():
+    UserModel.collection.insert_many([{"uid": uid, "first_name": "Test", "last_name": uid, "jobs": "Waiter"}
+                                      for uid in UIDS])
+    constraints_collection.insert_one({"uid": UIDS[0], "roles": ["Waiter"]})
+    yield UIDS
+    UserModel.collection.delete_many({"uid": {"$in": UIDS}})
+    constraints_collection.delete_many({"uid": {"$in": UIDS}})
+
+
+def test_bulk_update_reports_each_uid(users):
+    results = UserModel.bulk_update({users[0]: {"jobs": "Cook,Host"}, users[1]: {"jobs": "Cook"},
+                                     "bulk-test-missing": {"jobs": "Cook"}})
+
+    assert results == {users[0]: "updated", users[1]: "updated", "bulk-test-missing": "not_found"}
+    assert UserModel.find_by_uid(users[0])["jobs"] == "Cook,Host"
+
+
+def test_roles_propagate_to_submitted_constraints(users):
+    # Only the first employee has submitted constraints
+    assert update_constraint_roles({users[0]: ["Cook", "Host"], users[1]: ["Cook"]}) == 1
+    assert constraints_collection.find_one({"uid": users[0]})["roles"] == ["Cook", "Host"]
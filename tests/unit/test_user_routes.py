@@ -0,0 +1,55 @@
+# tests/unit/test_user_routes.py
+
+import pytest
+from flask import Flask
+import app.user_routes as routes
+from models.user_model import UserModel
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(routes.user_api, url_prefix="/user")
+    return app.test_client()
+
+
+def test_users_default_to_the_summary_preset(client, monkeypatch):
+    requested = []
+
+    def get_all(fields=None):
+        requested.append(fields)
+        return []
+    monkeypatch.setattr(UserModel, "get_all", get_all)
+
+    assert client.get("/user/users").status_code == 200
+    assert client.get("/user/users?fields=roster").status_code == 200
+    assert requested == ["summary", "roster"]
+
+
+def test_role_updates_write_the_same_roles_to_users_and_constraints(client, monkeypatch):
+    user_updates = {}
+    constraint_roles = {}
+
+    def bulk_update(updates):
+        user_updates.update(updates)
+        return {uid: "updated" for uid in updates}
+    monkeypatch.setattr(UserModel, "bulk_update", bulk_update)
+    monkeypatch.setattr(routes, "update_constraint_roles", lambda roles: constraint_roles.update(roles) or len(roles))
+
+    response = client.put("/user/employees-management", json={"employees": [
+        {"uid": "u1", "roles": [" Cook ", "", "Host"]},
+        {"uid": "u2", "roles": []},
+    ]})
+
+    assert response.status_code == 200
+    assert user_updates == {"u1": {"jobs": "Cook,Host"}, "u2": {"jobs": ""}}
+    assert constraint_roles == {"u1": ["Cook", "Host"], "u2": []}
+    # Reading the jobs back gives the list the constraints hold
+    assert all(UserModel.normalize_roles(user_updates[uid]["jobs"]) == roles for uid, roles in constraint_roles.items())
+
+
+def test_malformed_roles_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(UserModel, "bulk_update", lambda updates: pytest.fail("nothing may be written"))
+
+    response = client.put("/user/employees-management", json={"employees": [{"uid": "u1", "roles": ["Cook", 7]}]})
+    assert response.status_code == 400
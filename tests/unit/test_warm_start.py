@@ -0,0 +1,32 @@
+# tests/unit/test_warm_start.py
+
+from app.algorithm.instance import compile_instance
+from app.algorithm.warm_start import map_schedule_to_assignments
+
+
+def test_previous_schedule_maps_onto_current_variables(schedule_data):
+    """
+    Unit test for map_schedule_to_assignments.
+    Entries for employees, roles or shifts that no longer exist (or are no longer
+    available) are counted but not matched.
+    """
+    instance = compile_instance(schedule_data)
+    days = [
+        {"name": "Sunday", "shifts": [
+            {"time": "Morning", "employees": [{"name": "Alice Smith", "role": "Waiter"}]},
+            {"time": "Evening", "employees": [
+                {"name": "Alice Smith", "role": "Bartender"},
+                {"name": "Bob Cohen", "role": "Waiter"},      # Bob is not available this shift
+            ]},
+        ]},
+        {"name": "Monday", "shifts": [
+            {"time": "Night", "employees": [{"name": "Bob Cohen", "role": "Waiter"}]},  # shift was removed
+            {"time": "Evening", "employees": [{"name": "Former Employee", "role": "Waiter"}]},
+        ]},
+    ]
+
+    matched, total = map_schedule_to_assignments(instance, days)
+
+    waiter, bartender = 0, 1
+    assert total == 5
+    assert matched == {(0, 0, waiter), (0, 1, bartender)}
@@ -0,0 +1,249 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+
+def stable_hash(payload):
+    """
+    Returns a canonical SHA-256 hex digest of a JSON-serializable payload.
+    Dict keys are sorted, so the same data always produces the same hash regardless of insertion order.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """
+    Process-local LRU cache with a per-entry time-to-live. Used in development and tests.
+    """
+
+    def __init__(self, maxsize=32, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """
+    Redis-backed cache shared by all web and Celery workers. Values are stored as JSON.
+
+    Keys are namespaced by a generation counter, so clear() is a single INCR instead of
+    a scan over every key; entries from older generations simply expire through their TTL.
+    Redis errors never fail the caller: reads miss and writes are dropped.
+    """
+
+    def __init__(self, client, namespace, ttl=3600):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _generation(self):
+        return int(self.client.get(f"{self.namespace}:generation") or 0)
+
+    def _key(self, key):
+        return f"{self.namespace}:{self._generation()}:{key}"
+
+    def get(self, key):
+        try:
+            value = self.client.get(self._key(key))
+        except redis.RedisError as e:
+            print(f"[cache:{self.namespace}] get failed: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        try:
+            self.client.set(self._key(key), json.dumps(value, default=str), ex=self.ttl)
+        except redis.RedisError as e:
+            print(f"[cache:{self.namespace}] set failed: {e}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(self._key(key))
+        except redis.RedisError as e:
+            print(f"[cache:{self.namespace}] delete failed: {e}")
+
+    def clear(self):
+        try:
+            self.client.incr(f"{self.namespace}:generation")
+        except redis.RedisError as e:
+            print(f"[cache:{self.namespace}] clear failed: {e}")
+
+
+def create_cache(namespace, ttl=3600, maxsize=32):
+    """
+    Returns a Redis-backed cache in production and an in-memory LRU cache otherwise
+    (the same split celery_app.py and socketio_server.py use).
+    """
+    if os.getenv("FLASK_ENV") == "production":
+        from configs.redis_config import redis_client
+        return RedisCache(redis_client, namespace, ttl=ttl)
+    return MemoryCache(maxsize=maxsize, ttl=ttl)
+
+
+class ReadThroughCache:
+    """
+    Process-local cache of one value loaded by `loader()`, for documents that are read
+    everywhere but rarely change. Readers get a deep copy, so they can modify it freely.
+
+    Every invalidate() bumps a version; a load that started before an invalidation is
+    returned to its caller but not stored, so a concurrent write is never masked by the
+    value read just before it. The TTL bounds staleness if an invalidation message is lost.
+    """
+
+    def __init__(self, loader, ttl=300, channel=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.channel = channel
+        self._version = 0
+        self._entry = None  # (version, expires_at, value)
+        self._lock = threading.Lock()
+        if channel is not None:
+            channel.subscribe(lambda: self.invalidate(publish=False))
+
+    def get(self):
+        if self.channel is not None:
+            self.channel.listen()
+        with self._lock:
+            version = self._version
+            if self._entry is not None:
+                entry_version, expires_at, value = self._entry
+                if entry_version == version and expires_at >= time.monotonic():
+                    return copy.deepcopy(value)
+        value = self.loader()
+        with self._lock:
+            if self._version == version:
+                self._entry = (version, time.monotonic() + self.ttl, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, publish=True):
+        """
+        Drops the cached value here and, with `publish`, in every other process on the channel.
+        """
+        with self._lock:
+            self._version += 1
+            self._entry = None
+        if publish and self.channel is not None:
+            self.channel.publish()
+
+
+class MemoryInvalidationChannel:
+    """
+    Invalidation within a single process. Used in development and tests, where Celery
+    runs tasks eagerly inside the web process.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._listeners = []
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def listen(self):
+        pass
+
+    def publish(self):
+        for listener in self._listeners:
+            listener()
+
+
+class RedisInvalidationChannel:
+    """
+    Invalidation across processes over Redis pub/sub. Each process listens in a daemon
+    thread, started on first use (and again after a fork, for prefork Celery workers).
+    Every (re)subscription also invalidates, since messages sent while disconnected are lost.
+    """
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = f"invalidate:{name}"
+        self._listeners = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def listen(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name=self.name, daemon=True).start()
+
+    def publish(self):
+        try:
+            self.client.publish(self.name, "1")
+        except redis.RedisError as e:
+            print(f"[{self.name}] publish failed: {e}")
+
+    def _notify(self):
+        for listener in self._listeners:
+            listener()
+
+    def _run(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.name)
+                self._notify()
+                for _ in pubsub.listen():
+                    self._notify()
+            except redis.RedisError as e:
+                print(f"[{self.name}] subscription lost: {e}")
+                time.sleep(1)
+
+
+def create_invalidation_channel(name):
+    """
+    Returns a Redis pub/sub channel in production and an in-process one otherwise
+    (the same split as create_cache).
+    """
+    if os.getenv("FLASK_ENV") == "production":
+        from configs.redis_config import redis_client
+        return RedisInvalidationChannel(redis_client, name)
+    return MemoryInvalidationChannel(name)
+
+
+# Solved schedules keyed by a hash of the exact solver inputs; cleared on any constraint or settings write
+schedule_cache = create_cache("schedule", ttl=int(os.getenv("SCHEDULE_CACHE_TTL", 24 * 3600)))
+
+
+def invalidate_schedule_cache():
+    schedule_cache.clear()
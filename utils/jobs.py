@@ -0,0 +1,165 @@
+import os
+import threading
+
+import redis
+
+# In-flight jobs and their listeners are forgotten after this long, even if a worker died mid-solve
+JOB_TTL = 3600
+
+
+class MemoryJobRegistry:
+    """
+    Process-local registry of in-flight schedule generations. Used in development, where
+    Celery runs tasks eagerly inside the web process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}          # request key -> task id
+        self._listeners = {}     # task id -> socket ids
+        self._sockets = {}       # socket id -> task ids
+        self._cancelled = set()
+
+    def claim(self, key, task_id):
+        """
+        Registers `task_id` as the job for `key` unless one is already running.
+
+        Returns:
+            str: The task id already running for `key`, or None if `task_id` was registered.
+        """
+        with self._lock:
+            running = self._jobs.get(key)
+            if running is not None:
+                return running
+            self._jobs[key] = task_id
+            return None
+
+    def running(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def finish(self, key, task_id):
+        with self._lock:
+            if self._jobs.get(key) == task_id:
+                del self._jobs[key]
+
+    def add_listener(self, task_id, socket_id):
+        with self._lock:
+            self._listeners.setdefault(task_id, set()).add(socket_id)
+            self._sockets.setdefault(socket_id, set()).add(task_id)
+
+    def remove_listener(self, socket_id):
+        """
+        Detaches a socket from every job it listens to.
+
+        Returns:
+            list: Task ids that have no listener left.
+        """
+        with self._lock:
+            orphaned = []
+            for task_id in self._sockets.pop(socket_id, set()):
+                listeners = self._listeners.get(task_id, set())
+                listeners.discard(socket_id)
+                if not listeners:
+                    orphaned.append(task_id)
+            return orphaned
+
+    def listeners(self, task_id):
+        with self._lock:
+            return set(self._listeners.get(task_id, set()))
+
+    def cancel(self, task_id):
+        with self._lock:
+            self._cancelled.add(task_id)
+
+    def is_cancelled(self, task_id):
+        with self._lock:
+            return task_id in self._cancelled
+
+    def clear(self, task_id):
+        """
+        Forgets the listeners and cancel flag of a finished job.
+        """
+        with self._lock:
+            for socket_id in self._listeners.pop(task_id, set()):
+                self._sockets.get(socket_id, set()).discard(task_id)
+            self._cancelled.discard(task_id)
+
+
+class RedisJobRegistry:
+    """
+    Redis-backed registry shared by the web processes and the Celery workers.
+    Claims use SET NX, so two identical requests racing each other still start one job.
+    """
+
+    def __init__(self, client, namespace="jobs", ttl=JOB_TTL):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _key(self, *parts):
+        return ":".join((self.namespace,) + parts)
+
+    def claim(self, key, task_id):
+        if self.client.set(self._key("request", key), task_id, nx=True, ex=self.ttl):
+            return None
+        running = self.client.get(self._key("request", key))
+        # The other job may have finished in between; then claim again
+        return running.decode() if running is not None else self.claim(key, task_id)
+
+    def running(self, key):
+        running = self.client.get(self._key("request", key))
+        return running.decode() if running is not None else None
+
+    def finish(self, key, task_id):
+        if self.running(key) == task_id:
+            self.client.delete(self._key("request", key))
+
+    def add_listener(self, task_id, socket_id):
+        pipe = self.client.pipeline()
+        pipe.sadd(self._key("listeners", task_id), socket_id)
+        pipe.expire(self._key("listeners", task_id), self.ttl)
+        pipe.sadd(self._key("socket", socket_id), task_id)
+        pipe.expire(self._key("socket", socket_id), self.ttl)
+        pipe.execute()
+
+    def remove_listener(self, socket_id):
+        orphaned = []
+        for task_id in self.client.smembers(self._key("socket", socket_id)):
+            task_id = task_id.decode()
+            self.client.srem(self._key("listeners", task_id), socket_id)
+            if not self.client.scard(self._key("listeners", task_id)):
+                orphaned.append(task_id)
+        self.client.delete(self._key("socket", socket_id))
+        return orphaned
+
+    def listeners(self, task_id):
+        return {socket_id.decode() for socket_id in self.client.smembers(self._key("listeners", task_id))}
+
+    def cancel(self, task_id):
+        self.client.set(self._key("cancelled", task_id), 1, ex=self.ttl)
+
+    def is_cancelled(self, task_id):
+        try:
+            return bool(self.client.exists(self._key("cancelled", task_id)))
+        except redis.RedisError as e:
+            # A lost connection must not stop a running solve
+            print(f"[jobs] cancel check failed: {e}")
+            return False
+
+    def clear(self, task_id):
+        self.client.delete(self._key("listeners", task_id), self._key("cancelled", task_id))
+
+
+def create_job_registry():
+    """
+    Returns a Redis-backed registry in production and an in-memory one otherwise
+    (the same split as utils.cache.create_cache).
+    """
+    if os.getenv("FLASK_ENV") == "production":
+        from configs.redis_config import redis_client
+        return RedisJobRegistry(redis_client)
+    return MemoryJobRegistry()
+
+
+job_registry = create_job_registry()